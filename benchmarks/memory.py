@@ -0,0 +1,132 @@
+"""Memory benchmark: a draft-board week's aggregated odds and records.
+
+    python benchmarks/memory.py [games] [players_per_game]
+
+Aggregates a synthetic slate (ten books, five main markets plus two
+alternate ladders per player), then measures with tracemalloc what the
+week's odds, market summaries, planned games and projection-row market
+lists hold, each against the representation it replaced: nested odds
+dicts, unslotted dataclasses and a fresh sorted list per row.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import gc
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from oddsfantasy.aggregator import MarketSummary, aggregate_by_week
+from oddsfantasy.planner import PlannedGame
+
+BOOKS = 10
+MARKETS = (
+    "player_pass_yds",
+    "player_rush_yds",
+    "player_receptions",
+    "player_reception_yds",
+    "player_anytime_td",
+)
+LADDERS = ("player_rush_yds_alternate", "player_reception_yds_alternate")
+POSITION_MARKETS = (
+    ["player_anytime_td", "player_pass_tds", "player_pass_yds", "player_rush_yds"],
+    ["player_anytime_td", "player_receptions", "player_rush_yds"],
+    ["player_anytime_td", "player_reception_yds", "player_receptions"],
+)
+
+
+def slate(games: int, per_game: int, seed: int = 5) -> tuple[dict, dict]:
+    rng = random.Random(seed)
+    odds, plan = {}, {}
+    for g in range(games):
+        names = [f"Player {g}-{i}" for i in range(per_game)]
+        books = []
+        for b in range(BOOKS):
+            markets = []
+            for key in MARKETS + LADDERS:
+                outcomes = []
+                for name in names:
+                    point = round(rng.uniform(0.5, 90.0), 1)
+                    outcomes.extend(
+                        {
+                            "name": side,
+                            "description": name,
+                            "price": round(rng.uniform(1.3, 3.5), 2),
+                            "point": point + 10 * step,
+                        }
+                        for step in range(6 if key in LADDERS else 1)
+                        for side in ("Over", "Under")
+                    )
+                markets.append({"key": key, "outcomes": outcomes})
+            books.append({"key": f"book{b}", "markets": markets})
+        odds[f"g{g}"] = [{"bookmakers": books}]
+        plan[f"g{g}"] = PlannedGame(
+            f"g{g}",
+            f"Home {g}",
+            f"Away {g}",
+            "2026-09-13T17:00:00Z",
+            [{"alias": n, "full_name": n, "primary_position": "WR"} for n in names],
+            list(MARKETS + LADDERS),
+        )
+    return odds, plan
+
+
+def traced(build) -> tuple[object, int]:
+    """(result, bytes still allocated once `build` returns)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def unslotted(cls: type) -> type:
+    fields = [(f.name, f.type) for f in dataclasses.fields(cls)]
+    return dataclasses.make_dataclass(cls.__name__, fields)
+
+
+def report(label: str, before: int, after: int) -> None:
+    kib = f"{before / 1024:9.0f} KiB -> {after / 1024:8.0f} KiB"
+    print(f"  {label:<28} {kib}  ({before / after:.1f}x)")
+
+
+def main() -> None:
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_game = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    event_odds, plan = slate(games, per_game)
+    (odds, summaries), table_bytes = traced(lambda: aggregate_by_week(event_odds, plan))
+    nested, nested_bytes = traced(lambda: {a: dict(p.to_dict()) for a, p in odds.items()})
+    del nested
+    print(f"{games} games x {per_game} players, {len(odds.table)} priced outcomes")
+    report("odds (nested -> table)", nested_bytes, table_bytes)
+
+    rows = [dataclasses.asdict(s) for mkts in summaries.values() for s in mkts.values()]
+    plain = unslotted(MarketSummary)
+    _, before = traced(lambda: [plain(**r) for r in rows])
+    _, after = traced(lambda: [MarketSummary(**r) for r in rows])
+    report(f"{len(rows)} MarketSummary", before, after)
+
+    games_args = [dataclasses.astuple(g) for g in plan.values()] * 50
+    plain = unslotted(PlannedGame)
+    _, before = traced(lambda: [plain(*a) for a in games_args])
+    _, after = traced(lambda: [PlannedGame(*a) for a in games_args])
+    report(f"{len(games_args)} PlannedGame", before, after)
+
+    # Projection rows carry ~6 market lists each, drawn from a few sets
+    sets = [set(POSITION_MARKETS[i % 3]) for i in range(len(odds))]
+    keys = ("vital_markets", "minor_markets", "missing_markets", "missing_vital")
+    _, before = traced(lambda: [{k: sorted(s) for k in keys} for s in sets])
+    shared: dict[frozenset, list] = {}
+    _, after = traced(
+        lambda: [{k: shared.setdefault(frozenset(s), sorted(s)) for k in keys} for s in sets]
+    )
+    report(f"{len(sets)} projection rows", before, after)
+
+
+if __name__ == "__main__":
+    main()
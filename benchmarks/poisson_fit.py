@@ -0,0 +1,92 @@
+"""Micro-benchmark: prob_models._poisson_fit_lambda vs the grid search it replaced.
+
+    python benchmarks/poisson_fit.py
+
+Times both over a slate of single-line and three-anchor fits drawn like the
+count markets range_model sees, and reports the largest relative lambda
+difference. The memo is cleared before the cold run; the warm run repeats
+the same anchors, as successive players and tails do.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from oddsfantasy import prob_models
+
+
+def grid_search_reference(points: list[tuple[int, float]]) -> float | None:
+    """The original two-phase 61-point grid search, verbatim."""
+    if not points:
+        return None
+    max_k = max(k for (k, _) in points)
+    lo = max(0.1, 0.3 * max_k)
+    hi = max(1.0, 2.5 * max_k + 1)
+    best_l = None
+    best_err = 1e9
+    steps = 60
+    for _phase in range(2):
+        start = lo if best_l is None else max(lo, best_l * 0.5)
+        end = hi if best_l is None else max(start + 1e-6, best_l * 1.5)
+        for i in range(steps + 1):
+            lam = start + (end - start) * i / steps
+            err = 0.0
+            for k, Fk in points:
+                term = math.exp(-lam)
+                c = term
+                for j in range(1, max(1, k) + 1):
+                    term *= lam / j
+                    c += term
+                err += (c - Fk) ** 2
+            if err < best_err:
+                best_err = err
+                best_l = lam
+    return best_l
+
+
+def slate(n: int = 2000, seed: int = 11) -> list[list[tuple[int, float]]]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        if rng.random() < 0.7:
+            out.append([(rng.choice((0, 1, 2, 3, 4, 5, 6)), round(rng.uniform(0.2, 0.8), 3))])
+        else:
+            k0 = rng.choice((1, 2, 3, 4, 5))
+            fs = sorted(round(rng.uniform(0.05, 0.95), 3) for _ in range(3))
+            out.append([(k0 + i, f) for i, f in enumerate(fs)])
+    return out
+
+
+def _time(fn, cases) -> float:
+    t0 = time.perf_counter()
+    for c in cases:
+        fn(c)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    cases = slate()
+    ref = _time(grid_search_reference, cases)
+    prob_models._fit_lambda.cache_clear()
+    cold = _time(prob_models._poisson_fit_lambda, cases)
+    warm = _time(prob_models._poisson_fit_lambda, cases)
+    worst = max(
+        abs(prob_models._poisson_fit_lambda(c) - grid_search_reference(c))
+        / grid_search_reference(c)
+        for c in cases
+    )
+    print(f"fits:            {len(cases)}")
+    print(f"grid search:     {ref * 1000:8.1f} ms")
+    print(f"solver (cold):   {cold * 1000:8.1f} ms  ({ref / cold:.0f}x)")
+    print(f"solver (memo):   {warm * 1000:8.1f} ms  ({ref / warm:.0f}x)")
+    print(f"max rel. diff:   {worst:.2%}  (grid step is ~1.7% of lambda)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Micro-benchmark: simulate.fantasy_point_percentiles over a draft-board slate.
+
+    python benchmarks/simulate.py [players]
+
+Builds single-line fits for a slate of players (seven markets each, drawn
+like the lines range_model sees), then times the Monte Carlo percentiles at
+a few draw counts, with the median p50 drift against a 20,000-draw run.
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from oddsfantasy import range_model, simulate
+
+LINES = {
+    "player_pass_yds": 240.5,
+    "player_pass_tds": 1.5,
+    "player_pass_interceptions": 0.5,
+    "player_rush_yds": 49.5,
+    "player_receptions": 3.5,
+    "player_reception_yds": 44.5,
+    "player_anytime_td": 0.5,
+}
+SCORING = {
+    "pass_yd": 0.04,
+    "pass_td": 4,
+    "pass_int": -1,
+    "rush_yd": 0.1,
+    "rush_td": 6,
+    "rec": 1,
+    "rec_yd": 0.1,
+    "bonus_pass_yd_300": 5,
+    "bonus_rush_yd_100": 5,
+    "bonus_rec_yd_100": 5,
+}
+
+
+def slate(n: int, seed: int = 11) -> dict:
+    rng = random.Random(seed)
+    fits = {}
+    for i in range(n):
+        markets = {}
+        for key, base in LINES.items():
+            threshold = base * rng.uniform(0.6, 1.4)
+            p_over = rng.uniform(0.3, 0.7)
+            markets[key] = range_model.fit_single_line(
+                key, threshold * rng.uniform(0.95, 1.1), threshold, p_over, 1 - p_over
+            )
+        fits[f"p{i}"] = markets
+    return fits
+
+
+def main() -> None:
+    if not simulate.available():
+        sys.exit("numpy is required: pip install -e '.[fast]'")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    fits = slate(n)
+    reference = simulate.fantasy_point_percentiles(fits, SCORING, draws=20000)
+    print(f"{n} players x {len(LINES)} markets")
+    for draws in (1000, 2000, 4000):
+        t0 = time.perf_counter()
+        got = simulate.fantasy_point_percentiles(fits, SCORING, draws=draws, seed=1)
+        dt = time.perf_counter() - t0
+        drift = statistics.median(abs(got[p][2] - reference[p][2]) for p in fits)
+        print(f"  draws={draws:5d}  {dt * 1000:7.1f} ms  median |p50 drift| {drift:.3f} FP")
+
+
+if __name__ == "__main__":
+    main()
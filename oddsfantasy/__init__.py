@@ -4,11 +4,23 @@ Modules:
 - api: WSGI entrypoint; serves the JSON API and the static UI
 - services: orchestration layer behind every endpoint
 - weekly_windows: compute Thursday->Monday windows
+- event_index: parse-once index over the events list (kickoff, team lookups)
 - planner: plan relevant games and markets per week window
 - aggregator: aggregate per-player odds across bookmakers
+- devig: batch de-vig of paired over/under prices (proportional, Shin, power)
+- odds_table: columnar per-outcome odds for a slate, with nested-dict adapters
 - range_model: compute floor/mid/ceiling fantasy points
-- prob_models: probability distributions behind the ranges
+- prob_models: numerics behind the ranges (anchors, PCHIP, Poisson/lognormal fits)
+- distributions: fitted per-market stat distributions and the model registry
+- quantile_batch: optional NumPy kernel for whole-slate market quantiles
+- simulate: optional NumPy Monte Carlo of fantasy points from the fitted markets
 - draft_prep: league-wide draft board (no roster required)
-- odds_client: Odds API client with a TTL disk cache
+- odds_client: Odds API client with a TTL cache over the snapshot store
+- store: SQLite snapshot store for odds and materialized projections
+- fetch_engine: batched, bounded-concurrency event-odds fetching
+- prefetch: opt-in background odds prefetch for registered leagues
+- player_index: compact, indexed view of Sleeper's player database
+- names: memoized name normalization and odds-name resolution (with /health stats)
+- lru: bounded, fingerprint-invalidated cache for computed payloads
 - ratelimit: Odds API quota tracking from response headers
 """
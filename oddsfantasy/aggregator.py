@@ -1,14 +1,35 @@
+"""Per-player odds aggregation across bookmakers.
+
+Turns Odds API event responses into the two shapes the range model reads:
+raw per-book sides per player/market, and a de-vigged MarketSummary
+(median across books) per player/market.
+
+Each event is streamed once: outcome descriptions are resolved to roster
+aliases by names.NameResolver (memoized per call), sides are collected per
+market, and each book's line is appended to a columnar OddsTable
+(odds_table.py) and a flat (alias, market) accumulator of its prices. For
+a draft-board week that's hundreds of players x 7 markets x ~10 books per
+game; once every game has streamed, all those lines are de-vigged in one
+batch (devig.py).
+"""
+
 from __future__ import annotations
 
 import contextlib
-import os
 import statistics
 from dataclasses import dataclass
 
-from .predicted_stats import implied_probability
+from .devig import devig
+from .names import NameResolver
+from .odds_table import OddsTable, PlayerOddsMap
 
+ALTERNATE_SUFFIX = "_alternate"
 
-@dataclass
+# Outcome name -> side index (over, under); unrecognized names count as over
+_SIDES = {"over": 0, "yes": 0, "under": 1, "no": 1}
+
+
+@dataclass(slots=True)
 class MarketSummary:
     avg_over_prob: float
     avg_under_prob: float
@@ -16,52 +37,17 @@ class MarketSummary:
     samples: int
 
 
-def _classify_side(name: str) -> str | None:
-    n = (name or "").strip().lower()
-    if n in ("over", "yes"):
-        return "over"
-    if n in ("under", "no"):
-        return "under"
-    return None
-
-
-def aggregate_players_from_event(
+def _stream_event(
     event_odds: object,
-    target_player_aliases: set[str],
-) -> tuple[dict, dict]:
-    """Aggregate per-bookmaker odds for target players from a single event response.
-
-    Returns (per_player_odds, per_player_market_summaries).
-
-    per_player_odds is compatible with predict_stats_for_player input shape:
-      { player_alias: { bookmaker_key: { market_key: { 'over': {...}, 'under': {...} } } } }
-
-    per_player_market_summaries:
-      { player_alias: { market_key: MarketSummary(...) } }
+    resolve: NameResolver,
+    table: OddsTable,
+    accumulators: dict[tuple[str, str], tuple[list, list, list]],
+) -> None:
+    """Stream one event response into `table` and `accumulators`.
+
+    `accumulators` maps (alias, market) to this event's per-book (over
+    price, under price, threshold) lists; a missing side's price is None.
     """
-    out_per_player: dict = {}
-    out_summaries: dict = {}
-
-    # Debug toggle
-    _DBG = os.getenv("API_DEBUG") in ("1", "true", "True")
-
-    def _norm_name(s: str) -> str:
-        if not s:
-            return ""
-        s = s.lower()
-        # strip punctuation and dots/apostrophes
-        import re
-
-        s = re.sub(r"[\.'`-]", " ", s)
-        s = re.sub(r"[^a-z0-9 ]", "", s)
-        s = re.sub(r"\s+", " ", s).strip()
-        # drop suffixes like jr, sr, ii, iii, iv, v
-        toks = [t for t in s.split(" ") if t not in ("jr", "sr", "ii", "iii", "iv", "v")]
-        return " ".join(toks)
-
-    # Build normalized alias map for fuzzy matching
-    norm_alias_map: dict[str, str] = {_norm_name(a): a for a in (target_player_aliases or set())}
-
     # Normalize event structure: can be a list with one event, or a dict
     if isinstance(event_odds, dict):
         events_list = [event_odds]
@@ -71,187 +57,168 @@ def aggregate_players_from_event(
         events_list = []
 
     for ev in events_list:
+        event = table.new_event()
         for book in ev.get("bookmakers", []) if isinstance(ev, dict) else []:
             bookmaker_key = book.get("key")
             if not bookmaker_key:
                 continue
             for market in book.get("markets", []):
                 market_key = market.get("key")
-                # First gather outcomes by alias for this market so we can de-vig per book
-                alias_outcomes = {}
+                is_alt = bool(market_key) and str(market_key).endswith(ALTERNATE_SUFFIX)
+                # Gather this book's sides per alias so we can de-vig per book;
+                # alternates keep every (side, point, price), main markets the
+                # last outcome per side
+                sides: dict[str, list] = {}
                 for outcome in market.get("outcomes", []):
                     raw_desc = outcome.get("description")
                     if not raw_desc:
                         continue
-                    alias = raw_desc if raw_desc in target_player_aliases else None
+                    alias = resolve(raw_desc)
                     if alias is None:
-                        n = _norm_name(raw_desc)
-                        alias = norm_alias_map.get(n)
-                        if alias is None:
-                            continue
-                    side = _classify_side(outcome.get("name")) or "over"
-                    # Preserve alternates as full lists by side
-                    if market_key and str(market_key).endswith("_alternate"):
-                        alias_outcomes.setdefault(alias, {"alts_over": [], "alts_under": []})
-                        rec = {
-                            "odds": outcome.get("price"),
-                            "point": outcome.get("point", 0),
-                        }
-                        if side == "over":
-                            alias_outcomes[alias]["alts_over"].append(rec)
-                        else:
-                            alias_outcomes[alias]["alts_under"].append(rec)
+                        continue
+                    i = _SIDES.get((outcome.get("name") or "").strip().lower(), 0)
+                    point = outcome.get("point", 0)
+                    slot = sides.get(alias)
+                    if slot is None:
+                        slot = sides[alias] = [] if is_alt else [None, None]
+                    if is_alt:
+                        slot.append((i, point, outcome.get("price")))
                     else:
-                        alias_outcomes.setdefault(alias, {"over": None, "under": None})
-                        alias_outcomes[alias][side] = {
-                            "odds": outcome.get("price"),
-                            "point": outcome.get("point", 0),
-                        }
+                        slot[i] = {"odds": outcome.get("price"), "point": point}
 
-                for alias, sides in alias_outcomes.items():
-                    # If alternate market, attach 'alts' lists and skip summary accumulation
-                    if market_key and str(market_key).endswith("_alternate"):
-                        out_per_player.setdefault(alias, {})
-                        out_per_player[alias].setdefault(bookmaker_key, {})
-                        out_per_player[alias][bookmaker_key][market_key] = {
-                            "alts": {
-                                "over": list(sides.get("alts_over") or []),
-                                "under": list(sides.get("alts_under") or []),
-                            }
-                        }
+                for alias, slot in sides.items():
+                    if is_alt:
+                        table.extend(alias, bookmaker_key, market_key, True, event, slot)
                         continue
-                    over = sides.get("over")
-                    under = sides.get("under")
 
                     # Persist raw per-book sides for downstream prediction
-                    out_per_player.setdefault(alias, {})
-                    out_per_player[alias].setdefault(bookmaker_key, {})
-                    out_per_player[alias][bookmaker_key].setdefault(
-                        market_key, {"over": None, "under": None}
-                    )
-                    if over:
-                        out_per_player[alias][bookmaker_key][market_key]["over"] = over
-                    if under:
-                        out_per_player[alias][bookmaker_key][market_key]["under"] = under
-
-                    # Compute per-book de-vig probabilities if we have both sides; otherwise use raw implied
-                    p_over = 0.0
-                    p_under = 0.0
-                    if over and under and over.get("odds") and under.get("odds"):
-                        try:
-                            o_raw = implied_probability(over["odds"])  # 1/odds
-                            u_raw = implied_probability(under["odds"])  # 1/odds
-                            total = o_raw + u_raw
-                            if total > 0:
-                                p_over = o_raw / total
-                                p_under = u_raw / total
-                        except Exception:
-                            p_over = (
-                                implied_probability(over["odds"])
-                                if over and over.get("odds")
-                                else 0.0
-                            )
-                            p_under = (
-                                implied_probability(under["odds"])
-                                if under and under.get("odds")
-                                else 0.0
-                            )
-                    else:
-                        # one-sided: keep raw implied where present
-                        if over and over.get("odds"):
-                            p_over = implied_probability(over["odds"]) or 0.0
-                        if under and under.get("odds"):
-                            p_under = implied_probability(under["odds"]) or 0.0
-
-                    # Summary accumulators (averaging already de-vigged per-book p's when available)
-                    out_summaries.setdefault(alias, {})
-                    acc = out_summaries[alias].setdefault(
+                    over, under = slot
+                    table.extend(
+                        alias,
+                        bookmaker_key,
                         market_key,
-                        {"over_vals": [], "under_vals": [], "point_vals": []},
+                        False,
+                        event,
+                        [(i, rec["point"], rec["odds"]) for i, rec in enumerate(slot) if rec],
                     )
-                    acc["over_vals"].append(p_over)
-                    acc["under_vals"].append(p_under)
-                    # threshold from over (preferred) or under
-                    pt = None
-                    if over and ("point" in over):
-                        pt = over.get("point")
-                    elif under and ("point" in under):
-                        pt = under.get("point")
-                    if pt is not None:
-                        with contextlib.suppress(Exception):
-                            acc["point_vals"].append(float(pt))
 
-    # Finalize summaries
-    finalized: dict = {}
-    for alias, mkts in out_summaries.items():
-        finalized[alias] = {}
-        for mkey, acc in mkts.items():
-            over_vals = acc.get("over_vals", [])
-            under_vals = acc.get("under_vals", [])
-            point_vals = acc.get("point_vals", [])
-            samples = max(len(over_vals), len(under_vals), len(point_vals))
-            med_over = statistics.median(over_vals) if over_vals else 0.0
-            med_under = statistics.median(under_vals) if under_vals else 0.0
-            med_point = statistics.median(point_vals) if point_vals else 0.0
-            finalized[alias][mkey] = MarketSummary(
-                avg_over_prob=med_over,
-                avg_under_prob=med_under,
-                avg_threshold=med_point,
-                samples=samples,
+                    acc = accumulators.get((alias, market_key))
+                    if acc is None:
+                        acc = accumulators[(alias, market_key)] = ([], [], [])
+                    acc[0].append(over["odds"] if over else None)
+                    acc[1].append(under["odds"] if under else None)
+                    # threshold from over (preferred) or under
+                    with contextlib.suppress(Exception):
+                        acc[2].append(float((over or under)["point"]))
+
+
+def _summaries(
+    games: list[dict[tuple[str, str], tuple[list, list, list]]],
+    devig_method: str | None = None,
+) -> list[dict[str, dict[str, MarketSummary]]]:
+    """Median across books per (alias, market), nested by alias, for each
+    game's accumulators. Every book's line in every game is de-vigged in one
+    devig() call; a side a book doesn't price counts as probability 0."""
+    over_prices = [p for acc in games for over, _, _ in acc.values() for p in over]
+    under_prices = [p for acc in games for _, under, _ in acc.values() for p in under]
+    p_over, p_under = devig(over_prices, under_prices, devig_method)
+
+    out = []
+    i = 0
+    for accumulators in games:
+        finalized: dict[str, dict[str, MarketSummary]] = {}
+        for (alias, mkey), (over, _, point_vals) in accumulators.items():
+            j = i + len(over)
+            over_vals = [0.0 if p != p else p for p in p_over[i:j]]  # NaN -> 0
+            under_vals = [0.0 if p != p else p for p in p_under[i:j]]
+            i = j
+            finalized.setdefault(alias, {})[mkey] = MarketSummary(
+                avg_over_prob=statistics.median(over_vals) if over_vals else 0.0,
+                avg_under_prob=statistics.median(under_vals) if under_vals else 0.0,
+                avg_threshold=statistics.median(point_vals) if point_vals else 0.0,
+                samples=max(len(over_vals), len(point_vals)),
             )
+        out.append(finalized)
+    return out
+
+
+def aggregate_players_from_event(
+    event_odds: object,
+    target_player_aliases: set[str],
+    devig_method: str | None = None,
+) -> tuple[PlayerOddsMap, dict]:
+    """Aggregate per-bookmaker odds for target players from a single event response.
+
+    Returns (per_player_odds, per_player_market_summaries).
+
+    per_player_odds is a read-only view over an OddsTable (its `.table`),
+    in the predict_stats_for_player input shape per player:
+      { player_alias: { bookmaker_key: { market_key: { 'over': {...}, 'under': {...} } } } }
+    Alternate markets also carry 'alts': {'over': [...], 'under': [...]}.
 
-    return out_per_player, finalized
+    per_player_market_summaries:
+      { player_alias: { market_key: MarketSummary(...) } }
+    Each book's line is de-vigged with `devig_method` (devig.METHODS;
+    default devig.DEVIG_METHOD) before the median across books.
+    """
+    table = OddsTable()
+    accumulators: dict = {}
+    _stream_event(event_odds, NameResolver(target_player_aliases or ()), table, accumulators)
+    return table.by_player(), _summaries([accumulators], devig_method)[0]
 
 
 def aggregate_by_week(
     event_odds_by_game: dict[str, list],
     planned_games: dict[str, object],  # PlannedGame-like with .players
-) -> tuple[dict[str, dict], dict[str, dict]]:
+    devig_method: str | None = None,
+) -> tuple[PlayerOddsMap, dict[str, dict]]:
     """Aggregate players across all games in a window.
 
-    Returns (per_player_odds, per_player_market_summaries) where keys are player aliases.
+    Returns (per_player_odds, per_player_market_summaries) where keys are player aliases,
+    shaped as aggregate_players_from_event's. Every game streams into one
+    OddsTable and the whole week is de-vigged in one batch; summaries are
+    taken per game and combined by sample size when a player appears in
+    several.
     """
-    per_player_odds: dict[str, dict] = {}
-    per_player_summaries: dict[str, dict] = {}
+    table = OddsTable()
+    games: list[dict] = []
 
     for gid, event_odds in event_odds_by_game.items():
         game_plan = planned_games.get(gid)
         if not game_plan:
             continue
-        aliases = {p["alias"] for p in game_plan.players}
-        p_odds, p_summ = aggregate_players_from_event(event_odds, aliases)
-
-        # Merge per-player odds
-        for alias, by_book in p_odds.items():
-            per_player_odds.setdefault(alias, {})
-            # merge bookmakers
-            for book_key, mkts in by_book.items():
-                per_player_odds[alias].setdefault(book_key, {})
-                for mkey, sides in mkts.items():
-                    per_player_odds[alias][book_key].setdefault(mkey, {"over": None, "under": None})
-                    for side, payload in sides.items():
-                        if payload:
-                            per_player_odds[alias][book_key][mkey][side] = payload
+        # Aliases first; players the planner knows by Sleeper id also match
+        # any spelling the player index resolves to them
+        resolve = NameResolver(
+            {p["alias"] for p in game_plan.players},
+            ids={p["player_id"]: p["alias"] for p in game_plan.players if p.get("player_id")},
+            teams=(getattr(game_plan, "home_team", ""), getattr(game_plan, "away_team", "")),
+        )
+        accumulators: dict = {}
+        _stream_event(event_odds, resolve, table, accumulators)
+        games.append(accumulators)
 
+    per_player_summaries: dict[str, dict] = {}
+    for game_summaries in _summaries(games, devig_method):
         # Merge summaries (average of averages isn't ideal, but fine for a first pass)
-        for alias, mkts in p_summ.items():
-            per_player_summaries.setdefault(alias, {})
+        for alias, mkts in game_summaries.items():
+            merged = per_player_summaries.setdefault(alias, {})
             for mkey, summ in mkts.items():
-                # If already exists, do a simple running average by sample size
-                if mkey in per_player_summaries[alias]:
-                    prev = per_player_summaries[alias][mkey]
-                    total_n = prev.samples + summ.samples
-                    if total_n == 0:
-                        continue
-                    w_prev = prev.samples / total_n
-                    w_new = summ.samples / total_n
-                    per_player_summaries[alias][mkey] = MarketSummary(
-                        avg_over_prob=prev.avg_over_prob * w_prev + summ.avg_over_prob * w_new,
-                        avg_under_prob=prev.avg_under_prob * w_prev + summ.avg_under_prob * w_new,
-                        avg_threshold=prev.avg_threshold * w_prev + summ.avg_threshold * w_new,
-                        samples=total_n,
-                    )
-                else:
-                    per_player_summaries[alias][mkey] = summ
-
-    return per_player_odds, per_player_summaries
+                prev = merged.get(mkey)
+                if prev is None:
+                    merged[mkey] = summ
+                    continue
+                # Already seen in another game: running average by sample size
+                total_n = prev.samples + summ.samples
+                if total_n == 0:
+                    continue
+                w_prev = prev.samples / total_n
+                w_new = summ.samples / total_n
+                merged[mkey] = MarketSummary(
+                    avg_over_prob=prev.avg_over_prob * w_prev + summ.avg_over_prob * w_new,
+                    avg_under_prob=prev.avg_under_prob * w_prev + summ.avg_under_prob * w_new,
+                    avg_threshold=prev.avg_threshold * w_prev + summ.avg_threshold * w_new,
+                    samples=total_n,
+                )
+
+    return table.by_player(), per_player_summaries
@@ -18,12 +18,16 @@ from urllib.parse import parse_qs
 from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
 
 from . import (
+    names,
     odds_details,  # for the /player/odds and /defense/odds endpoints
+    prefetch,
     ratelimit,
+    sleeper_api,
 )
 from .config import DEFAULT_SEASON
 from .lineup import build_lineup, build_lineup_diffs
 from .services import (
+    RequestContext,
     build_dashboard,
     compute_book_coverage,
     compute_draft_board,
@@ -135,6 +139,13 @@ def _serve_static(environ, start_response: Callable, rel_path: str):
 
 
 def application(environ, start_response):
+    # One Sleeper request scope per API request: /dashboard and friends
+    # resolve the same league several times, but fetch it once.
+    with sleeper_api.request_scope():
+        return _route(environ, start_response)
+
+
+def _route(environ, start_response):
     path = environ.get("PATH_INFO", "/")
     method = environ.get("REQUEST_METHOD", "GET")
     qs = parse_qs(environ.get("QUERY_STRING", ""))
@@ -175,6 +186,8 @@ def application(environ, start_response):
                     "status": "ok",
                     "ratelimit": ratelimit.format_status(),
                     "ratelimit_info": ratelimit.get_details(),
+                    "sleeper_latency": sleeper_api.get_latency_metrics(),
+                    "name_matching": names.get_match_stats(),
                 },
             )
 
@@ -280,16 +293,19 @@ def application(environ, start_response):
             _dprint(
                 f"[api] lineup user={username} season={season} week={week} target={target} region={region} mode={mode} model={model} fresh={fresh} league_id={league_id} roster_id={roster_id}"
             )
+            eff_mode = "fresh" if fresh else mode
+            ctx = RequestContext(username, season, region, eff_mode, league_id, roster_id)
             proj = compute_projections(
                 username=username,
                 season=season,
                 week=week,
                 region=region,
                 fresh=fresh,
-                cache_mode=("fresh" if fresh else mode),
+                cache_mode=eff_mode,
                 model=model,
                 league_id=league_id,
                 roster_id=roster_id,
+                ctx=ctx,
             )
             def_data = list_defenses(
                 username=username,
@@ -298,9 +314,10 @@ def application(environ, start_response):
                 scope="owned",
                 region=region,
                 fresh=fresh,
-                cache_mode=("fresh" if fresh else mode),
+                cache_mode=eff_mode,
                 league_id=league_id,
                 roster_id=roster_id,
+                ctx=ctx,
             )
             lineup = build_lineup(
                 proj.get("players", []), target=target, defenses=def_data.get("defenses", [])
@@ -325,16 +342,19 @@ def application(environ, start_response):
             _dprint(
                 f"[api] lineup/diffs user={username} season={season} week={week} region={region} mode={mode} model={model} fresh={fresh} league_id={league_id} roster_id={roster_id}"
             )
+            eff_mode = "fresh" if fresh else mode
+            ctx = RequestContext(username, season, region, eff_mode, league_id, roster_id)
             proj = compute_projections(
                 username=username,
                 season=season,
                 week=week,
                 region=region,
                 fresh=fresh,
-                cache_mode=("fresh" if fresh else mode),
+                cache_mode=eff_mode,
                 model=model,
                 league_id=league_id,
                 roster_id=roster_id,
+                ctx=ctx,
             )
             def_data = list_defenses(
                 username=username,
@@ -343,9 +363,10 @@ def application(environ, start_response):
                 scope="owned",
                 region=region,
                 fresh=fresh,
-                cache_mode=("fresh" if fresh else mode),
+                cache_mode=eff_mode,
                 league_id=league_id,
                 roster_id=roster_id,
+                ctx=ctx,
             )
             diffs = build_lineup_diffs(
                 proj.get("players", []), defenses=def_data.get("defenses", [])
@@ -524,6 +545,18 @@ def main():
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8000)
     parser.add_argument("--debug", action="store_true", help="Enable verbose API debug logging")
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="Prefetch odds in the background for leagues this server resolves (see prefetch.py)",
+    )
+    parser.add_argument(
+        "--prefetch-league",
+        action="append",
+        default=[],
+        metavar="LEAGUE_ID",
+        help="Register a Sleeper league for prefetch at startup (repeatable)",
+    )
     args = parser.parse_args()
 
     # Set module debug flag from CLI
@@ -596,6 +629,15 @@ Endpoints:
             print(f"[api] READY on http://{host}:{port} (health not reachable yet)", flush=True)
 
         threading.Thread(target=_probe_ready, args=(args.host, args.port), daemon=True).start()
+        if args.prefetch:
+            env_leagues = os.getenv("PREFETCH_LEAGUES", "").split(",")
+            for league_id in [*args.prefetch_league, *env_leagues]:
+                prefetch.register_league(league_id.strip())
+            prefetch.start()
+            print(
+                f"[api] Prefetch ON leagues={prefetch.registered_leagues() or '(from traffic)'}",
+                flush=True,
+            )
         httpd.serve_forever()
 
 
@@ -0,0 +1,136 @@
+"""Batch de-vig: fair over/under probabilities for many two-way lines at once.
+
+A book's over and under prices imply probabilities 1/price that sum to
+more than 1 (the vig); de-vigging splits that margin back out. The
+aggregator and the anchor collection (prob_models) used to do it one pair
+at a time, each with its own try/except, so the methodology doc's
+candidate upgrades (§2.1) would have meant a solver per line. Here a
+whole slate's pairs go through one devig() call:
+
+- "proportional": each side divided by their sum (the current choice);
+- "shin": Shin's insider-trading model. For a two-way market Shin's z has
+  a closed form and the fair probabilities come out as the implied ones
+  less an equal share of the margin, so nothing has to be iterated;
+- "power": p = implied ** k with k solved so the sides sum to 1, by a few
+  Newton steps run on every pair at once.
+
+The method is a parameter, defaulting to DEVIG_METHOD (env, "proportional"
+until calibration settles §2.1). NumPy is optional: without it the same
+arithmetic runs pair by pair.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional; devig() falls back to a per-pair loop
+    np = None
+
+METHODS = ("proportional", "shin", "power")
+DEVIG_METHOD = os.getenv("DEVIG_METHOD", "proportional")
+if DEVIG_METHOD not in METHODS:
+    # Fail at startup, not inside every aggregation (or a projection key)
+    raise ValueError(f"DEVIG_METHOD={DEVIG_METHOD!r} is not one of {', '.join(METHODS)}")
+
+# Newton iterations for the power method's exponent; it converges
+# quadratically from k=1, and typical prop margins need 3-4
+_POWER_STEPS = 12
+_POWER_TOL = 1e-12
+
+
+def _implied(price: object) -> float:
+    """1/price, or NaN for a missing, non-numeric or non-positive price."""
+    try:
+        price = float(price)
+    except (TypeError, ValueError):
+        return math.nan
+    return 1.0 / price if price > 0 else math.nan
+
+
+def _pair(o: float, u: float, method: str) -> tuple[float, float]:
+    # o, u: implied probabilities of a two-sided line
+    if method == "shin":
+        po = min(max((1.0 + o - u) / 2.0, 0.0), 1.0)
+        return po, 1.0 - po
+    if method == "power" and 0.0 < o < 1.0 and 0.0 < u < 1.0:
+        lo, lu = math.log(o), math.log(u)
+        k = 1.0
+        for _ in range(_POWER_STEPS):
+            ok, uk = o**k, u**k
+            f = ok + uk - 1.0
+            if abs(f) < _POWER_TOL:
+                break
+            k -= f / (ok * lo + uk * lu)
+        po = o**k
+        return po, 1.0 - po
+    total = o + u
+    return o / total, u / total
+
+
+def _devig_python(over: list[float], under: list[float], method: str):
+    p_over, p_under = [], []
+    for o, u in zip(over, under, strict=True):
+        if o == o and u == u:  # both sides priced
+            o, u = _pair(o, u, method)
+        p_over.append(o)
+        p_under.append(u)
+    return p_over, p_under
+
+
+def _devig_numpy(over: list[float], under: list[float], method: str):
+    o = np.array(over, dtype=float)
+    u = np.array(under, dtype=float)
+    both = ~(np.isnan(o) | np.isnan(u))
+    bo, bu = o[both], u[both]
+    if method == "shin":
+        po = np.clip((1.0 + bo - bu) / 2.0, 0.0, 1.0)
+        pu = 1.0 - po
+    else:
+        total = bo + bu
+        po, pu = bo / total, bu / total
+    if method == "power":
+        # Solve bo**k + bu**k = 1 for the lines it's defined on; the rest
+        # (a side implied at >= 100%) keep the proportional split
+        ok = (bo > 0) & (bo < 1) & (bu > 0) & (bu < 1)
+        so, su = bo[ok], bu[ok]
+        lo, lu = np.log(so), np.log(su)
+        k = np.ones_like(so)
+        for _ in range(_POWER_STEPS):
+            sok, suk = so**k, su**k
+            f = sok + suk - 1.0
+            if not len(f) or np.max(np.abs(f)) < _POWER_TOL:
+                break
+            k -= f / (sok * lo + suk * lu)
+        po[ok] = so**k
+        pu[ok] = 1.0 - po[ok]
+    o[both] = po
+    u[both] = pu
+    return o.tolist(), u.tolist()
+
+
+def devig(
+    over_prices: Sequence[object],
+    under_prices: Sequence[object],
+    method: str | None = None,
+) -> tuple[list[float], list[float]]:
+    """Fair (p_over, p_under) for paired decimal prices, one pair per index.
+
+    A pair with both sides priced is de-vigged with `method` (one of
+    METHODS; default DEVIG_METHOD). A one-sided pair keeps the raw implied
+    probability of the priced side; an unpriced side (None, non-numeric or
+    <= 0) comes back NaN, so callers decide how to fill it.
+    """
+    method = method or DEVIG_METHOD
+    if method not in METHODS:
+        raise ValueError(f"unknown de-vig method {method!r}; expected one of {METHODS}")
+    over = [_implied(p) for p in over_prices]
+    under = [_implied(p) for p in under_prices]
+    if len(over) != len(under):
+        raise ValueError("over_prices and under_prices must pair up")
+    if np is None:
+        return _devig_python(over, under, method)
+    return _devig_numpy(over, under, method)
@@ -0,0 +1,340 @@
+"""Fitted stat distributions: one object per player-market fit.
+
+The probability models used to hand back only (q15, q50, q85), so anything
+wanting more of the curve -- other percentiles, the drill-down chart,
+sampling -- had to refit from the anchors. A StatDistribution is the fit
+itself: CDF, inverse CDF, PMF for discrete markets, sampling, and the
+floor/mid/ceiling triple range_model uses, all read off the same object.
+
+The line-anchor models ("const", "puelz", "angelini") are fitted here and
+memoized on their anchors, so /projections, /player/odds and the drill-down
+chart share one fit per player-market. The single-line fallback is fitted
+in range_model.fit_single_line, memoized the same way. prob_models keeps the
+numerics both are built from.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterable
+from functools import cached_property, lru_cache
+from statistics import NormalDist
+
+from .prob_models import (
+    STANDARD_QUANTILES,
+    PchipCdf,
+    _collect_threshold_anchors,
+    _fit_lognormal_from_two_points,
+    _inverse_cdf,
+    _is_discrete_market,
+    _lognormal_quantile,
+    _poisson_fit_lambda,
+    poisson_quantile,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional; PoissonStat.sample bisects draw by draw
+    np = None
+
+# Percentile levels used for the full-curve output
+CURVE_LEVELS = tuple(i / 40 for i in range(1, 40))
+
+
+class StatDistribution(ABC):
+    discrete = False
+
+    @abstractmethod
+    def cdf(self, x: float) -> float: ...
+
+    @abstractmethod
+    def ppf(self, q: float) -> float: ...
+
+    def pmf(self, k: int) -> float:
+        raise ValueError(f"{type(self).__name__} is continuous; it has no PMF")
+
+    @abstractmethod
+    def describe(self) -> dict:
+        """Kind and parameters, for debug payloads."""
+
+    def floor_mid_ceiling(self) -> tuple[float, float, float]:
+        q15, q50, q85 = (self.ppf(q) for q in STANDARD_QUANTILES)
+        return float(q15), float(q50), float(q85)
+
+    def percentiles(self, qs: Iterable[float]) -> list[float]:
+        return [float(self.ppf(q)) for q in qs]
+
+    def sample(self, n: int, rng: random.Random | None = None) -> list[float]:
+        """n draws by inverse transform; pass a seeded `rng` for repeatability."""
+        rng = rng or random.Random()
+        return [float(self.ppf(rng.random())) for _ in range(n)]
+
+    def curve(self) -> list[list[float]]:
+        """[x, F(x)] points spanning the bulk of the distribution."""
+        xs = sorted({round(x, 4) for x in self.percentiles(CURVE_LEVELS)})
+        return [[x, round(self.cdf(x), 6)] for x in xs]
+
+
+class BernoulliStat(StatDistribution):
+    """0/1 outcome (anytime TD). `mean` is reported as the mid, as the
+    single-line fallback always has, rather than the 0/1 median."""
+
+    discrete = True
+
+    def __init__(self, p: float, mean: float | None = None):
+        self.p = p
+        self.mean = p if mean is None else mean
+
+    def cdf(self, x: float) -> float:
+        if x < 0:
+            return 0.0
+        return 1.0 - self.p if x < 1 else 1.0
+
+    def ppf(self, q: float) -> float:
+        return 0.0 if 1 - self.p >= q else 1.0
+
+    def pmf(self, k: int) -> float:
+        return {0: 1.0 - self.p, 1: self.p}.get(k, 0.0)
+
+    def floor_mid_ceiling(self) -> tuple[float, float, float]:
+        return self.ppf(0.15), self.mean, self.ppf(0.85)
+
+    def describe(self) -> dict:
+        return {"kind": "bernoulli", "p": self.p}
+
+
+class PoissonStat(StatDistribution):
+    discrete = True
+
+    def __init__(self, lam: float):
+        self.lam = lam
+
+    def pmf(self, k: int) -> float:
+        if k < 0 or self.lam <= 0:
+            return float(k == 0)
+        return math.exp(k * math.log(self.lam) - self.lam - math.lgamma(k + 1))
+
+    def cdf(self, x: float) -> float:
+        if x < 0:
+            return 0.0
+        return min(1.0, sum(self.pmf(k) for k in range(math.floor(x) + 1)))
+
+    @cached_property
+    def _cdf_table(self) -> list[float]:
+        """P(X <= k) for k up to ~12 sd past the mean, summed as the PMF walk
+        does, so one table answers every non-standard quantile and draw."""
+        size = int(self.lam + 12.0 * math.sqrt(self.lam) + 20.0) + 1
+        term = math.exp(-self.lam)
+        table = [term]
+        for k in range(1, size):
+            term *= self.lam / k
+            table.append(table[-1] + term)
+        return table
+
+    def _lookup(self, target: float) -> float:
+        return float(min(bisect_left(self._cdf_table, target), len(self._cdf_table) - 1))
+
+    def ppf(self, q: float) -> float:
+        if self.lam <= 0 or q in STANDARD_QUANTILES:
+            return poisson_quantile(self.lam, q)
+        return self._lookup(min(max(q, 1e-6), 1 - 1e-9))
+
+    def sample(self, n: int, rng: random.Random | None = None) -> list[float]:
+        rng = rng or random.Random()
+        u = [min(max(rng.random(), 1e-6), 1 - 1e-9) for _ in range(n)]
+        if self.lam <= 0:
+            return [0.0] * n
+        if np is None:
+            return [self._lookup(t) for t in u]
+        k = np.searchsorted(np.asarray(self._cdf_table), u, side="left")
+        return np.minimum(k, len(self._cdf_table) - 1).astype(float).tolist()
+
+    def describe(self) -> dict:
+        return {"kind": "poisson", "lambda": self.lam}
+
+
+class LogNormalStat(StatDistribution):
+    def __init__(self, mu: float, sigma: float):
+        self.mu = mu
+        self.sigma = sigma
+
+    def cdf(self, x: float) -> float:
+        if x <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return float(math.log(x) >= self.mu)
+        return NormalDist(self.mu, self.sigma).cdf(math.log(x))
+
+    def ppf(self, q: float) -> float:
+        return _lognormal_quantile(self.mu, self.sigma, q)
+
+    def describe(self) -> dict:
+        return {"kind": "lognormal", "mu": self.mu, "sigma": self.sigma}
+
+
+class NormalStat(StatDistribution):
+    """Normal(mean, sigma); `nonneg` clips quantiles at zero for stats that
+    can't go negative (the clipped mass sits at 0)."""
+
+    def __init__(self, mean: float, sigma: float, nonneg: bool = False):
+        self.mean = mean
+        self.sigma = sigma
+        self.nonneg = nonneg
+
+    def cdf(self, x: float) -> float:
+        if self.nonneg and x < 0:
+            return 0.0
+        return NormalDist(self.mean, self.sigma).cdf(x)
+
+    def ppf(self, q: float) -> float:
+        x = self.mean + NormalDist().inv_cdf(min(max(q, 1e-9), 1 - 1e-9)) * self.sigma
+        return max(0.0, x) if self.nonneg else x
+
+    def floor_mid_ceiling(self) -> tuple[float, float, float]:
+        z15 = NormalDist().inv_cdf(STANDARD_QUANTILES[0])
+        z85 = NormalDist().inv_cdf(STANDARD_QUANTILES[2])
+        q = (self.mean + z15 * self.sigma, self.mean, self.mean + z85 * self.sigma)
+        if self.nonneg:
+            q = tuple(max(0.0, v) for v in q)
+        return q
+
+    def describe(self) -> dict:
+        return {"kind": "normal", "mean": self.mean, "sigma": self.sigma}
+
+
+class AnchoredStat(StatDistribution):
+    """CDF interpolated through line anchors (x, F(x)) -- linearly or with
+    monotone PCHIP -- and flat outside the anchor span unless `tails` is set.
+
+    `tails` ("poisson" for count stats, "lognormal" for yardage) extends the
+    curve past the outermost anchors with a parametric tail fitted to them;
+    each tail is fitted on first use.
+    """
+
+    def __init__(
+        self,
+        xs: Iterable[float],
+        cdf_y: Iterable[float],
+        method: str = "pchip",
+        tails: str | None = None,
+    ):
+        self.xs = list(xs)
+        self.cdf_y = list(cdf_y)
+        self.method = method
+        self.tails = tails
+        self._pchip = PchipCdf(self.xs, self.cdf_y) if method == "pchip" else None
+
+    def _interp_ppf(self, q: float) -> float:
+        if self._pchip is not None:
+            return self._pchip.inverse(q)
+        return _inverse_cdf(self.xs, self.cdf_y, q)
+
+    def _interp_cdf(self, x: float) -> float:
+        if self._pchip is not None:
+            return self._pchip.cdf(x)
+        xs, ys = self.xs, self.cdf_y
+        if x <= xs[0]:
+            return ys[0]
+        if x >= xs[-1]:
+            return ys[-1]
+        for i in range(1, len(xs)):
+            if x <= xs[i]:
+                t = (x - xs[i - 1]) / (xs[i] - xs[i - 1])
+                return ys[i - 1] + t * (ys[i] - ys[i - 1])
+        return ys[-1]
+
+    @cached_property
+    def lower_tail(self) -> StatDistribution | None:
+        return self._fit_tail(range(min(3, len(self.xs))), (0, 1))
+
+    @cached_property
+    def upper_tail(self) -> StatDistribution | None:
+        n = len(self.xs)
+        return self._fit_tail(range(max(0, n - 3), n), (n - 2, n - 1))
+
+    def _fit_tail(self, count_idx: Iterable[int], pair: tuple[int, int]) -> StatDistribution | None:
+        if self.tails == "poisson":
+            lam = _poisson_fit_lambda(
+                [(round(self.xs[j]), float(self.cdf_y[j])) for j in count_idx]
+            )
+            return PoissonStat(lam) if lam is not None else None
+        if len(self.xs) < 2:
+            return None
+        i, j = pair
+        fit = _fit_lognormal_from_two_points(
+            max(self.xs[i], 1e-6), self.cdf_y[i], max(self.xs[j], 1e-6), self.cdf_y[j]
+        )
+        return LogNormalStat(*fit) if fit else None
+
+    def ppf(self, q: float) -> float:
+        if self.tails and self.cdf_y[0] - 1e-9 > q and self.lower_tail is not None:
+            return self.lower_tail.ppf(q)
+        if self.tails and self.cdf_y[-1] + 1e-9 < q and self.upper_tail is not None:
+            return self.upper_tail.ppf(q)
+        return self._interp_ppf(q)
+
+    def cdf(self, x: float) -> float:
+        if self.tails and x < self.xs[0] and self.lower_tail is not None:
+            return min(self.lower_tail.cdf(x), self.cdf_y[0])
+        if self.tails and x > self.xs[-1] and self.upper_tail is not None:
+            return max(self.upper_tail.cdf(x), self.cdf_y[-1])
+        return self._interp_cdf(x)
+
+    def describe(self) -> dict:
+        return {
+            "kind": f"anchored_{self.method}",
+            "anchors": [[x, y] for x, y in zip(self.xs, self.cdf_y, strict=True)],
+            "tails": self.tails,
+        }
+
+
+def band(mean: float) -> AnchoredStat:
+    """No market summary to fit: the +/-20% band around the mean, as a
+    linear CDF through (0.8m, 15%), (m, 50%), (1.2m, 85%)."""
+    xs = [max(0.0, mean * 0.8), max(0.0, mean), max(0.0, mean * 1.2)]
+    return AnchoredStat(xs, STANDARD_QUANTILES, method="linear")
+
+
+@lru_cache(maxsize=4096)
+def _fit_anchors(
+    xs: tuple[float, ...], cdf_y: tuple[float, ...], method: str, tails: str | None
+) -> AnchoredStat:
+    return AnchoredStat(xs, cdf_y, method, tails)
+
+
+def fit_const(per_bookmaker_odds: dict, market_key: str) -> StatDistribution | None:
+    # Constantini/Piersanti: anchors -> CDF via linear interpolation (after isotonic)
+    xs, F = _collect_threshold_anchors(per_bookmaker_odds, market_key)
+    if len(xs) < 3:
+        return None
+    return _fit_anchors(tuple(xs), tuple(F), "linear", None)
+
+
+def fit_puelz(per_bookmaker_odds: dict, market_key: str) -> StatDistribution | None:
+    # Puelz/Snowberg: survival anchors S(x)=p_over, F=1-S, PCHIP monotone interpolation
+    xs, F = _collect_threshold_anchors(per_bookmaker_odds, market_key)
+    if len(xs) < 3:
+        return None
+    return _fit_anchors(tuple(xs), tuple(F), "pchip", None)
+
+
+def fit_angelini(per_bookmaker_odds: dict, market_key: str) -> StatDistribution | None:
+    # Angelini: PCHIP + parametric tails (yards: lognormal; discrete counts: Poisson)
+    xs, F = _collect_threshold_anchors(per_bookmaker_odds, market_key)
+    if len(xs) >= 4:
+        tails = "poisson" if _is_discrete_market(market_key) else "lognormal"
+        return _fit_anchors(tuple(xs), tuple(F), "pchip", tails)
+    # Not enough anchors -> fallback to Puelz -> Constantini
+    return fit_puelz(per_bookmaker_odds, market_key) or fit_const(per_bookmaker_odds, market_key)
+
+
+def get_model_registry():
+    return {
+        "baseline": None,  # handled by range_model.fit_single_line
+        "const": fit_const,
+        "puelz": fit_puelz,
+        "angelini": fit_angelini,
+    }
@@ -3,9 +3,11 @@ from __future__ import annotations
 import datetime as _dt
 
 from . import odds_client, sleeper_api
-from .config import SLEEPER_ODDS_API_PLAYER_NAME_MAPPING, SLEEPER_TO_ODDSAPI_TEAM
+from .config import SLEEPER_TO_ODDSAPI_TEAM
+from .event_index import EventIndex, as_index
+from .names import odds_alias
 from .planner import PlannedGame
-from .weekly_windows import earliest_future_week_start, in_window
+from .weekly_windows import earliest_future_week_start
 
 # Draft prep only covers positions the rest of the app already knows how to
 # turn into fantasy points (see PRIMARY_MARKET_WHITELIST in range_model.py).
@@ -41,35 +43,27 @@ def _all_active_players_by_team() -> dict[str, list[dict]]:
     include bench/practice-squad depth along with starters, which is fine --
     a draft board is supposed to be broad.
     """
-    all_players = sleeper_api.get_players()
+    players = sleeper_api.get_player_index()
     by_team: dict[str, list[dict]] = {}
-    for pdata in all_players.values():
-        pos = pdata.get("position")
-        if pos not in DRAFT_POSITIONS:
-            continue
-        team_abbr = pdata.get("team")
-        if not team_abbr:
-            continue
-        full_team = SLEEPER_TO_ODDSAPI_TEAM.get(team_abbr)
-        if not full_team:
-            continue
-        full_name = pdata.get("full_name")
-        if not full_name:
-            continue
-        alias = SLEEPER_ODDS_API_PLAYER_NAME_MAPPING.get(full_name, full_name)
-        by_team.setdefault(full_team, []).append(
-            {
-                "full_name": full_name,
-                "alias": alias,
-                "primary_position": pos,
-                "editorial_team_full_name": full_team,
-            }
-        )
+    for pos in DRAFT_POSITIONS:
+        for player in players.by_position(pos):
+            full_team = SLEEPER_TO_ODDSAPI_TEAM.get(player.team) if player.team else None
+            if not full_team or not player.full_name:
+                continue
+            by_team.setdefault(full_team, []).append(
+                {
+                    "player_id": player.player_id,
+                    "full_name": player.full_name,
+                    "alias": odds_alias(player.full_name),
+                    "primary_position": pos,
+                    "editorial_team_full_name": full_team,
+                }
+            )
     return by_team
 
 
 def _resolve_draft_week_window(
-    events: list[dict],
+    events: list[dict] | EventIndex,
     which: str = "this",
     now_utc: _dt.datetime | None = None,
 ) -> tuple[_dt.datetime, _dt.datetime] | None:
@@ -108,7 +102,7 @@ def plan_week_for_draft(
     `week="this"` means "Week 1" (the earliest week with scheduled games)
     and `week="next"` means "Week 2" -- see _resolve_draft_week_window.
     """
-    events = odds_client.get_nfl_events(regions=regions, mode=cache_mode)
+    events = as_index(odds_client.get_nfl_events(regions=regions, mode=cache_mode))
     window = _resolve_draft_week_window(events, which=week)
     if window is None:
         return {}
@@ -117,10 +111,7 @@ def plan_week_for_draft(
     by_team = _all_active_players_by_team()
 
     plan: dict[str, PlannedGame] = {}
-    for e in events:
-        ts = e.get("commence_time")
-        if not ts or not in_window(ts, (start, end)):
-            continue
+    for e in events.between(start, end):
         home, away = e.get("home_team"), e.get("away_team")
         players = list(by_team.get(home, [])) + list(by_team.get(away, []))
         if not players:
@@ -129,7 +120,7 @@ def plan_week_for_draft(
             game_id=e["id"],
             home_team=home,
             away_team=away,
-            commence_time=ts,
+            commence_time=e["commence_time"],
             players=players,
             markets=list(CORE_DRAFT_MARKETS),
         )
@@ -0,0 +1,104 @@
+"""Parse-once index over the Odds API event list.
+
+Every consumer of the events list -- week-window resolution, the roster and
+draft planners, the defense views, the prefetcher -- used to re-parse each
+event's `commence_time` with strptime and scan the whole list, and the
+planners did it once per roster player. EventIndex parses kickoffs once,
+keeps the events sorted by kickoff so window queries are a bisect, and maps
+each team to its games.
+
+Build one with `as_index(events)`: it reuses the previous index while the
+events list (ids, kickoffs, teams) is unchanged, so the parse happens once
+per events fetch rather than once per request.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import threading
+from bisect import bisect_left, bisect_right
+
+_Window = tuple[_dt.datetime, _dt.datetime]
+
+
+def parse_commence(ts: str | None) -> _dt.datetime | None:
+    """Naive-UTC datetime for an Odds API timestamp ('2025-09-07T17:00:00Z'),
+    or None if missing/unparseable."""
+    if not ts:
+        return None
+    try:
+        return _dt.datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ")
+    except ValueError:
+        pass
+    # Best effort parse for variants (fractional seconds, explicit offset)
+    try:
+        d = _dt.datetime.fromisoformat(ts.rstrip("Z"))
+    except ValueError:
+        return None
+    if d.tzinfo is not None:
+        d = d.astimezone(_dt.UTC).replace(tzinfo=None)
+    return d
+
+
+class EventIndex:
+    def __init__(self, events: list[dict]):
+        parsed = []
+        for e in events or []:
+            kickoff = parse_commence(e.get("commence_time"))
+            if kickoff is not None:
+                parsed.append((kickoff, e))
+        parsed.sort(key=lambda pair: pair[0])
+        self.times: list[_dt.datetime] = [t for t, _ in parsed]
+        self.events: list[dict] = [e for _, e in parsed]
+        self._kickoff: dict[str, _dt.datetime] = {e["id"]: t for t, e in parsed if e.get("id")}
+        # team -> positions in self.events, ascending by kickoff
+        self._by_team: dict[str, list[int]] = {}
+        for i, e in enumerate(self.events):
+            for team in {e.get("home_team"), e.get("away_team")}:
+                if team:
+                    self._by_team.setdefault(team, []).append(i)
+
+    def between(self, start: _dt.datetime, end: _dt.datetime) -> list[dict]:
+        """Events kicking off in [start, end], in kickoff order."""
+        return self.events[bisect_left(self.times, start) : bisect_right(self.times, end)]
+
+    def first_after(self, when: _dt.datetime) -> _dt.datetime | None:
+        """Earliest kickoff strictly after `when`."""
+        i = bisect_right(self.times, when)
+        return self.times[i] if i < len(self.times) else None
+
+    def for_team(self, team: str, window: _Window | None = None) -> list[dict]:
+        """`team`'s games (home or away), optionally limited to a window."""
+        rows = self._by_team.get(team, ())
+        if window is None:
+            return [self.events[i] for i in rows]
+        start, end = window
+        return [self.events[i] for i in rows if start <= self.times[i] <= end]
+
+    def kickoff(self, event_id: str) -> _dt.datetime | None:
+        return self._kickoff.get(event_id)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+
+_LAST_LOCK = threading.Lock()
+_LAST: tuple[tuple, EventIndex] | None = None
+
+
+def as_index(events: list[dict] | EventIndex) -> EventIndex:
+    """`events` as an EventIndex, reusing the last one built for the same list."""
+    global _LAST
+    if isinstance(events, EventIndex):
+        return events
+    key = tuple(
+        (e.get("id"), e.get("commence_time"), e.get("home_team"), e.get("away_team"))
+        for e in events or []
+    )
+    with _LAST_LOCK:
+        if _LAST is not None and _LAST[0] == key:
+            return _LAST[1]
+    index = EventIndex(events)
+    with _LAST_LOCK:
+        _LAST = (key, index)
+    return index
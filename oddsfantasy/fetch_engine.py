@@ -0,0 +1,130 @@
+"""Batched event-odds fetching.
+
+Every event fetch a request needs is scheduled in one batch on asyncio and
+runs concurrently, under a process-wide concurrency cap and an optional
+per-request quota budget (a QuotaBudget, shared by every batch the request
+makes). Callers stay synchronous: fetch_event_odds() is
+the facade, and returns once the whole batch has landed.
+
+There's no async HTTP client among this app's dependencies, so each fetch
+still goes through odds_client.get_event_player_odds -- and with it the
+snapshot store, per-market caching and single-flight coalescing. asyncio
+does the scheduling; a shared, bounded executor does the blocking I/O over
+odds_client's pooled session. Because that executor is shared by every
+request thread, ODDS_FETCH_CONCURRENCY caps concurrent Odds API calls for
+the whole process, not per call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+
+from . import odds_client, ratelimit
+
+FETCH_CONCURRENCY = int(os.getenv("ODDS_FETCH_CONCURRENCY", "8"))
+# Max Odds API quota units (one per market per region) a single request may
+# spend across its batches; 0 means unlimited. Jobs that would exceed it are
+# served from cache.
+QUOTA_BUDGET = int(os.getenv("ODDS_QUOTA_BUDGET", "0"))
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY, thread_name_prefix="odds-fetch")
+
+
+@dataclass(frozen=True)
+class OddsJob:
+    event_id: str
+    markets: tuple[str, ...]
+
+
+@dataclass
+class QuotaBudget:
+    """Quota units one request may spend, across however many batches it
+    fetches in; a limit of 0 means unlimited."""
+
+    limit: int = field(default_factory=lambda: QUOTA_BUDGET)
+    spent: int = 0
+
+
+def fetch_event_odds(
+    jobs: Iterable[OddsJob],
+    regions: str = "us",
+    mode: str = "auto",
+    budget: int | QuotaBudget | None = None,
+) -> dict[str, dict]:
+    """Fetch odds for every job in one concurrent batch.
+
+    Returns event_id -> event odds. Jobs naming the same event are merged
+    into one fetch. A job that fails is logged and left out of the result,
+    so one bad event can't sink the rest of the batch.
+
+    `budget` is a QuotaBudget to draw on (and charge) across calls, or a
+    limit for this batch alone; default QUOTA_BUDGET.
+    """
+    if not isinstance(budget, QuotaBudget):
+        budget = QuotaBudget() if budget is None else QuotaBudget(budget)
+    merged: dict[str, set[str]] = {}
+    for job in jobs:
+        merged.setdefault(job.event_id, set()).update(job.markets)
+    if not merged:
+        return {}
+    batch = [OddsJob(gid, tuple(sorted(mkts))) for gid, mkts in merged.items()]
+    out = asyncio.run(_fetch_all(batch, regions, mode, budget))
+    print(
+        f"[fetch] batch events={len(batch)} ok={len(out)} mode={mode} rl={ratelimit.format_status()}"
+    )
+    return out
+
+
+def _apply_budget(
+    jobs: list[OddsJob], regions: str, mode: str, budget: QuotaBudget
+) -> list[tuple[OddsJob, str]]:
+    """Pair each job with the cache mode it may run in under `budget`, and
+    charge the budget for the jobs that may spend."""
+    if budget.limit <= 0 or mode == "cache":
+        return [(job, mode) for job in jobs]
+    n_regions = max(1, len([r for r in regions.split(",") if r]))
+    planned = []
+    for job in jobs:
+        cost = n_regions * len(
+            odds_client.pending_markets(job.event_id, regions, ",".join(job.markets), mode)
+        )
+        if cost and budget.spent + cost > budget.limit:
+            print(
+                f"[fetch] quota budget {budget.limit} reached; event={job.event_id} served from cache"
+            )
+            planned.append((job, "cache"))
+            continue
+        budget.spent += cost
+        planned.append((job, mode))
+    return planned
+
+
+async def _fetch_all(
+    jobs: list[OddsJob], regions: str, mode: str, budget: QuotaBudget
+) -> dict[str, dict]:
+    loop = asyncio.get_running_loop()
+    planned = _apply_budget(jobs, regions, mode, budget)
+
+    def run(job: OddsJob, job_mode: str):
+        call = partial(
+            odds_client.get_event_player_odds,
+            job.event_id,
+            regions=regions,
+            markets=",".join(job.markets),
+            mode=job_mode,
+        )
+        return loop.run_in_executor(_EXECUTOR, call)
+
+    results = await asyncio.gather(*(run(j, m) for j, m in planned), return_exceptions=True)
+    out: dict[str, dict] = {}
+    for (job, _), res in zip(planned, results, strict=True):
+        if isinstance(res, BaseException):
+            print(f"[fetch] event={job.event_id} error: {res}")
+            continue
+        out[job.event_id] = res
+    return out
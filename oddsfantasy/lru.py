@@ -0,0 +1,77 @@
+"""Bounded in-process cache for computed service payloads.
+
+Entries are evicted least-recently-used once either the entry count or the
+approximate payload size (bytes of its JSON encoding -- every payload here
+is headed for a JSON response anyway) passes its limit, so a long-lived
+server's memory stays flat however many distinct users, weeks and models it
+sees.
+
+Freshness isn't a wall-clock TTL: each entry is stored with a fingerprint of
+the inputs it was computed from (odds snapshot fetch times, roster, scoring
+rules, ...). A lookup passes the fingerprint of the inputs as they are now,
+and an entry whose fingerprint differs is stale and dropped.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+def _payload_bytes(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class FingerprintLRU:
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (fingerprint, value, size)
+        self._entries: OrderedDict[Hashable, tuple[str, Any, int]] = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: Hashable, fingerprint: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != fingerprint:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, fingerprint: str, value: Any) -> None:
+        size = _payload_bytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (fingerprint, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def _drop(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,141 @@
+"""Player-name normalization and odds-to-player resolution.
+
+The Odds API names players in outcome descriptions ("A.J. Brown", "Kenneth
+Walker III") and Sleeper has its own spellings. Matching the two used to
+run three regexes per outcome per request, in two copies. Here it's done
+once:
+
+- normalize_name is memoized, so each distinct spelling is normalized once
+  per process; name_key additionally drops spaces, so "A.J." meets "AJ";
+- the Sleeper player index (player_index.PlayerIndex) keys players by
+  name_key, and is rebuilt only when Sleeper's player database refreshes --
+  sleeper_api hands each new index to use_player_index;
+- NameResolver maps descriptions to the caller's names through exact,
+  name-key and Sleeper player-id tiers, memoizing every description.
+
+How each description resolved, or that it didn't, is counted, so spelling
+mismatches show up in /health (get_match_stats) rather than as players
+silently missing odds.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from .config import SLEEPER_ODDS_API_PLAYER_NAME_MAPPING, SLEEPER_TO_ODDSAPI_TEAM
+
+if TYPE_CHECKING:
+    from .player_index import PlayerIndex
+
+_PUNCT = re.compile(r"[\.'`-]")
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]")
+_SPACES = re.compile(r"\s+")
+_SUFFIXES = frozenset(("jr", "sr", "ii", "iii", "iv", "v"))
+
+# Odds API full team name -> Sleeper abbreviation, to narrow name collisions
+_ODDSAPI_TO_SLEEPER_TEAM = {full: abbr for abbr, full in SLEEPER_TO_ODDSAPI_TEAM.items()}
+
+# Distinct unknown spellings kept for /health; later ones are only counted
+_UNKNOWN_MAX = 500
+
+_PLAYERS: PlayerIndex | None = None
+_STATS_LOCK = threading.Lock()
+_COUNTS = {"exact": 0, "normalized": 0, "player_id": 0, "unplanned": 0, "unknown": 0}
+_UNKNOWN: dict[str, int] = {}
+
+
+@lru_cache(maxsize=16384)
+def normalize_name(name: str) -> str:
+    """Lowercase, punctuation- and suffix-free form of a player name."""
+    if not name:
+        return ""
+    s = _PUNCT.sub(" ", name.lower())
+    s = _SPACES.sub(" ", _NON_ALNUM.sub("", s)).strip()
+    return " ".join(t for t in s.split(" ") if t not in _SUFFIXES)
+
+
+@lru_cache(maxsize=16384)
+def name_key(name: str) -> str:
+    """normalize_name without spaces: the key names are matched on."""
+    return normalize_name(name).replace(" ", "")
+
+
+def odds_alias(full_name: str) -> str:
+    """The Odds API spelling of a Sleeper full name, where it's known to differ."""
+    return SLEEPER_ODDS_API_PLAYER_NAME_MAPPING.get(full_name, full_name)
+
+
+def use_player_index(players: PlayerIndex | None) -> None:
+    """Resolve player ids against `players` from now on (None disables)."""
+    global _PLAYERS
+    _PLAYERS = players
+
+
+def _record(outcome: str, name: str) -> None:
+    with _STATS_LOCK:
+        _COUNTS[outcome] += 1
+        if outcome == "unknown" and (name in _UNKNOWN or len(_UNKNOWN) < _UNKNOWN_MAX):
+            _UNKNOWN[name] = _UNKNOWN.get(name, 0) + 1
+
+
+def get_match_stats(top: int = 10) -> dict:
+    """Resolution counts since process start, by tier, plus the most frequent
+    names that matched neither the caller's players nor Sleeper's."""
+    with _STATS_LOCK:
+        unknown = sorted(_UNKNOWN.items(), key=lambda kv: (-kv[1], kv[0]))[:top]
+        return {**_COUNTS, "top_unknown": [list(kv) for kv in unknown]}
+
+
+class NameResolver:
+    """Resolve odds descriptions to the caller's values, by dictionary hit.
+
+    `names` maps a spelling (or is an iterable of spellings, mapping to
+    themselves) to the value to return; `ids` maps Sleeper player ids to
+    values, for descriptions that only the player index recognizes, with
+    name collisions narrowed to `teams` (Odds API full names). Unresolved
+    descriptions return None; each distinct one is resolved once.
+    """
+
+    def __init__(
+        self,
+        names: Mapping[str, str] | Iterable[str],
+        ids: Mapping[str, str] | None = None,
+        teams: Iterable[str] = (),
+    ):
+        self._exact = dict(names) if isinstance(names, Mapping) else {n: n for n in names}
+        self._by_key = {name_key(n): v for n, v in self._exact.items()}
+        self._ids = ids or {}
+        self._teams = tuple(
+            _ODDSAPI_TO_SLEEPER_TEAM[t] for t in teams if t in _ODDSAPI_TO_SLEEPER_TEAM
+        )
+        self._memo: dict[str, str | None] = {}
+
+    def __call__(self, description: str) -> str | None:
+        try:
+            return self._memo[description]
+        except KeyError:
+            value = self._memo[description] = self._resolve(description)
+            return value
+
+    def _resolve(self, description: str) -> str | None:
+        value = self._exact.get(description)
+        if value is not None:
+            _record("exact", description)
+            return value
+        value = self._by_key.get(name_key(description))
+        if value is not None:
+            _record("normalized", description)
+            return value
+        players = _PLAYERS
+        if players is None or not players.by_name(description):
+            _record("unknown", description)
+            return None
+        player = players.resolve_name(description, teams=self._teams)
+        value = self._ids.get(player.player_id) if player is not None else None
+        # A real player, just not one of ours (or an ambiguous name)
+        _record("unplanned" if value is None else "player_id", description)
+        return value
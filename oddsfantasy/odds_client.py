@@ -1,16 +1,17 @@
 from __future__ import annotations
 
-import json
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any
 
 import requests
 from requests.adapters import HTTPAdapter
 
-from . import ratelimit
-from .config import API_KEY, DATA_DIR, EVENTS_URL
+from . import ratelimit, store
+from .config import API_KEY, EVENTS_URL
 
 REQ_TIMEOUT = (5, 20)  # (connect, read) seconds
 
@@ -20,14 +21,10 @@ _SESSION.headers.update({"Accept": "application/json"})
 _SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
 _SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
 
-_CACHE_FILE = os.path.join(DATA_DIR, "odds_api_cache.json")
-_META_FILE = os.path.join(DATA_DIR, "odds_api_cache_meta.json")
-_CACHE_LOCK = threading.RLock()
-_MEM_CACHE: dict | None = None
-_META: dict | None = None
-
 # TTL (seconds) for auto mode
 ODDS_TTL = int(os.getenv("ODDS_TTL", "43200"))  # 12h default
+# Hard staleness bound for swr mode: older entries are refetched inline as in auto
+ODDS_MAX_STALE = int(os.getenv("ODDS_MAX_STALE", "172800"))  # 48h default
 
 # Debug toggle for cache timing
 _DBG = os.getenv("CACHE_DEBUG") in ("1", "true", "True") or os.getenv("API_DEBUG") in (
@@ -42,81 +39,14 @@ def _log(msg: str):
         print(f"[cache] {msg}", flush=True)
 
 
-def _load_cache() -> dict:
-    global _MEM_CACHE
-    with _CACHE_LOCK:
-        if _MEM_CACHE is not None:
-            return _MEM_CACHE
-        if not os.path.exists(_CACHE_FILE):
-            _MEM_CACHE = {}
-            _log("load: no file; mem=0")
-            return _MEM_CACHE
-        t0 = time.perf_counter()
-        try:
-            size = os.path.getsize(_CACHE_FILE)
-        except Exception:
-            size = -1
-        try:
-            with open(_CACHE_FILE, encoding="utf-8") as f:
-                _MEM_CACHE = json.load(f)
-            dt = (time.perf_counter() - t0) * 1000.0
-            _log(f"load: disk bytes={size} keys={len(_MEM_CACHE)} dt_ms={dt:.1f}")
-            return _MEM_CACHE
-        except Exception as e:
-            _log(f"load: error {e}")
-            _MEM_CACHE = {}
-            return _MEM_CACHE
+def _is_fresh_enough(fetched_at: int) -> bool:
+    age = int(time.time()) - int(fetched_at)
+    return age < ODDS_TTL
 
 
-def _save_cache(cache: dict, url: str | None = None) -> None:
-    global _MEM_CACHE
-    with _CACHE_LOCK:
-        _MEM_CACHE = cache
-        try:
-            os.makedirs(DATA_DIR, exist_ok=True)
-            t0 = time.perf_counter()
-            tmp = _CACHE_FILE + ".tmp"
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(cache, f, indent=2)
-            os.replace(tmp, _CACHE_FILE)
-            dt = (time.perf_counter() - t0) * 1000.0
-            _log(f"save: keys={len(cache)} dt_ms={dt:.1f}")
-        except Exception as e:
-            _log(f"save: error {e}")
-        # Update URL timestamp
-        if url is not None:
-            meta = _load_meta()
-            meta[url] = int(time.time())
-            try:
-                with open(_META_FILE, "w", encoding="utf-8") as f:
-                    json.dump(meta, f, indent=2)
-            except Exception:
-                pass
-
-
-def _load_meta() -> dict:
-    global _META
-    with _CACHE_LOCK:
-        if _META is not None:
-            return _META
-        if not os.path.exists(_META_FILE):
-            _META = {}
-            return _META
-        try:
-            with open(_META_FILE, encoding="utf-8") as f:
-                _META = json.load(f)
-        except Exception:
-            _META = {}
-        return _META
-
-
-def _is_fresh_enough(url: str) -> bool:
-    meta = _load_meta()
-    ts = meta.get(url)
-    if not ts:
-        return False
-    age = int(time.time()) - int(ts)
-    return age < ODDS_TTL
+def _is_servable_stale(fetched_at: int) -> bool:
+    age = int(time.time()) - int(fetched_at)
+    return age < ODDS_MAX_STALE
 
 
 def get_nfl_events(
@@ -124,41 +54,88 @@ def get_nfl_events(
 ) -> list[dict[str, Any]]:
     """Fetch NFL events with per-URL TTL cache.
 
-    mode: 'auto' (TTL), 'cache' (cache-only), 'fresh' (network only)
+    mode: 'auto' (TTL), 'swr' (serve stale, refresh in background),
+    'cache' (cache-only), 'fresh' (network only)
     use_saved_data: legacy flag; when provided overrides mode mapping to 'cache'/'fresh'.
     """
     if use_saved_data is not None:
         mode = "cache" if use_saved_data else "fresh"
     url = f"{EVENTS_URL}?apiKey={API_KEY}&regions={regions}"
     t0 = time.perf_counter()
-    cache = _load_cache()
     if mode == "cache":
         # Strict cache-only behavior
-        if url in cache:
+        snap = store.get_events(regions)
+        ratelimit.update_cached("events")
+        if snap is not None:
             _log(f"events: CACHE_HIT dt_ms={(time.perf_counter() - t0) * 1000.0:.1f}")
-            ratelimit.update_cached("events")
-            return cache[url]
+            return snap[1]
         _log("events: CACHE_MISS strict")
-        ratelimit.update_cached("events")
         return []
     if mode == "auto":
-        if url in cache and _is_fresh_enough(url):
+        snap = store.get_events(regions)
+        if snap is not None and _is_fresh_enough(snap[0]):
             _log(f"events: TTL_HIT dt_ms={(time.perf_counter() - t0) * 1000.0:.1f}")
             ratelimit.update_cached("events")
-            return cache[url]
+            return snap[1]
         _log("events: TTL_EXPIRED or MISS; fetching")
+    if mode == "swr":
+        snap = store.get_events(regions)
+        if snap is not None and _is_servable_stale(snap[0]):
+            if not _is_fresh_enough(snap[0]):
+                _revalidate(f"{EVENTS_URL}?regions={regions}", get_nfl_events, regions, mode="auto")
+            _log(f"events: SWR_HIT dt_ms={(time.perf_counter() - t0) * 1000.0:.1f}")
+            ratelimit.update_cached("events")
+            return snap[1]
+        _log("events: MISS or past ODDS_MAX_STALE; fetching")
 
     # Fresh mode: bypass cache and hit network
     resp = _SESSION.get(url, timeout=REQ_TIMEOUT)
     resp.raise_for_status()
     data = resp.json()
     ratelimit.update_from_response(resp.headers, "events")
-    cache[url] = data
-    _save_cache(cache, url)
+    store.put_events(regions, data)
     _log(f"events: NETWORK dt_ms={(time.perf_counter() - t0) * 1000.0:.1f}")
     return data
 
 
+def _stale_markets(wanted: list[str], fetched: dict[str, int], mode: str) -> list[str]:
+    if mode == "cache":
+        return []
+    if mode == "auto":
+        return [m for m in wanted if m not in fetched or not _is_fresh_enough(fetched[m])]
+    if mode == "swr":
+        return [m for m in wanted if m not in fetched or not _is_servable_stale(fetched[m])]
+    return list(wanted)
+
+
+def pending_markets(event_id: str, regions: str, markets: str, mode: str = "auto") -> list[str]:
+    """Markets a get_event_player_odds call with these arguments would request
+    from the network (the quota it would spend, one unit per market/region)."""
+    wanted = sorted({m for m in (markets or "").split(",") if m})
+    return _stale_markets(wanted, store.market_fetch_times(event_id, regions, wanted), mode)
+
+
+def merge_event_odds(base: dict, extra: dict) -> dict:
+    """Overlay `extra`'s bookmaker markets onto `base` (same event)."""
+    out = dict(base) if base else {}
+    for k, v in (extra or {}).items():
+        if k != "bookmakers":
+            out[k] = v
+    books = {b["key"]: b for b in (base or {}).get("bookmakers", []) if b.get("key")}
+    for book in (extra or {}).get("bookmakers", []):
+        key = book.get("key")
+        if key not in books:
+            books[key] = book
+            continue
+        prev = books[key]
+        by_market = {m.get("key"): m for m in prev.get("markets", [])}
+        for m in book.get("markets", []):
+            by_market[m.get("key")] = m
+        books[key] = {**prev, **book, "markets": list(by_market.values())}
+    out["bookmakers"] = list(books.values())
+    return out
+
+
 def get_event_player_odds(
     event_id: str,
     regions: str = "us",
@@ -166,29 +143,173 @@ def get_event_player_odds(
     mode: str = "auto",
     use_saved_data: bool | None = None,
 ):
+    """Fetch event odds, caching per (event, region, market).
+
+    Only markets that are missing (or, in 'auto', past ODDS_TTL) are requested
+    from the API; the rest come from the store and are merged into one
+    response. So a roster that needs one more market than another still
+    shares every market they have in common.
+
+    In 'swr', markets past ODDS_TTL but within ODDS_MAX_STALE are served as
+    they are and refreshed in the background; only missing (or too old)
+    markets block the call.
+    """
     if use_saved_data is not None:
         mode = "cache" if use_saved_data else "fresh"
-    url = f"{EVENTS_URL}/{event_id}/odds?apiKey={API_KEY}&regions={regions}&markets={markets}"
+    wanted = sorted({m for m in (markets or "").split(",") if m})
     t0 = time.perf_counter()
-    cache = _load_cache()
+    fetched = store.market_fetch_times(event_id, regions, wanted)
     if mode == "cache":
-        if url in cache:
+        ratelimit.update_cached(f"event_odds:{event_id}")
+        if fetched:
             _log(f"event:{event_id} CACHE_HIT dt_ms={(time.perf_counter() - t0) * 1000.0:.1f}")
-            ratelimit.update_cached(f"event_odds:{event_id}")
-            return cache[url]
+            return store.get_event_odds(event_id, regions, [m for m in wanted if m in fetched])
         _log(f"event:{event_id} CACHE_MISS strict")
-        ratelimit.update_cached(f"event_odds:{event_id}")
         return {}
-    if mode == "auto" and url in cache and _is_fresh_enough(url):
+    missing = _stale_markets(wanted, fetched, mode)
+    if mode == "swr":
+        stale = [m for m in wanted if m not in missing and not _is_fresh_enough(fetched[m])]
+        if stale:
+            stale_str = ",".join(stale)
+            _revalidate(
+                f"{EVENTS_URL}/{event_id}/odds?regions={regions}&markets={stale_str}",
+                get_event_player_odds,
+                event_id,
+                regions,
+                stale_str,
+                mode="auto",
+            )
+    if wanted and not missing:
         _log(f"event:{event_id} TTL_HIT dt_ms={(time.perf_counter() - t0) * 1000.0:.1f}")
         ratelimit.update_cached(f"event_odds:{event_id}")
-        return cache[url]
+        return store.get_event_odds(event_id, regions, wanted)
+
+    own, waits = _claim_flight(event_id, regions, missing)
+    try:
+        if own.markets or not missing:
+            own.data = _fetch_event_markets(event_id, regions, sorted(own.markets))
+    except Exception as e:
+        own.error = e
+        raise
+    finally:
+        _release_flight(event_id, regions, own)
+    parts = []
+    for flight in waits:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        parts.append(_only_markets(flight.data, set(missing)))
+    _log(
+        f"event:{event_id} NETWORK markets={len(own.markets)}/{len(wanted)} coalesced={len(waits)} dt_ms={(time.perf_counter() - t0) * 1000.0:.1f}"
+    )
+    cached = [m for m in wanted if m not in missing]
+    if not cached and not parts:
+        return own.data
+    merged = store.get_event_odds(event_id, regions, cached) if cached else {}
+    for part in [*parts, own.data]:
+        if part:
+            merged = merge_event_odds(merged, part)
+    return merged
 
+
+def _fetch_event_markets(event_id: str, regions: str, markets: list[str]) -> dict:
+    markets_str = ",".join(markets)
+    url = f"{EVENTS_URL}/{event_id}/odds?apiKey={API_KEY}&regions={regions}&markets={markets_str}"
     resp = _SESSION.get(url, timeout=REQ_TIMEOUT)
     resp.raise_for_status()
     data = resp.json()
     ratelimit.update_from_response(resp.headers, f"event_odds:{event_id}")
-    cache[url] = data
-    _save_cache(cache, url)
-    _log(f"event:{event_id} NETWORK dt_ms={(time.perf_counter() - t0) * 1000.0:.1f}")
+    store.put_event_odds(event_id, regions, markets, data)
     return data
+
+
+# --- Background revalidation (swr) ----------------------------------------
+#
+# A stale entry served in 'swr' mode queues one refresh per URL (API key
+# left out); further hits on the same URL while it's queued or running don't
+# queue another. Refreshes run in 'auto', so one that lands after someone
+# else already refreshed the entry is a cache hit, not a second API call.
+
+_REVALIDATE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="odds-swr")
+_REVALIDATE_LOCK = threading.Lock()
+_REVALIDATING: set[str] = set()
+
+
+def _revalidate(key: str, fn, *args, **kwargs) -> None:
+    with _REVALIDATE_LOCK:
+        if key in _REVALIDATING:
+            return
+        _REVALIDATING.add(key)
+
+    def run():
+        try:
+            fn(*args, **kwargs)
+            _log(f"revalidated {key}")
+        except Exception as e:
+            print(f"[cache] background refresh failed {key}: {e}")
+        finally:
+            with _REVALIDATE_LOCK:
+                _REVALIDATING.discard(key)
+
+    _REVALIDATE_POOL.submit(run)
+
+
+# --- Single-flight ---------------------------------------------------------
+#
+# On a cold cache, every league member's refresh (and the dashboard's this/next
+# weeks, and the draft board) can ask for the same event at once. Each
+# in-flight network fetch is registered here by (event, region) with the
+# markets it covers; a request whose missing markets are already being fetched
+# waits on that fetch instead of spending its own quota, and only requests the
+# markets nobody else has in flight.
+
+
+@dataclass(eq=False)
+class _Flight:
+    markets: frozenset[str]
+    done: threading.Event = field(default_factory=threading.Event)
+    data: dict | None = None
+    error: Exception | None = None
+
+
+_FLIGHTS_LOCK = threading.Lock()
+_FLIGHTS: dict[tuple[str, str], list[_Flight]] = {}
+
+
+def _claim_flight(event_id: str, regions: str, missing: list[str]) -> tuple[_Flight, list[_Flight]]:
+    """Return (our flight for the uncovered markets, in-flight fetches to wait on)."""
+    with _FLIGHTS_LOCK:
+        active = _FLIGHTS.setdefault((event_id, regions), [])
+        uncovered = set(missing)
+        waits = []
+        for flight in active:
+            if flight.markets & uncovered:
+                waits.append(flight)
+                uncovered -= flight.markets
+        own = _Flight(markets=frozenset(uncovered))
+        if own.markets:
+            active.append(own)
+    return own, waits
+
+
+def _release_flight(event_id: str, regions: str, flight: _Flight) -> None:
+    with _FLIGHTS_LOCK:
+        active = _FLIGHTS.get((event_id, regions), [])
+        if flight in active:
+            active.remove(flight)
+        if not active:
+            _FLIGHTS.pop((event_id, regions), None)
+    flight.done.set()
+
+
+def _only_markets(data: dict | None, keys: set[str]) -> dict:
+    """`data` restricted to `keys`, so a waiter never picks up markets it
+    didn't ask for from a broader fetch it piggybacked on."""
+    if not data:
+        return {}
+    books = []
+    for book in data.get("bookmakers", []):
+        mkts = [m for m in book.get("markets", []) if m.get("key") in keys]
+        if mkts:
+            books.append({**book, "markets": mkts})
+    return {**data, "bookmakers": books}
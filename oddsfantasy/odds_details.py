@@ -8,36 +8,20 @@ dependency runs one way only, so services.py must not import this module.
 
 from __future__ import annotations
 
-import datetime as dt
 from statistics import NormalDist
 
-from . import odds_client, ratelimit
+from . import fetch_engine, ratelimit
 from .aggregator import aggregate_by_week
 from .config import STAT_MARKET_MAPPING_SLEEPER
-from .planner import plan_relevant_games_and_markets
+from .names import NameResolver
 from .predicted_stats import predict_stats_for_player
 from .range_model import PRIMARY_MARKET_WHITELIST
 from .services import (
     NO_GAMES_SCHEDULED_MESSAGE,
+    RequestContext,
     _fetch_odds,
     _implied_total,
-    _resolve_identity,
 )
-from .weekly_windows import resolve_week_windows
-
-
-def _norm_name(s: str) -> str:
-    try:
-        s = (s or "").lower()
-        import re
-
-        s = re.sub(r"[\.'`-]", " ", s)
-        s = re.sub(r"[^a-z0-9 ]", "", s)
-        s = re.sub(r"\s+", " ", s).strip()
-        toks = [t for t in s.split(" ") if t not in ("jr", "sr", "ii", "iii", "iv", "v")]
-        return " ".join(toks)
-    except Exception:
-        return s or ""
 
 
 def get_player_odds_details(
@@ -50,15 +34,15 @@ def get_player_odds_details(
     model: str = "const",
     league_id: str | None = None,
     roster_id: int | None = None,
+    ctx: RequestContext | None = None,
 ) -> dict:
     """Return per-book odds and market summaries used for a single player.
 
     Emphasizes markets by estimated impact on fantasy points (mean stat * scoring multiplier).
     """
     eff_mode = cache_mode
-    events = odds_client.get_nfl_events(regions=region, mode=eff_mode)
-    windows = resolve_week_windows(events)
-    if windows is None:
+    ctx = ctx or RequestContext(username, season, region, eff_mode, league_id, roster_id)
+    if ctx.windows() is None:
         return {
             "player": {"name": name},
             "markets": {},
@@ -67,19 +51,12 @@ def get_player_odds_details(
             "ratelimit_info": ratelimit.get_details(),
             "message": NO_GAMES_SCHEDULED_MESSAGE,
         }
-    (this_start, this_end), (next_start, next_end) = windows
     # Roster & planning (to get scoring rules and player mapping)
-    roster = _resolve_identity(username, season, league_id, roster_id)
+    roster = ctx.roster()
     scoring_rules = roster.get("scoring_rules", {}) if roster else {}
-    plan_all = plan_relevant_games_and_markets(
-        roster,
-        ((this_start, this_end), (next_start, next_end)),
-        regions=region,
-        cache_mode=eff_mode,
-    )
-    planned = plan_all.get(week, {})
+    planned = ctx.plan().get(week, {})
     # Fetch odds for planned games
-    odds_by_week = _fetch_odds({week: planned}, cache_mode=eff_mode, regions=region)
+    odds_by_week = _fetch_odds({week: planned}, cache_mode=eff_mode, regions=region, ctx=ctx)
     ev_odds = odds_by_week.get(week, {})
     # Aggregate
     per_player_odds, per_player_summaries = aggregate_by_week(ev_odds, planned)
@@ -89,19 +66,9 @@ def get_player_odds_details(
         for p in g.players:
             info_by_alias[p["alias"]] = p
     # Resolve name -> alias (exact or normalized)
-    target_alias = None
-    n_target = _norm_name(name)
-    for alias, pinfo in info_by_alias.items():
-        full = pinfo.get("full_name", alias)
-        if full == name:
-            target_alias = alias
-            break
-    if target_alias is None:
-        for alias, pinfo in info_by_alias.items():
-            full = pinfo.get("full_name", alias)
-            if _norm_name(full) == n_target:
-                target_alias = alias
-                break
+    target_alias = NameResolver(
+        {pinfo.get("full_name", alias): alias for alias, pinfo in info_by_alias.items()}
+    )(name)
     if target_alias is None:
         return {
             "player": {"name": name},
@@ -133,7 +100,11 @@ def get_player_odds_details(
     # Build per-market details
     # Also compute per-market stat quantiles and fantasy point contributions
     try:
-        from .range_model import compute_fantasy_range, compute_fantasy_range_model
+        from .range_model import (
+            compute_fantasy_range,
+            compute_fantasy_range_model,
+            fit_player_markets,
+        )
 
         if (model or "baseline").lower() == "baseline":
             _floor, _mid, _ceil, per_market_ranges = compute_fantasy_range(
@@ -143,8 +114,11 @@ def get_player_odds_details(
             _floor, _mid, _ceil, per_market_ranges = compute_fantasy_range_model(
                 by_book, market_summaries, scoring_rules, model=model
             )
+        # Memoized: the same fits the ranges above were read from
+        fitted = fit_player_markets(by_book, market_summaries, model)
     except Exception:
         per_market_ranges = {}
+        fitted = {}
 
     def _fp_triplet_for_market(mkey: str) -> tuple[float, float, float]:
         try:
@@ -289,6 +263,21 @@ def get_player_odds_details(
                 "fp_mid": fp_mid,
                 "fp_ceil": fp_ceil,
             }
+            dist = fitted.get(mkey)
+            if dist is not None:
+                pm_debug[mkey].update(
+                    {
+                        "distribution": dist.describe(),
+                        "curve": dist.curve(),
+                        "percentiles": dict(
+                            zip(
+                                ("p5", "p25", "p75", "p95"),
+                                dist.percentiles((0.05, 0.25, 0.75, 0.95)),
+                                strict=True,
+                            )
+                        ),
+                    }
+                )
 
         # Yardage bonuses at each level
         def _bonus_pass(y: float) -> float:
@@ -423,14 +412,14 @@ def get_defense_odds_details(
     defense: str = "",
     cache_mode: str = "auto",
     region: str = "us",
+    ctx: RequestContext | None = None,
 ) -> dict:
     """Return per-book totals/spreads and implied totals for opponent against this defense.
 
     Sorted by implied total ascending per game, includes medians.
     """
-    eff_mode = cache_mode
-    events = odds_client.get_nfl_events(regions=region, mode=eff_mode)
-    windows = resolve_week_windows(events)
+    ctx = ctx or RequestContext(username, season, region, cache_mode)
+    windows = ctx.windows()
     if windows is None:
         return {
             "defense": defense,
@@ -444,21 +433,17 @@ def get_defense_odds_details(
     (this_start, this_end), (next_start, next_end) = windows
     # Window and events
     start, end = (this_start, this_end) if week == "this" else (next_start, next_end)
-    window_events = [
-        e
-        for e in events
-        if start <= dt.datetime.strptime(e["commence_time"], "%Y-%m-%dT%H:%M:%SZ") <= end
-    ]
     # Find games with this defense
-    games = [e for e in window_events if defense in (e.get("home_team"), e.get("away_team"))]
+    games = ctx.index().for_team(defense, (start, end))
     details = []
     raw_map: dict[str, object] = {}
+    odds_by_game = ctx.event_odds(
+        [fetch_engine.OddsJob(e["id"], ("spreads", "totals")) for e in games]
+    )
     for e in games:
         gid = e["id"]
         opp = e["away_team"] if e["home_team"] == defense else e["home_team"]
-        ev_odds = odds_client.get_event_player_odds(
-            gid, markets="spreads,totals", regions=region, mode=eff_mode
-        )
+        ev_odds = odds_by_game.get(gid)
         # Normalize
         ev_obj = (
             ev_odds[0]
@@ -0,0 +1,251 @@
+"""Columnar odds for a week's slate.
+
+aggregate_by_week used to hand back odds as nested dicts -- alias -> book
+-> market -> {"over": {...}, "under": {...}, "alts": {...}} -- one small
+dict per priced side, and every stage below re-walked the nesting.
+OddsTable keeps each priced outcome as one row across parallel columns
+(the PlayerIndex approach): interned player/book/market ids in compact
+arrays, point and price as doubles, plus the side, the alternate-line flag
+and the event the row came from. A draft-board week is tens of thousands of
+outcomes, so dropping the per-record dicts is a several-fold saving, and
+with NumPy the columns are zero-copy arrays (see columns()), so grouping
+by market or book is a vectorized operation rather than a walk.
+
+Existing consumers still see the nested shape through adapters:
+by_player() is a read-only Mapping alias -> PlayerOdds, and PlayerOdds is
+a Mapping book -> {market: sides} expanded from the player's rows on
+demand (main_lines() skips the alternate ladders, for consumers that only
+read main lines). Only the most recently expanded player is kept, so a
+pipeline that works through players one at a time never holds the whole
+week as dicts.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Iterator, Mapping
+
+try:
+    import numpy as np
+except ImportError:  # optional; columns() needs it
+    np = None
+
+SIDE_OVER = 0
+SIDE_UNDER = 1
+_SIDE_NAMES = ("over", "under")
+
+# (attribute, array typecode) per row column
+_COLUMNS = (
+    ("player", "I"),
+    ("book", "H"),
+    ("market", "H"),
+    ("side", "b"),
+    ("is_alt", "b"),
+    ("event", "I"),
+    ("point", "d"),
+    ("price", "d"),
+)
+
+
+def _num(value: object) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class OddsTable:
+    """One row per priced outcome; string columns are interned ids into
+    `players`, `books` and `markets`."""
+
+    def __init__(self):
+        self.players: list[str] = []
+        self.books: list[str] = []
+        self.markets: list[str] = []
+        self._ids: tuple[dict[str, int], dict[str, int], dict[str, int]] = ({}, {}, {})
+        for name, typecode in _COLUMNS:
+            setattr(self, name, array(typecode))
+        # Row numbers per player: all of them, and the main-line rows plus
+        # the first row of each alternate ladder (enough for main_lines())
+        self._player_rows: list[array] = []
+        self._player_main_rows: list[array] = []
+        self._events = 0
+        self._expanded: tuple[int, bool, dict] | None = None
+
+    @staticmethod
+    def _intern(values: list[str], ids: dict[str, int], value: str) -> int:
+        i = ids.get(value)
+        if i is None:
+            i = ids[value] = len(values)
+            values.append(value)
+        return i
+
+    def new_event(self) -> int:
+        """Ordinal for the next event's rows; an event's alternate ladder
+        replaces any earlier one for the same player, book and market."""
+        self._events += 1
+        return self._events
+
+    def extend(
+        self,
+        player: str,
+        book: str,
+        market: str,
+        is_alt: bool,
+        event: int,
+        outcomes: list[tuple[int, object, object]],
+    ) -> None:
+        """Append one book's (side, point, price) outcomes for one player and
+        market; an alternate ladder is appended in one call."""
+        n = len(outcomes)
+        if not n:
+            return
+        pid = self._intern(self.players, self._ids[0], player)
+        if pid == len(self._player_rows):
+            self._player_rows.append(array("I"))
+            self._player_main_rows.append(array("I"))
+        start = len(self.side)
+        self._player_rows[pid].extend(range(start, start + n))
+        # A ladder's first row stands in for its market in main_lines()
+        self._player_main_rows[pid].extend(range(start, start + (1 if is_alt else n)))
+        self.player.extend((pid,) * n)
+        self.book.extend((self._intern(self.books, self._ids[1], book),) * n)
+        self.market.extend((self._intern(self.markets, self._ids[2], market),) * n)
+        self.is_alt.extend((is_alt,) * n)
+        self.event.extend((event,) * n)
+        for side, point, price in outcomes:
+            self.side.append(side)
+            self.point.append(_num(point))
+            self.price.append(_num(price))
+        self._expanded = None
+
+    def __len__(self) -> int:
+        return len(self.side)
+
+    def nbytes(self) -> int:
+        """Bytes held by the row columns and the per-player row index."""
+        cols = sum(getattr(self, name).itemsize * len(self) for name, _ in _COLUMNS)
+        index = self._player_rows + self._player_main_rows
+        return cols + sum(rows.itemsize * len(rows) for rows in index)
+
+    def columns(self) -> dict:
+        """Row columns as NumPy arrays sharing this table's memory; the
+        interned id columns index `players`, `books` and `markets`."""
+        if np is None:
+            raise RuntimeError("OddsTable.columns() requires numpy")
+        return {name: np.frombuffer(getattr(self, name), dtype=tc) for name, tc in _COLUMNS}
+
+    def player_odds(self, player: str) -> PlayerOdds | None:
+        pid = self._ids[0].get(player)
+        return None if pid is None else PlayerOdds(self, pid)
+
+    def by_player(self) -> PlayerOddsMap:
+        return PlayerOddsMap(self)
+
+    def _expand(self, pid: int, ladders: bool = True) -> dict:
+        """The nested {book: {market: sides}} dict for one player; without
+        `ladders`, alternate markets are left as empty sides (no "alts")."""
+        cached = self._expanded
+        if cached is not None and cached[0] == pid and (cached[1] or not ladders):
+            return cached[2]
+        books, markets = self.books, self.markets
+        book_col, market_col, side_col = self.book, self.market, self.side
+        alt_col, event_col, point_col, price_col = self.is_alt, self.event, self.point, self.price
+        out: dict[str, dict] = {}
+        entries: dict[tuple[int, int], dict] = {}
+        ladder_event: dict[tuple[int, int], int] = {}
+        rows = self._player_rows if ladders else self._player_main_rows
+        for r in rows[pid]:
+            bm = (book_col[r], market_col[r])
+            entry = entries.get(bm)
+            if entry is None:
+                entry = entries[bm] = {"over": None, "under": None}
+                out.setdefault(books[bm[0]], {})[markets[bm[1]]] = entry
+            is_alt = alt_col[r]
+            if is_alt and not ladders:
+                continue
+            price, point = price_col[r], point_col[r]
+            rec = {
+                "odds": None if price != price else price,  # NaN -> None
+                "point": None if point != point else point,
+            }
+            if is_alt:
+                if ladder_event.get(bm) != event_col[r]:
+                    ladder_event[bm] = event_col[r]
+                    entry["alts"] = {"over": [], "under": []}
+                entry["alts"][_SIDE_NAMES[side_col[r]]].append(rec)
+            else:
+                entry[_SIDE_NAMES[side_col[r]]] = rec
+        self._expanded = (pid, ladders, out)
+        return out
+
+
+class PlayerOdds(Mapping):
+    """One player's odds as book -> {market: {"over", "under"[, "alts"]}},
+    the shape predict_stats_for_player and the range models read.
+
+    Treat the expanded dicts as read-only; they're shared until the table
+    expands another player.
+    """
+
+    __slots__ = ("_pid", "_table")
+
+    def __init__(self, table: OddsTable, pid: int):
+        self._table = table
+        self._pid = pid
+
+    def _books(self) -> dict[str, None]:
+        t = self._table
+        return {t.books[t.book[r]]: None for r in t._player_rows[self._pid]}
+
+    def __getitem__(self, book: str) -> dict:
+        return self._table._expand(self._pid)[book]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._books())
+
+    def __len__(self) -> int:
+        return len(self._books())
+
+    def items(self):
+        return self._table._expand(self._pid).items()
+
+    def values(self):
+        return self._table._expand(self._pid).values()
+
+    def to_dict(self) -> dict:
+        return self._table._expand(self._pid)
+
+    def main_lines(self) -> dict:
+        """to_dict() without the alternate ladders, which is all
+        predict_stats_for_player reads; much cheaper to expand."""
+        return self._table._expand(self._pid, ladders=False)
+
+
+class PlayerOddsMap(Mapping):
+    """alias -> PlayerOdds over an OddsTable, in first-seen order."""
+
+    __slots__ = ("_table",)
+
+    def __init__(self, table: OddsTable):
+        self._table = table
+
+    @property
+    def table(self) -> OddsTable:
+        return self._table
+
+    def __getitem__(self, player: str) -> PlayerOdds:
+        odds = self._table.player_odds(player)
+        if odds is None:
+            raise KeyError(player)
+        return odds
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.players)
+
+    def __len__(self) -> int:
+        return len(self._table.players)
+
+    def __contains__(self, player: object) -> bool:
+        return player in self._table._ids[0]
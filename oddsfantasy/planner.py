@@ -5,11 +5,12 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 
 from . import odds_client
-from .config import POSITION_STAT_CONFIG, SLEEPER_ODDS_API_PLAYER_NAME_MAPPING, STAT_MARKET_MAPPING
-from .weekly_windows import in_window
+from .config import POSITION_STAT_CONFIG, STAT_MARKET_MAPPING
+from .event_index import EventIndex, as_index
+from .names import odds_alias
 
 
-@dataclass
+@dataclass(slots=True)
 class PlannedGame:
     game_id: str
     home_team: str
@@ -19,10 +20,6 @@ class PlannedGame:
     markets: list[str]
 
 
-def _player_alias(full_name: str) -> str:
-    return SLEEPER_ODDS_API_PLAYER_NAME_MAPPING.get(full_name, full_name)
-
-
 def _normalize_market(stat_key: str) -> str | None:
     # Map via explicit mapping when available
     if stat_key in STAT_MARKET_MAPPING:
@@ -70,40 +67,32 @@ def plan_relevant_games_and_markets(
     regions: str = "us",
     use_saved_data: bool | None = None,
     cache_mode: str = "auto",
+    events: list[dict] | EventIndex | None = None,
 ) -> dict[str, dict[str, PlannedGame]]:
     """Plan minimal event-odds calls by week window.
 
     Returns a dict with keys 'this' and 'next', each mapping game_id -> PlannedGame.
+    Pass `events` (list or EventIndex) when the caller already has them.
     """
-    (this_start, this_end), (next_start, next_end) = week_windows
+    this_window, next_window = week_windows
     # Backward-compat: map use_saved_data to cache_mode when provided
     if use_saved_data is not None:
         cache_mode = "cache" if use_saved_data else "fresh"
-    events = odds_client.get_nfl_events(regions=regions, mode=cache_mode)
-
-    # Index events by window
-    this_events: dict[str, dict] = {}
-    next_events: dict[str, dict] = {}
-    for e in events:
-        ts = e.get("commence_time")
-        if in_window(ts, (this_start, this_end)):
-            this_events[e["id"]] = e
-        elif in_window(ts, (next_start, next_end)):
-            next_events[e["id"]] = e
-
-    def plan_for(events_by_id: dict[str, dict]) -> dict[str, PlannedGame]:
+    if events is None:
+        events = odds_client.get_nfl_events(regions=regions, mode=cache_mode)
+    index = as_index(events)
+
+    def plan_for(window: tuple[_dt.datetime, _dt.datetime]) -> dict[str, PlannedGame]:
         plan: dict[str, PlannedGame] = {}
         # Group roster players by events they participate in
-        for p in roster.get("players", {}).values():
+        for pid, p in roster.get("players", {}).items():
             team = p.get("editorial_team_full_name")
             pos = p.get("primary_position")
             full_name = p.get("name", {}).get("full")
-            alias = _player_alias(full_name)
+            alias = odds_alias(full_name)
             if not team or not pos or not full_name:
                 continue
-            for e in events_by_id.values():
-                if team not in (e.get("home_team"), e.get("away_team")):
-                    continue
+            for e in index.for_team(team, window):
                 gid = e["id"]
                 if gid not in plan:
                     plan[gid] = PlannedGame(
@@ -116,6 +105,7 @@ def plan_relevant_games_and_markets(
                     )
                 plan[gid].players.append(
                     {
+                        "player_id": pid,
                         "full_name": full_name,
                         "alias": alias,
                         "primary_position": pos,
@@ -131,6 +121,6 @@ def plan_relevant_games_and_markets(
         return plan
 
     return {
-        "this": plan_for(this_events),
-        "next": plan_for(next_events),
+        "this": plan_for(this_window),
+        "next": plan_for(next_window),
     }
@@ -0,0 +1,129 @@
+"""Compact index over Sleeper's NFL player database.
+
+Sleeper's /players/nfl dump is ~10k players with dozens of fields each, and
+we only ever read five of them. PlayerIndex keeps just those five as
+parallel columns (one list per field, not one dict per player) and builds
+the lookups the app actually does up front -- by id, by team, by position
+and by name key (names.name_key) -- so roster enrichment, draft-board
+planning and odds-name resolution touch the players they need rather than
+scanning everyone.
+
+The index is persisted in the same columnar shape (see to_json/from_json),
+so a restart reloads it without re-parsing the full dump.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from .names import name_key, odds_alias
+
+# Bump when the persisted layout changes; older files are rebuilt.
+INDEX_FORMAT = 1
+
+
+class Player(NamedTuple):
+    player_id: str
+    full_name: str | None
+    position: str | None
+    team: str | None  # Sleeper team abbreviation; None for free agents
+    status: str | None
+
+
+class PlayerIndex:
+    _COLUMNS = ("ids", "full_names", "positions", "teams", "statuses")
+
+    def __init__(
+        self,
+        ids: list[str],
+        full_names: list[str | None],
+        positions: list[str | None],
+        teams: list[str | None],
+        statuses: list[str | None],
+    ):
+        self.ids = ids
+        self.full_names = full_names
+        self.positions = positions
+        self.teams = teams
+        self.statuses = statuses
+        self._row: dict[str, int] = {pid: i for i, pid in enumerate(ids)}
+        self._by_team: dict[str, list[int]] = {}
+        self._by_position: dict[str, list[int]] = {}
+        self._by_name: dict[str, list[int]] = {}
+        for i in range(len(ids)):
+            if teams[i]:
+                self._by_team.setdefault(teams[i], []).append(i)
+            if positions[i]:
+                self._by_position.setdefault(positions[i], []).append(i)
+            full = full_names[i] or ""
+            # Index the Odds API spelling too, where it's a different key
+            for key in {name_key(full), name_key(odds_alias(full))} - {""}:
+                self._by_name.setdefault(key, []).append(i)
+
+    @classmethod
+    def from_sleeper(cls, players: dict[str, dict]) -> PlayerIndex:
+        """Build from Sleeper's raw {player_id: {...}} dump."""
+        ids, names, positions, teams, statuses = [], [], [], [], []
+        for pid, pdata in (players or {}).items():
+            if not isinstance(pdata, dict):
+                continue
+            ids.append(str(pid))
+            names.append(pdata.get("full_name"))
+            positions.append(pdata.get("position"))
+            teams.append(pdata.get("team"))
+            statuses.append(pdata.get("status"))
+        return cls(ids, names, positions, teams, statuses)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "format": INDEX_FORMAT,
+            **{col: getattr(self, col) for col in self._COLUMNS},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> PlayerIndex | None:
+        """Inverse of to_json; None if `data` is from another index format."""
+        if not isinstance(data, dict) or data.get("format") != INDEX_FORMAT:
+            return None
+        return cls(*(data[col] for col in cls._COLUMNS))
+
+    def _player(self, i: int) -> Player:
+        return Player(
+            self.ids[i], self.full_names[i], self.positions[i], self.teams[i], self.statuses[i]
+        )
+
+    def get(self, player_id: str) -> Player | None:
+        i = self._row.get(str(player_id))
+        return None if i is None else self._player(i)
+
+    def by_team(self, team: str) -> list[Player]:
+        return [self._player(i) for i in self._by_team.get(team, ())]
+
+    def by_position(self, position: str) -> list[Player]:
+        return [self._player(i) for i in self._by_position.get(position, ())]
+
+    def by_name(self, name: str) -> list[Player]:
+        return [self._player(i) for i in self._by_name.get(name_key(name), ())]
+
+    def resolve_name(
+        self, name: str, teams: Iterable[str] = (), position: str | None = None
+    ) -> Player | None:
+        """The one player called `name`, or None if there's none or several.
+
+        Same-name players are told apart by team (any of `teams`, Sleeper
+        abbreviations), then by `position`.
+        """
+        rows = self._by_name.get(name_key(name), ())
+        if len(rows) > 1 and teams:
+            teams = set(teams)
+            rows = [i for i in rows if self.teams[i] in teams]
+        if len(rows) > 1 and position:
+            rows = [i for i in rows if self.positions[i] == position]
+        return self._player(rows[0]) if len(rows) == 1 else None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, player_id: object) -> bool:
+        return str(player_id) in self._row
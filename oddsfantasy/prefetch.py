@@ -0,0 +1,161 @@
+"""Background odds prefetch for registered leagues.
+
+Opt-in: `python -m oddsfantasy.api --prefetch` (leagues come from
+--prefetch-league and PREFETCH_LEAGUES, plus the PREFETCH_MAX_LEAGUES most
+recently used leagues the API has resolved since the scheduler started).
+Every tick the scheduler plans the games and markets each registered
+league's rosters need for this week and next (same planner the
+interactive endpoints use), then refetches the markets whose snapshot is
+older than that game's refresh interval. The interval tightens as kickoff
+approaches -- daily early in the week, every six hours inside three days,
+hourly inside the last day -- so interactive requests land on a warm cache, and
+quota is spent on a schedule instead of in bursts when a league opens
+the app.
+
+Each tick spends at most PREFETCH_QUOTA_BUDGET quota units (see
+fetch_engine); markets left over wait for the next tick.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from . import fetch_engine, odds_client, sleeper_api, store
+from .event_index import as_index, parse_commence
+from .planner import plan_relevant_games_and_markets
+from .weekly_windows import resolve_week_windows
+
+PREFETCH_TICK = int(os.getenv("PREFETCH_TICK", "900"))  # seconds between planning passes
+PREFETCH_QUOTA_BUDGET = int(os.getenv("PREFETCH_QUOTA_BUDGET", "200"))
+# Leagues picked up from API traffic; configured leagues don't count
+PREFETCH_MAX_LEAGUES = int(os.getenv("PREFETCH_MAX_LEAGUES", "50"))
+
+# (hours to kickoff, max snapshot age in seconds), tightest first
+REFRESH_SCHEDULE = (
+    (24, 3600),
+    (72, 6 * 3600),
+)
+DEFAULT_REFRESH = 24 * 3600
+
+_LOCK = threading.Lock()
+_LEAGUES: set[str] = set()  # configured; always prefetched
+_SEEN: OrderedDict[str, None] = OrderedDict()  # from traffic, least recently used first
+_RUNNING = False
+
+
+def register_league(league_id: str) -> None:
+    """Prefetch `league_id` for as long as the process runs."""
+    if league_id:
+        with _LOCK:
+            _LEAGUES.add(str(league_id))
+
+
+def note_league(league_id: str) -> None:
+    """Record that the API just resolved `league_id` (a real Sleeper
+    league). Only while the scheduler runs; beyond PREFETCH_MAX_LEAGUES the
+    least recently used drop out, so quota follows the leagues in use."""
+    if not league_id or not _RUNNING:
+        return
+    league_id = str(league_id)
+    with _LOCK:
+        if league_id in _LEAGUES:
+            return
+        _SEEN[league_id] = None
+        _SEEN.move_to_end(league_id)
+        while len(_SEEN) > PREFETCH_MAX_LEAGUES:
+            _SEEN.popitem(last=False)
+
+
+def registered_leagues() -> list[str]:
+    with _LOCK:
+        return sorted(_LEAGUES.union(_SEEN))
+
+
+def refresh_interval(kickoff: dt.datetime, now_utc: dt.datetime) -> int:
+    """Max snapshot age (seconds) to tolerate for a game at `kickoff`."""
+    hours = (kickoff - now_utc).total_seconds() / 3600.0
+    for within_hours, max_age in REFRESH_SCHEDULE:
+        if hours <= within_hours:
+            return max_age
+    return DEFAULT_REFRESH
+
+
+def _plan_league(league_id: str, windows, regions: str) -> dict[str, tuple[str, set[str]]]:
+    """game_id -> (commence_time, markets) for every roster in the league."""
+    games: dict[str, tuple[str, set[str]]] = {}
+    for roster in sleeper_api.get_league_rosters(league_id) or []:
+        players = sleeper_api.get_enhanced_info_for_roster(roster)
+        if not players:
+            continue
+        plan = plan_relevant_games_and_markets(
+            {"players": players}, windows, regions=regions, cache_mode="auto"
+        )
+        for week_plan in plan.values():
+            for gid, g in week_plan.items():
+                games.setdefault(gid, (g.commence_time, set()))[1].update(g.markets)
+    return games
+
+
+def run_once(
+    regions: str = "us", budget: int | None = None, now_utc: dt.datetime | None = None
+) -> list[fetch_engine.OddsJob]:
+    """One planning pass over every registered league; returns the jobs it
+    found due (before the quota budget is applied)."""
+    now_utc = now_utc or dt.datetime.utcnow()
+    leagues = registered_leagues()
+    if not leagues:
+        return []
+    events = as_index(odds_client.get_nfl_events(regions=regions, mode="auto"))
+    windows = resolve_week_windows(events, now_utc=now_utc)
+    if windows is None:
+        print("[prefetch] no scheduled games; nothing to prefetch")
+        return []
+
+    games: dict[str, tuple[str, set[str]]] = {}
+    for league_id in leagues:
+        try:
+            league_games = _plan_league(league_id, windows, regions)
+        except Exception as e:
+            print(f"[prefetch] league={league_id} plan failed: {e}")
+            continue
+        for gid, (commence, markets) in league_games.items():
+            games.setdefault(gid, (commence, set()))[1].update(markets)
+
+    now_ts = int(now_utc.replace(tzinfo=dt.UTC).timestamp())
+    jobs = []
+    for gid, (commence, markets) in games.items():
+        kickoff = events.kickoff(gid) or parse_commence(commence)
+        if kickoff is None or kickoff <= now_utc:
+            continue  # props come down at kickoff; nothing left to warm
+        cutoff = now_ts - refresh_interval(kickoff, now_utc)
+        fetched = store.market_fetch_times(gid, regions, sorted(markets))
+        due = tuple(sorted(m for m in markets if fetched.get(m, 0) <= cutoff))
+        if due:
+            jobs.append(fetch_engine.OddsJob(gid, due))
+    print(f"[prefetch] leagues={len(leagues)} games={len(games)} due={len(jobs)}")
+    if jobs:
+        budget = PREFETCH_QUOTA_BUDGET if budget is None else budget
+        fetch_engine.fetch_event_odds(jobs, regions=regions, mode="fresh", budget=budget)
+    return jobs
+
+
+def start(regions: str = "us") -> threading.Thread:
+    """Run run_once() every PREFETCH_TICK seconds on a daemon thread."""
+    global _RUNNING
+    _RUNNING = True
+
+    def loop():
+        while True:
+            try:
+                run_once(regions=regions)
+            except Exception as e:
+                print(f"[prefetch] pass failed: {e}")
+            time.sleep(PREFETCH_TICK)
+
+    thread = threading.Thread(target=loop, name="odds-prefetch", daemon=True)
+    thread.start()
+    return thread
@@ -2,28 +2,15 @@ from __future__ import annotations
 
 import contextlib
 import math
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from functools import lru_cache
 from statistics import median
 
+from .devig import devig
 
-def _devig_p_over_decimal(over_odds: float | None, under_odds: float | None) -> float | None:
-    try:
-        o = float(over_odds) if over_odds is not None else None
-        u = float(under_odds) if under_odds is not None else None
-        if (o is not None) and (u is not None) and (o > 0) and (u > 0):
-            o_raw = 1.0 / o
-            u_raw = 1.0 / u
-            tot = o_raw + u_raw
-            if tot > 0:
-                return o_raw / tot
-        elif (o is not None) and (o > 0):
-            return min(max(1.0 / o, 0.0), 1.0)
-        elif (u is not None) and (u > 0):
-            # Only under available; approximate S(x)=P(X>t) ~ 1 - implied_under
-            pu = 1.0 / u
-            return min(max(1.0 - pu, 0.0), 1.0)
-    except Exception:
-        pass
-    return None
+# Floor / mid / ceiling
+STANDARD_QUANTILES = (0.15, 0.50, 0.85)
 
 
 def _pav_isotonic(y: list[float]) -> list[float]:
@@ -114,74 +101,106 @@ def _pchip_slopes(xs: list[float], ys: list[float]) -> list[float]:
     return m
 
 
-def _pchip_inverse_cdf(cdf_x: list[float], cdf_y: list[float], q: float) -> float:
-    # Invert monotone CDF using PCHIP and Newton in local segment
-    n = len(cdf_x)
-    if n == 0:
-        return 0.0
-    if n == 1:
-        return cdf_x[0]
-    # Clamp to bounds
-    if q <= cdf_y[0]:
-        return cdf_x[0]
-    if q >= cdf_y[-1]:
-        return cdf_x[-1]
-    # find interval i with y[i] <= q <= y[i+1]
-    i = 0
-    for k in range(n - 1):
-        if cdf_y[k] <= q <= cdf_y[k + 1]:
-            i = k
-            break
-    x0, x1 = cdf_x[i], cdf_x[i + 1]
-    y0, y1 = cdf_y[i], cdf_y[i + 1]
-    h = (x1 - x0) if (x1 - x0) != 0 else 1.0
-    m = _pchip_slopes(cdf_x, cdf_y)
-    m0, m1 = m[i], m[i + 1]
-    # Solve y(t) = q, t in [0,1] via Newton starting at linear guess
-    if y1 == y0:
-        return x1
-    t = (q - y0) / (y1 - y0)
-    t = min(max(t, 0.0), 1.0)
-    for _ in range(8):  # few iterations suffice
+class PchipCdf:
+    """Monotone cubic (PCHIP) CDF through (x, F(x)) anchors, fitted once.
+
+    Slopes are computed at construction, so one curve serves any number of
+    quantile or CDF evaluations; each finds its segment by bisect.
+    """
+
+    def __init__(self, xs: list[float], ys: list[float]):
+        self.xs = list(xs)
+        self.ys = list(ys)
+        self.slopes = _pchip_slopes(self.xs, self.ys)
+
+    def _segment(self, i: int) -> tuple[float, float, float, float, float, float]:
+        x0, x1 = self.xs[i], self.xs[i + 1]
+        h = (x1 - x0) if (x1 - x0) != 0 else 1.0
+        return x0, h, self.ys[i], self.ys[i + 1], self.slopes[i], self.slopes[i + 1]
+
+    def cdf(self, x: float) -> float:
+        """Interpolated F(x), flat beyond the outermost anchors."""
+        xs, ys = self.xs, self.ys
+        if not xs:
+            return 0.0
+        if x <= xs[0]:
+            return ys[0]
+        if x >= xs[-1]:
+            return ys[-1]
+        x0, h, y0, y1, m0, m1 = self._segment(bisect_right(xs, x) - 1)
+        t = (x - x0) / h
         t2 = t * t
         t3 = t2 * t
-        h00 = 2 * t3 - 3 * t2 + 1
-        h10 = t3 - 2 * t2 + t
-        h01 = -2 * t3 + 3 * t2
-        h11 = t3 - t2
-        y_t = h00 * y0 + h10 * h * m0 + h01 * y1 + h11 * h * m1
-        dy_dt = (
-            6 * (t2 - t) * y0
-            + (3 * t2 - 4 * t + 1) * h * m0
-            + 6 * (-t2 + t) * y1
-            + (3 * t2 - 2 * t) * h * m1
+        return (
+            (2 * t3 - 3 * t2 + 1) * y0
+            + (t3 - 2 * t2 + t) * h * m0
+            + (-2 * t3 + 3 * t2) * y1
+            + (t3 - t2) * h * m1
         )
-        if dy_dt == 0:
-            break
-        t -= (y_t - q) / dy_dt
-        if t <= 0 or t >= 1:
-            # fall back to bisection-ish clamp
-            t = min(max(t, 0.0), 1.0)
-    return x0 + t * h
+
+    def inverse(self, q: float) -> float:
+        """x with F(x) = q, clamped to the anchor range."""
+        xs, ys = self.xs, self.ys
+        n = len(xs)
+        if n == 0:
+            return 0.0
+        if n == 1:
+            return xs[0]
+        if q <= ys[0]:
+            return xs[0]
+        if q >= ys[-1]:
+            return xs[-1]
+        # first segment with ys[i] < q <= ys[i + 1]
+        x0, h, y0, y1, m0, m1 = self._segment(bisect_left(ys, q) - 1)
+        # Solve y(t) = q, t in [0,1] via Newton starting at linear guess
+        t = (q - y0) / (y1 - y0)
+        t = min(max(t, 0.0), 1.0)
+        for _ in range(8):  # few iterations suffice
+            t2 = t * t
+            t3 = t2 * t
+            h00 = 2 * t3 - 3 * t2 + 1
+            h10 = t3 - 2 * t2 + t
+            h01 = -2 * t3 + 3 * t2
+            h11 = t3 - t2
+            y_t = h00 * y0 + h10 * h * m0 + h01 * y1 + h11 * h * m1
+            dy_dt = (
+                6 * (t2 - t) * y0
+                + (3 * t2 - 4 * t + 1) * h * m0
+                + 6 * (-t2 + t) * y1
+                + (3 * t2 - 2 * t) * h * m1
+            )
+            if dy_dt == 0:
+                break
+            t -= (y_t - q) / dy_dt
+            if t <= 0 or t >= 1:
+                # fall back to bisection-ish clamp
+                t = min(max(t, 0.0), 1.0)
+        return x0 + t * h
+
+    def quantiles(self, qs: Iterable[float]) -> list[float]:
+        return [self.inverse(q) for q in qs]
 
 
 def _collect_threshold_anchors(
-    per_bookmaker_odds: dict, market_key: str
+    per_bookmaker_odds: dict, market_key: str, devig_method: str | None = None
 ) -> tuple[list[float], list[float]]:
     # Returns (thresholds sorted ascending, median p_over at thresholds)
     alt_key = market_key + "_alternate"
-    samples: list[tuple[float, float]] = []
+    # (point, over price, under price) per line; de-vigged together below
+    lines: list[tuple[float, object, object]] = []
+
+    def _add_line(sides: dict) -> None:
+        over, under = sides.get("over") or {}, sides.get("under") or {}
+        pt = over.get("point")
+        if pt is None:
+            pt = under.get("point")
+        with contextlib.suppress(TypeError, ValueError):
+            lines.append((float(pt), over.get("odds"), under.get("odds")))
+
     for mkts in (per_bookmaker_odds or {}).values():
         base = mkts.get(market_key) or {}
         if base:
-            pt = (base.get("over") or {}).get("point")
-            if pt is None:
-                pt = (base.get("under") or {}).get("point")
-            p_over = _devig_p_over_decimal(
-                (base.get("over") or {}).get("odds"), (base.get("under") or {}).get("odds")
-            )
-            if (pt is not None) and (p_over is not None):
-                samples.append((float(pt), float(p_over)))
+            _add_line(base)
         alt = mkts.get(alt_key) or {}
         alts = alt.get("alts") or {}
         ov_list = alts.get("over") or []
@@ -200,24 +219,20 @@ def _collect_threshold_anchors(
                     ood = float(it.get("odds"))
                 except Exception:
                     continue
-                uod = un_by_pt.get(pt)
-                p_over = _devig_p_over_decimal(ood, uod)
-                if p_over is not None:
-                    samples.append((pt, p_over))
-        else:
+                lines.append((pt, ood, un_by_pt.get(pt)))
+        elif alt:
             # Fallback: if aggregator didn't preserve alts as lists, also consider the alt market base sides
-            alt_base = alt if alt else {}
-            if alt_base:
-                pt = (alt_base.get("over") or {}).get("point")
-                if pt is None:
-                    pt = (alt_base.get("under") or {}).get("point")
-                p_over = _devig_p_over_decimal(
-                    (alt_base.get("over") or {}).get("odds"),
-                    (alt_base.get("under") or {}).get("odds"),
-                )
-                if (pt is not None) and (p_over is not None):
-                    with contextlib.suppress(Exception):
-                        samples.append((float(pt), float(p_over)))
+            _add_line(alt)
+
+    p_over, p_under = devig([o for _, o, _ in lines], [u for _, _, u in lines], devig_method)
+    samples: list[tuple[float, float]] = []
+    for (pt, _, _), po, pu in zip(lines, p_over, p_under, strict=True):
+        if po != po:
+            if pu != pu:
+                continue  # neither side priced
+            # Only under available; approximate S(x)=P(X>t) ~ 1 - implied_under
+            po = 1.0 - pu
+        samples.append((pt, min(max(po, 0.0), 1.0)))
 
     if len(samples) < 1:
         return [], []
@@ -232,32 +247,6 @@ def _collect_threshold_anchors(
     return xs, F_iso
 
 
-def model_const_quantiles(
-    per_bookmaker_odds: dict, market_key: str, fallback: tuple[float, float, float]
-) -> tuple[float, float, float] | None:
-    # Constantini/Piersanti: anchors → CDF via linear interpolation (after isotonic), then quantiles
-    xs, F = _collect_threshold_anchors(per_bookmaker_odds, market_key)
-    if len(xs) < 3:
-        return None
-    q15 = _inverse_cdf(xs, F, 0.15)
-    q50 = _inverse_cdf(xs, F, 0.50)
-    q85 = _inverse_cdf(xs, F, 0.85)
-    return float(q15), float(q50), float(q85)
-
-
-def model_puelz_quantiles(
-    per_bookmaker_odds: dict, market_key: str, fallback: tuple[float, float, float]
-) -> tuple[float, float, float] | None:
-    # Puelz/Snowberg: survival anchors S(x)=p_over, F=1-S, PCHIP monotone interpolation
-    xs, F = _collect_threshold_anchors(per_bookmaker_odds, market_key)
-    if len(xs) < 3:
-        return None
-    q15 = _pchip_inverse_cdf(xs, F, 0.15)
-    q50 = _pchip_inverse_cdf(xs, F, 0.50)
-    q85 = _pchip_inverse_cdf(xs, F, 0.85)
-    return float(q15), float(q50), float(q85)
-
-
 def _is_discrete_market(market_key: str) -> bool:
     k = (market_key or "").lower()
     if k.endswith("_interceptions"):
@@ -296,11 +285,11 @@ def _lognormal_quantile(mu: float, sigma: float, q: float) -> float:
     return math.exp(mu + sigma * z)
 
 
-def poisson_quantile(lam: float, q: float) -> float:
-    """Smallest integer k such that P(X <= k) >= q for X ~ Poisson(lam)."""
-    if lam is None or lam <= 0:
-        return 0.0
-    target = min(max(q, 1e-6), 1 - 1e-9)
+# Quantile tables cover lambdas up to this; larger ones walk the PMF exactly.
+POISSON_TABLE_MAX_LAMBDA = 40.0
+
+
+def _poisson_quantile_walk(lam: float, target: float) -> float:
     k = 0
     term = math.exp(-lam)
     c = term
@@ -311,107 +300,142 @@ def poisson_quantile(lam: float, q: float) -> float:
     return float(k)
 
 
+@lru_cache(maxsize=64)
+def poisson_quantile_breaks(target: float) -> tuple[float, ...]:
+    """Lambdas at which the Poisson `target`-quantile steps up.
+
+    Entry k is the lambda solving P(X <= k) = target; the quantile at any
+    lambda is the number of entries below it. P(X <= k) falls strictly in
+    lambda with derivative -P(X = k), so each entry is a bracketed root. The
+    table runs until an entry passes POISSON_TABLE_MAX_LAMBDA.
+    """
+    breaks: list[float] = []
+    top = 2.0 * POISSON_TABLE_MAX_LAMBDA + 10.0
+    k = 0
+    while not breaks or breaks[-1] < POISSON_TABLE_MAX_LAMBDA:
+        if _poisson_terms(top, k)[0] >= target:
+            break  # root lies past `top`; lookups beyond the table walk instead
+
+        def h(lam: float, k: int = k) -> tuple[float, float]:
+            cdf, pmf, _ = _poisson_terms(lam, k)
+            return target - cdf, pmf
+
+        breaks.append(_solve_increasing(h, breaks[-1] if breaks else 1e-12, top))
+        k += 1
+    return tuple(breaks)
+
+
+def poisson_quantile(lam: float, q: float) -> float:
+    """Smallest integer k such that P(X <= k) >= q for X ~ Poisson(lam).
+
+    A bisect into poisson_quantile_breaks for the STANDARD_QUANTILES and
+    lambdas the table covers, so repeated calls (three per count market per
+    player) are lookups. Any other q walks the PMF: tables keyed on
+    arbitrary q (a sampler's uniforms) would only evict the standard ones.
+    """
+    if lam is None or lam <= 0:
+        return 0.0
+    target = min(max(q, 1e-6), 1 - 1e-9)
+    if lam > POISSON_TABLE_MAX_LAMBDA or q not in STANDARD_QUANTILES:
+        return _poisson_quantile_walk(lam, target)
+    return float(bisect_left(poisson_quantile_breaks(target), lam))
+
+
+def _poisson_terms(lam: float, k: int) -> tuple[float, float, float]:
+    """(P(X <= k), P(X = k), P(X = k - 1)) for X ~ Poisson(lam)."""
+    term = math.exp(-lam)
+    cdf, prev = term, 0.0
+    for j in range(1, k + 1):
+        prev = term
+        term *= lam / j
+        cdf += term
+    return cdf, term, prev
+
+
+def _solve_increasing(h, a: float, b: float) -> float:
+    """Root of h on [a, b], given h(a) < 0 < h(b); h(x) returns (h, h').
+
+    Newton, falling back to bisection whenever a step would leave the
+    shrinking bracket.
+    """
+    x = 0.5 * (a + b)
+    for _ in range(60):
+        v, d = h(x)
+        if v == 0.0:
+            return x
+        if v < 0.0:
+            a = x
+        else:
+            b = x
+        nx = x - v / d if d > 0.0 else a - 1.0
+        if not a < nx < b:
+            nx = 0.5 * (a + b)
+        if abs(nx - x) <= 1e-12 * max(1.0, x):
+            return nx
+        x = nx
+    return x
+
+
+_SCAN_STEPS = 8
+
+
+@lru_cache(maxsize=4096)
+def _fit_lambda(points: tuple[tuple[int, float], ...]) -> float:
+    # The fit is confined to [lo, up]: the range the original grid search
+    # (a 61-point scan of [lo, hi], then a refine around the winner) covered.
+    # A k=0 anchor is evaluated at k=1, as that search always did.
+    max_k = max(k for k, _ in points)
+    lo = max(0.1, 0.3 * max_k)
+    hi = max(1.0, 2.5 * max_k + 1)
+    up = 1.5 * hi
+    pts = [(max(1, k), fk) for k, fk in points]
+
+    if len(pts) == 1:
+        # F(k; lam) = Q(k + 1, lam), the regularized upper incomplete gamma,
+        # falls strictly in lam with dF/dlam = -P(X = k): a bracketed root.
+        k, fk = pts[0]
+        if _poisson_terms(lo, k)[0] <= fk:
+            return lo
+        if _poisson_terms(up, k)[0] >= fk:
+            return up
+
+        def h(lam: float) -> tuple[float, float]:
+            cdf, pmf, _ = _poisson_terms(lam, k)
+            return fk - cdf, pmf
+
+        return _solve_increasing(h, lo, up)
+
+    # Several anchors: least squares. Scan for the best region, then solve
+    # for the stationary point of the error inside it.
+    def sq_err(lam: float) -> float:
+        return sum((_poisson_terms(lam, k)[0] - fk) ** 2 for k, fk in pts)
+
+    def half_grad(lam: float) -> tuple[float, float]:
+        # d/dlam of half the squared error, and its derivative
+        grad = curv = 0.0
+        for k, fk in pts:
+            cdf, pmf, pmf_prev = _poisson_terms(lam, k)
+            grad -= (cdf - fk) * pmf
+            curv += pmf * pmf - (cdf - fk) * (pmf_prev - pmf)
+        return grad, curv
+
+    grid = [lo + (hi - lo) * i / _SCAN_STEPS for i in range(_SCAN_STEPS + 1)]
+    best = min(range(len(grid)), key=lambda i: sq_err(grid[i]))
+    a = grid[best - 1] if best > 0 else lo
+    b = grid[best + 1] if best < _SCAN_STEPS else up
+    if half_grad(a)[0] >= 0.0:
+        return a
+    if half_grad(b)[0] <= 0.0:
+        return b
+    return _solve_increasing(half_grad, a, b)
+
+
 def _poisson_fit_lambda(points: list[tuple[int, float]]) -> float | None:
-    # Fit lambda to minimize squared CDF error at given (k, F(k)) anchor points
+    """Lambda minimizing squared CDF error at (k, F(k)) anchor points.
+
+    Memoized on the anchors: the same few lines recur across players and
+    across the floor/ceiling tails.
+    """
     if not points:
         return None
-    # crude search over a reasonable range derived from anchors
-    k_vals = [k for (k, _) in points]
-    max_k = max(k_vals)
-    # search lambda around meanish region
-    lo = max(0.1, 0.3 * max_k)
-    hi = max(1.0, 2.5 * max_k + 1)
-    best_l = None
-    best_err = 1e9
-    # coarse grid then refine (both passes use the same step count; the refine
-    # pass narrows the *range* around the coarse winner, not the resolution)
-    steps = 60
-    for _phase in range(2):
-        start = lo if best_l is None else max(lo, best_l * 0.5)
-        end = hi if best_l is None else max(start + 1e-6, best_l * 1.5)
-        for i in range(steps + 1):
-            lam = start + (end - start) * i / steps
-            # compute rmse
-            err = 0.0
-            for k, Fk in points:
-                # CDF at k for Poisson
-                c = 0.0
-                # sum_{i<=k} e^-lam lam^i / i!
-                term = math.exp(-lam)
-                c = term
-                for j in range(1, max(1, k) + 1):
-                    term *= lam / j
-                    c += term
-                err += (c - Fk) ** 2
-            if err < best_err:
-                best_err = err
-                best_l = lam
-    return best_l
-
-
-def model_angelini_quantiles(
-    per_bookmaker_odds: dict, market_key: str, fallback: tuple[float, float, float]
-) -> tuple[float, float, float] | None:
-    # Angelini: PCHIP + parametric tails (yards: lognormal; discrete counts: Poisson)
-    xs, F = _collect_threshold_anchors(per_bookmaker_odds, market_key)
-    if len(xs) >= 4:
-        # Use PCHIP within anchor range
-        q15 = _pchip_inverse_cdf(xs, F, 0.15)
-        q50 = _pchip_inverse_cdf(xs, F, 0.50)
-        q85 = _pchip_inverse_cdf(xs, F, 0.85)
-        # If any quantile is outside anchor span (due to flat segments), extend with tails
-        needs_lower = F[0] - 1e-9 > 0.15
-        needs_upper = F[-1] + 1e-9 < 0.85
-        is_discrete = _is_discrete_market(market_key)
-        if needs_lower:
-            # Fit lower tail
-            if is_discrete:
-                pts = [(round(xs[j]), float(F[j])) for j in range(min(3, len(xs)))]
-                lam = _poisson_fit_lambda(pts)
-                if lam is not None:
-                    q15 = poisson_quantile(lam, 0.15)
-            else:
-                # lognormal fit using two lowest anchors
-                mu_sigma = (
-                    _fit_lognormal_from_two_points(max(xs[0], 1e-6), F[0], max(xs[1], 1e-6), F[1])
-                    if len(xs) >= 2
-                    else None
-                )
-                if mu_sigma:
-                    mu, sigma = mu_sigma
-                    q15 = _lognormal_quantile(mu, sigma, 0.15)
-        if needs_upper:
-            if is_discrete:
-                pts = []
-                n = len(xs)
-                for j in range(max(0, n - 3), n):
-                    pts.append((round(xs[j]), float(F[j])))
-                lam = _poisson_fit_lambda(pts)
-                if lam is not None:
-                    q85 = poisson_quantile(lam, 0.85)
-            else:
-                mu_sigma = (
-                    _fit_lognormal_from_two_points(
-                        max(xs[-2], 1e-6), F[-2], max(xs[-1], 1e-6), F[-1]
-                    )
-                    if len(xs) >= 2
-                    else None
-                )
-                if mu_sigma:
-                    mu, sigma = mu_sigma
-                    q85 = _lognormal_quantile(mu, sigma, 0.85)
-        return float(q15), float(q50), float(q85)
-    # Not enough anchors → fallback to Puelz → Constantini
-    q = model_puelz_quantiles(per_bookmaker_odds, market_key, fallback)
-    if q is not None:
-        return q
-    return model_const_quantiles(per_bookmaker_odds, market_key, fallback)
-
-
-def get_model_registry():
-    return {
-        "baseline": None,  # handled by range_model fallback
-        "const": model_const_quantiles,
-        "puelz": model_puelz_quantiles,
-        "angelini": model_angelini_quantiles,
-    }
+    return _fit_lambda(tuple((int(k), float(fk)) for k, fk in points))
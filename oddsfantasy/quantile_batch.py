@@ -0,0 +1,241 @@
+"""NumPy kernel for range_model's single-line market quantiles.
+
+range_model._market_quantiles turns one market line (threshold, over/under
+probability, mean) into 15/50/85% stat quantiles, one player-market at a
+time. That's fine for a roster, but the draft board runs it for every skill
+player on every team in a week. This module does the same math for a whole
+slate of player-markets as arrays in one pass: Bernoulli for anytime TD,
+Poisson for counts, lognormal for yardage, Normal otherwise.
+
+Results match the scalar path to floating-point tolerance. The arithmetic
+(AS241 inverse normal, the bracketed Newton Poisson fit, the Poisson
+quantile table) deliberately mirrors statistics.NormalDist and prob_models
+step for step. NumPy is optional: without it `available()` is False and
+range_model.market_quantiles_batch uses the scalar path instead.
+"""
+
+from __future__ import annotations
+
+from statistics import NormalDist
+
+from . import prob_models
+
+try:
+    import numpy as np
+except ImportError:  # optional; see range_model.market_quantiles_batch
+    np = None
+
+# Which branch of _market_quantiles a row takes (see range_model._market_kind)
+KIND_BINARY = 0
+KIND_COUNT = 1
+KIND_YARDS = 2
+KIND_NORMAL = 3
+
+_Z15 = NormalDist().inv_cdf(0.15)
+_Z50 = NormalDist().inv_cdf(0.50)
+_Z85 = NormalDist().inv_cdf(0.85)
+
+
+def available() -> bool:
+    return np is not None
+
+
+def _polyval(coeffs: tuple[float, ...], r):
+    # Horner, highest power first -- same evaluation order as statistics.py
+    acc = coeffs[0] * r + coeffs[1]
+    for c in coeffs[2:]:
+        acc = acc * r + c
+    return acc
+
+
+# Wichura AS241 coefficients, as in statistics._normal_dist_inv_cdf
+_CENTRAL_NUM = (
+    2.5090809287301226727e3,
+    3.3430575583588128105e4,
+    6.7265770927008700853e4,
+    4.5921953931549871457e4,
+    1.3731693765509461125e4,
+    1.9715909503065514427e3,
+    1.3314166789178437745e2,
+    3.3871328727963666080e0,
+)
+_CENTRAL_DEN = (
+    5.2264952788528545610e3,
+    2.8729085735721942674e4,
+    3.9307895800092710610e4,
+    2.1213794301586595867e4,
+    5.3941960214247511077e3,
+    6.8718700749205790830e2,
+    4.2313330701600911252e1,
+    1.0,
+)
+_INNER_NUM = (
+    7.74545014278341407640e-4,
+    2.27238449892691845833e-2,
+    2.41780725177450611770e-1,
+    1.27045825245236838258e0,
+    3.64784832476320460504e0,
+    5.76949722146069140550e0,
+    4.63033784615654529590e0,
+    1.42343711074968357734e0,
+)
+_INNER_DEN = (
+    1.05075007164441684324e-9,
+    5.47593808499534494600e-4,
+    1.51986665636164571966e-2,
+    1.48103976427480074590e-1,
+    6.89767334985100004550e-1,
+    1.67638483018380384940e0,
+    2.05319162663775882187e0,
+    1.0,
+)
+_TAIL_NUM = (
+    2.01033439929228813265e-7,
+    2.71155556874348757815e-5,
+    1.24266094738807843860e-3,
+    2.65321895265761230930e-2,
+    2.96560571828504891230e-1,
+    1.78482653991729133580e0,
+    5.46378491116411436990e0,
+    6.65790464350110377720e0,
+)
+_TAIL_DEN = (
+    2.04426310338993978564e-15,
+    1.42151175831644588870e-7,
+    1.84631831751005468180e-5,
+    7.86869131145613259100e-4,
+    1.48753612908506148525e-2,
+    1.36929880922735805310e-1,
+    5.99832206555887937690e-1,
+    1.0,
+)
+
+
+def inv_cdf(p):
+    """Standard normal inverse CDF of an array of p in (0, 1)."""
+    p = np.asarray(p, dtype=float)
+    q = p - 0.5
+    r_central = 0.180625 - q * q
+    central = _polyval(_CENTRAL_NUM, r_central) * q / _polyval(_CENTRAL_DEN, r_central)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.sqrt(-np.log(np.where(q <= 0.0, p, 1.0 - p)))
+    inner = _polyval(_INNER_NUM, r - 1.6) / _polyval(_INNER_DEN, r - 1.6)
+    tail = _polyval(_TAIL_NUM, r - 5.0) / _polyval(_TAIL_DEN, r - 5.0)
+    x = np.where(r <= 5.0, inner, tail)
+    x = np.where(q < 0.0, -x, x)
+    return np.where(np.abs(q) <= 0.425, central, x)
+
+
+def _poisson_terms(lam, k):
+    """(P(X <= k), P(X = k)) for X ~ Poisson(lam), elementwise."""
+    term = np.exp(-lam)
+    cdf = term
+    for j in range(1, int(k.max(initial=0)) + 1):
+        live = j <= k
+        term = np.where(live, term * (lam / j), term)
+        cdf = np.where(live, cdf + term, cdf)
+    return cdf, term
+
+
+def _poisson_fit_lambda(k, f):
+    """Vectorized prob_models._poisson_fit_lambda for one (k, F(k)) anchor per row.
+
+    Same bracket and the same safeguarded Newton iteration, run for every
+    row at once.
+    """
+    lo = np.maximum(0.1, 0.3 * k)
+    up = 1.5 * np.maximum(1.0, 2.5 * k + 1)
+    k = np.maximum(k, 1)
+    below = _poisson_terms(lo, k)[0] <= f
+    above = _poisson_terms(up, k)[0] >= f
+    a, b = lo.copy(), up.copy()
+    x = 0.5 * (a + b)
+    live = ~(below | above)
+    for _ in range(60):
+        if not live.any():
+            break
+        cdf, pmf = _poisson_terms(x, k)
+        v = f - cdf
+        a = np.where(live & (v < 0.0), x, a)
+        b = np.where(live & (v > 0.0), x, b)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            nx = np.where(pmf > 0.0, x - v / pmf, a - 1.0)
+        nx = np.where((a < nx) & (nx < b), nx, 0.5 * (a + b))
+        converged = (v == 0.0) | (np.abs(nx - x) <= 1e-12 * np.maximum(1.0, x))
+        x = np.where(live & (v != 0.0), nx, x)
+        live &= ~converged
+    return np.where(below, lo, np.where(above, up, x))
+
+
+def _poisson_quantile(lam, q: float):
+    """Vectorized prob_models.poisson_quantile for a fixed q: a searchsorted
+    into the same quantile table, walking the PMF only past its end."""
+    target = min(max(q, 1e-6), 1 - 1e-9)
+    k = np.searchsorted(prob_models.poisson_quantile_breaks(target), lam, side="left")
+    k = k.astype(float)
+    beyond = lam > prob_models.POISSON_TABLE_MAX_LAMBDA
+    if beyond.any():
+        k[beyond] = [prob_models._poisson_quantile_walk(x, target) for x in lam[beyond].tolist()]
+    return np.where(lam > 0, k, 0.0)
+
+
+def market_quantiles(kinds, means, thresholds, p_overs, p_unders, nonneg):
+    """(n, 3) array of 15/50/85% quantiles; see range_model._market_quantiles.
+
+    `kinds` holds KIND_* codes and `nonneg` flags the markets whose Normal
+    fallback is clipped at zero.
+    """
+    kinds = np.asarray(kinds)
+    mean = np.asarray(means, dtype=float)
+    thr = np.asarray(thresholds, dtype=float)
+    p_over = np.asarray(p_overs, dtype=float)
+    p_under = np.asarray(p_unders, dtype=float)
+    out = np.empty((len(kinds), 3))
+
+    # Bernoulli (anytime TD / zero threshold)
+    p_bin = np.where(p_over > 0, p_over, 0.5)
+    out[:, 0] = np.where(1 - p_bin >= 0.15, 0.0, 1.0)
+    out[:, 1] = mean
+    out[:, 2] = np.where(1 - p_bin >= 0.85, 0.0, 1.0)
+
+    total = p_over + p_under
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = np.where(total > 0, p_over / total, 0.5)
+    p = np.minimum(np.maximum(p, 1e-4), 1 - 1e-4)
+    f_at_threshold = 1.0 - p
+    done = kinds == KIND_BINARY
+
+    count = np.flatnonzero(kinds == KIND_COUNT)
+    if count.size:
+        lam = _poisson_fit_lambda(np.maximum(0, np.round(thr[count])), f_at_threshold[count])
+        for col, q in enumerate((0.15, 0.50, 0.85)):
+            out[count, col] = _poisson_quantile(lam, q)
+        done[count] = True
+
+    yards = np.flatnonzero(kinds == KIND_YARDS)
+    if yards.size:
+        # _fit_lognormal_from_two_points((threshold, F), (mean, 0.5))
+        z1 = inv_cdf(np.minimum(np.maximum(f_at_threshold[yards], 1e-6), 1 - 1e-6))
+        lx1 = np.log(np.maximum(np.maximum(thr[yards], 1e-6), 1e-6))
+        lx2 = np.log(np.maximum(np.maximum(mean[yards], 1e-6), 1e-6))
+        fitted = z1 != _Z50
+        with np.errstate(divide="ignore", invalid="ignore"):  # unfitted rows are discarded
+            sigma_log = np.abs((lx2 - lx1) / (_Z50 - z1))
+            mu = lx1 - sigma_log * z1
+            for col, z in enumerate((_Z15, _Z50, _Z85)):
+                out[yards, col] = np.where(fitted, np.exp(mu + sigma_log * z), out[yards, col])
+        done[yards[fitted]] = True
+
+    normal = np.flatnonzero(~done)
+    if normal.size:
+        # _calc_sigma
+        z = inv_cdf(p[normal])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sigma = np.maximum(np.abs((mean[normal] - thr[normal]) / z), 1e-6)
+        sigma = np.where(np.abs(z) < 1e-6, np.maximum(np.abs(thr[normal]) * 0.25, 1.0), sigma)
+        q = np.stack(
+            [mean[normal] + _Z15 * sigma, mean[normal], mean[normal] + _Z85 * sigma], axis=1
+        )
+        clip = np.asarray(nonneg, dtype=bool)[normal]
+        out[normal] = np.where(clip[:, None], np.maximum(q, 0.0), q)
+    return out
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+from functools import lru_cache
 from statistics import NormalDist
 
+from . import quantile_batch, simulate
 from .config import STAT_MARKET_MAPPING_SLEEPER
-from .predicted_stats import predict_stats_for_player
-from .prob_models import (  # type: ignore
-    _fit_lognormal_from_two_points,
-    _lognormal_quantile,
-    _poisson_fit_lambda,
+from .distributions import (
+    BernoulliStat,
+    LogNormalStat,
+    NormalStat,
+    PoissonStat,
+    StatDistribution,
+    band,
     get_model_registry,
-    poisson_quantile,
 )
+from .odds_table import PlayerOdds
+from .predicted_stats import predict_stats_for_player
+from .prob_models import _fit_lognormal_from_two_points, _poisson_fit_lambda  # type: ignore
 
 PRIMARY_MARKET_WHITELIST = {
     # Passing
@@ -51,21 +58,19 @@ def _is_count_market(key: str) -> bool:
     return bool(k.endswith("_interceptions"))
 
 
-def _market_quantiles(
+@lru_cache(maxsize=4096)
+def fit_single_line(
     key: str,
     mean: float,
     threshold: float,
     p_over: float,
     p_under: float,
-) -> tuple[float, float, float]:
+) -> StatDistribution:
+    """Distribution implied by one market line; memoized on the line."""
     # Special-case binary markets (anytime TD modeled as 0/1)
     if key == "player_anytime_td" or threshold == 0:
-        p = p_over if (p_over or 0) > 0 else 0.5
-        # Bernoulli quantiles for X in {0,1} at 15/50/85 percentiles
-        q15 = 0.0 if 1 - p >= 0.15 else 1.0
-        q50 = 0.0 if 1 - p >= 0.50 else 1.0
-        q85 = 0.0 if 1 - p >= 0.85 else 1.0
-        return q15, mean, q85  # use mean for mid to retain smoother ordering
+        # mean is reported as mid to retain smoother ordering
+        return BernoulliStat(p_over if (p_over or 0) > 0 else 0.5, mean)
 
     # Single-line fallback (no alternates / not enough anchors for a full CDF fit).
     # We only have one (threshold, p_over) market observation, so we shape the
@@ -81,31 +86,216 @@ def _market_quantiles(
     if _is_count_market(key):
         lam = _poisson_fit_lambda([(max(0, round(threshold)), f_at_threshold)])
         if lam is not None and lam > 0:
-            q15 = poisson_quantile(lam, 0.15)
-            q50 = poisson_quantile(lam, 0.50)
-            q85 = poisson_quantile(lam, 0.85)
-            return q15, q50, q85
+            return PoissonStat(lam)
     elif "_yds" in key:
         fit = _fit_lognormal_from_two_points(
             max(threshold, 1e-6), f_at_threshold, max(mean, 1e-6), 0.5
         )
         if fit is not None:
-            mu, sigma_log = fit
-            q15 = _lognormal_quantile(mu, sigma_log, 0.15)
-            q50 = _lognormal_quantile(mu, sigma_log, 0.50)
-            q85 = _lognormal_quantile(mu, sigma_log, 0.85)
-            return q15, q50, q85
+            return LogNormalStat(*fit)
 
     sigma = _calc_sigma(mean, threshold, p_over, p_under)
-    q15 = mean + NormalDist().inv_cdf(0.15) * sigma
-    q50 = mean  # mid = mean estimate
-    q85 = mean + NormalDist().inv_cdf(0.85) * sigma
     # Prevent negative quantities for count-like/yardage stats
-    if any(s in key for s in ("_yds", "_tds", "receptions")):
-        q15 = max(0.0, q15)
-        q50 = max(0.0, q50)
-        q85 = max(0.0, q85)
-    return q15, q50, q85
+    return NormalStat(mean, sigma, nonneg=any(s in key for s in ("_yds", "_tds", "receptions")))
+
+
+def _market_quantiles(
+    key: str,
+    mean: float,
+    threshold: float,
+    p_over: float,
+    p_under: float,
+) -> tuple[float, float, float]:
+    return fit_single_line(key, mean, threshold, p_over, p_under).floor_mid_ceiling()
+
+
+def _market_kind(key: str, threshold: float) -> int:
+    """Which branch of _market_quantiles a market takes, as a quantile_batch KIND_*."""
+    if key == "player_anytime_td" or threshold == 0:
+        return quantile_batch.KIND_BINARY
+    if _is_count_market(key):
+        return quantile_batch.KIND_COUNT
+    if "_yds" in key:
+        return quantile_batch.KIND_YARDS
+    return quantile_batch.KIND_NORMAL
+
+
+def market_quantiles_batch(
+    rows: list[tuple[str, float, float, float, float]],
+) -> list[tuple[float, float, float]]:
+    """_market_quantiles for many (key, mean, threshold, p_over, p_under) rows.
+
+    One vectorized pass when NumPy is installed (see quantile_batch), the
+    scalar path row by row otherwise.
+    """
+    if not rows or not quantile_batch.available():
+        return [_market_quantiles(*row) for row in rows]
+    keys, means, thresholds, p_overs, p_unders = zip(*rows, strict=True)
+    out = quantile_batch.market_quantiles(
+        [_market_kind(k, t) for k, t in zip(keys, thresholds, strict=True)],
+        means,
+        thresholds,
+        [p or 0.0 for p in p_overs],
+        [p or 0.0 for p in p_unders],
+        [any(s in k for s in ("_yds", "_tds", "receptions")) for k in keys],
+    )
+    return [(float(a), float(b), float(c)) for a, b, c in out.tolist()]
+
+
+def _select_markets(
+    mean_stats_all: dict[str, float], market_summaries: dict[str, object]
+) -> list[tuple[str, float, object | None]]:
+    """(market key, mean, summary or None) for each market a range is built from.
+
+    Primary markets only; an alternate-line market stands in for its base
+    market when the base isn't present at all.
+    """
+    rows = []
+    for key, mean_val in mean_stats_all.items():
+        use_key = key
+        if key not in PRIMARY_MARKET_WHITELIST:
+            base_key = key.replace("_alternate", "")
+            if base_key in mean_stats_all:
+                continue
+            if base_key != key:
+                use_key = base_key
+        rows.append((use_key, mean_val, market_summaries.get(key) or market_summaries.get(use_key)))
+    return rows
+
+
+def _quantile_row(key: str, mean: float, summ: object) -> tuple[str, float, float, float, float]:
+    return (
+        key,
+        mean,
+        getattr(summ, "avg_threshold", 0.0),
+        getattr(summ, "avg_over_prob", 0.0),
+        getattr(summ, "avg_under_prob", 0.0),
+    )
+
+
+def _predict_means(per_bookmaker_odds: Mapping) -> dict[str, float]:
+    # Means only read main lines; a columnar player skips its alternate ladders
+    if isinstance(per_bookmaker_odds, PlayerOdds):
+        per_bookmaker_odds = per_bookmaker_odds.main_lines()
+    return predict_stats_for_player(per_bookmaker_odds)
+
+
+def _model_fit(fitter, per_bookmaker_odds: dict, key: str) -> StatDistribution | None:
+    if not fitter or key == "player_anytime_td":
+        return None
+    try:
+        return fitter(per_bookmaker_odds, key)
+    except Exception:
+        return None
+
+
+def _fit_market(
+    fitter, per_bookmaker_odds: dict, key: str, mean: float, summ: object | None
+) -> StatDistribution:
+    """The model's fit for one selected market, falling back to the
+    single-line fit (or the +/-20% band when there's no summary)."""
+    if summ is None:
+        return band(mean)
+    dist = _model_fit(fitter, per_bookmaker_odds, key)
+    return dist if dist is not None else fit_single_line(*_quantile_row(key, mean, summ))
+
+
+def _market_ranges(
+    fitter,
+    per_bookmaker_odds: dict,
+    mean_stats_all: dict[str, float],
+    market_summaries: dict[str, object],
+    _quantiles: dict[str, tuple[float, float, float]] | None,
+) -> dict[str, tuple[float, float, float]]:
+    """Floor/mid/ceiling stat quantiles per selected market, read off each
+    market's fit; batch-precomputed single-line quantiles are used as-is."""
+    per_market_ranges: dict[str, tuple[float, float, float]] = {}
+    for use_key, mean_val, summ in _select_markets(mean_stats_all, market_summaries):
+        dist = _model_fit(fitter, per_bookmaker_odds, use_key) if summ is not None else None
+        if dist is None and summ is not None and _quantiles is not None and use_key in _quantiles:
+            per_market_ranges[use_key] = _quantiles[use_key]
+            continue
+        if dist is None:
+            dist = _fit_market(None, per_bookmaker_odds, use_key, mean_val, summ)
+        per_market_ranges[use_key] = dist.floor_mid_ceiling()
+    return per_market_ranges
+
+
+def fit_player_markets(
+    per_bookmaker_odds: dict,
+    market_summaries: dict[str, object],
+    model: str = "baseline",
+    _means: dict[str, float] | None = None,
+) -> dict[str, StatDistribution]:
+    """Fitted distribution per market range, keyed like per_market_ranges.
+
+    Fits are memoized, so this returns the same objects the range
+    computation read its floor/mid/ceiling from.
+    """
+    fitter = get_model_registry().get((model or "baseline").lower())
+    means = _means if _means is not None else _predict_means(per_bookmaker_odds)
+    return {
+        key: _fit_market(fitter, per_bookmaker_odds, key, mean_val, summ)
+        for key, mean_val, summ in _select_markets(means, market_summaries)
+    }
+
+
+def simulate_fantasy_percentiles(
+    players: dict[str, tuple[dict, dict[str, object]]],
+    scoring_rules: dict[str, float],
+    model: str = "baseline",
+) -> dict[str, dict[str, float]]:
+    """Monte Carlo fantasy-point percentiles ({"p10": ..., "p90": ...}) per
+    player, keyed like `players`, sampled from the same fits the ranges use.
+
+    Empty without NumPy; see simulate.
+    """
+    if not players or not simulate.available():
+        return {}
+    fits = {
+        pid: fit_player_markets(odds, summaries, model)
+        for pid, (odds, summaries) in players.items()
+    }
+    labels = [f"p{round(q * 100)}" for q in simulate.FP_PERCENTILES]
+    return {
+        pid: dict(zip(labels, (round(v, 2) for v in values), strict=True))
+        for pid, values in simulate.fantasy_point_percentiles(fits, scoring_rules).items()
+    }
+
+
+def compute_fantasy_ranges_batch(
+    players: dict[str, tuple[dict, dict[str, object]]],
+    scoring_rules: dict[str, float],
+    model: str = "baseline",
+) -> dict[str, tuple[float, float, float, dict[str, tuple[float, float, float]]]]:
+    """compute_fantasy_range(_model) for many players, keyed like `players`.
+
+    `players` maps an id to (per_bookmaker_odds, market_summaries). Every
+    player-market's parametric quantiles are computed in one
+    market_quantiles_batch call up front rather than one market at a time.
+    """
+    means = {pid: _predict_means(odds) for pid, (odds, _) in players.items()}
+    owners: list[tuple[str, str]] = []
+    rows = []
+    for pid, (_, summaries) in players.items():
+        for key, mean_val, summ in _select_markets(means[pid], summaries):
+            if summ is not None:
+                owners.append((pid, key))
+                rows.append(_quantile_row(key, mean_val, summ))
+    precomputed: dict[str, dict[str, tuple[float, float, float]]] = {}
+    for (pid, key), q in zip(owners, market_quantiles_batch(rows), strict=True):
+        precomputed.setdefault(pid, {})[key] = q
+    return {
+        pid: compute_fantasy_range_model(
+            odds,
+            summaries,
+            scoring_rules,
+            model=model,
+            _means=means[pid],
+            _quantiles=precomputed.get(pid, {}),
+        )
+        for pid, (odds, summaries) in players.items()
+    }
 
 
 def _fantasy_points(stats: dict[str, float], scoring_rules: dict[str, float]) -> float:
@@ -155,41 +345,22 @@ def compute_fantasy_range(
     per_bookmaker_odds: dict,
     market_summaries: dict[str, object],  # MarketSummary-like with fields
     scoring_rules: dict[str, float],
+    _means: dict[str, float] | None = None,
+    _quantiles: dict[str, tuple[float, float, float]] | None = None,
 ) -> tuple[float, float, float, dict[str, tuple[float, float, float]]]:
     """Compute floor, mid, ceiling fantasy points using odds-derived stats.
 
     Returns (floor, mid, ceiling, per_market_ranges).
     per_market_ranges maps market_key -> (q10, q50, q90) of the stat.
+    `_means`/`_quantiles` are precomputed by compute_fantasy_ranges_batch.
     """
     # 1) Predict mean stats per market
-    mean_stats_all = predict_stats_for_player(per_bookmaker_odds)
+    mean_stats_all = _means if _means is not None else _predict_means(per_bookmaker_odds)
 
     # 2) Build per-market ranges, focusing on primary markets only
-    per_market_ranges: dict[str, tuple[float, float, float]] = {}
-    for key, mean_val in mean_stats_all.items():
-        use_key = key
-        if key not in PRIMARY_MARKET_WHITELIST:
-            # use alternates only if the base isnâ€™t present at all
-            base_key = key.replace("_alternate", "")
-            if base_key in mean_stats_all:
-                continue
-            if base_key != key:
-                use_key = base_key
-        summ = market_summaries.get(key) or market_summaries.get(use_key)
-        if summ is None:
-            # Fallback: Â±20% band around mean
-            q10 = max(0.0, mean_val * 0.8)
-            q50 = max(0.0, mean_val)
-            q90 = max(0.0, mean_val * 1.2)
-        else:
-            q10, q50, q90 = _market_quantiles(
-                use_key,
-                mean=mean_val,
-                threshold=getattr(summ, "avg_threshold", 0.0),
-                p_over=getattr(summ, "avg_over_prob", 0.0),
-                p_under=getattr(summ, "avg_under_prob", 0.0),
-            )
-        per_market_ranges[use_key] = (q10, q50, q90)
+    per_market_ranges = _market_ranges(
+        None, per_bookmaker_odds, mean_stats_all, market_summaries, _quantiles
+    )
 
     # 3) Convert ranges to fantasy points
     floor_stats = {k: v[0] for k, v in per_market_ranges.items()}
@@ -210,52 +381,26 @@ def compute_fantasy_range_model(
     market_summaries: dict[str, object],
     scoring_rules: dict[str, float],
     model: str = "baseline",
+    _means: dict[str, float] | None = None,
+    _quantiles: dict[str, tuple[float, float, float]] | None = None,
 ) -> tuple[float, float, float, dict[str, tuple[float, float, float]]]:
     model = (model or "baseline").lower()
     if model == "baseline":
-        return compute_fantasy_range(per_bookmaker_odds, market_summaries, scoring_rules)
+        return compute_fantasy_range(
+            per_bookmaker_odds, market_summaries, scoring_rules, _means, _quantiles
+        )
 
     # 1) Predict mean stats per market (used for fallback + sigma estimation)
-    mean_stats_all = predict_stats_for_player(per_bookmaker_odds)
-
-    # 2) Build per-market ranges via model quantiles where possible
-    reg = get_model_registry()
-    model_func = reg.get(model)
-    per_market_ranges: dict[str, tuple[float, float, float]] = {}
-    for key, mean_val in mean_stats_all.items():
-        use_key = key
-        if key not in PRIMARY_MARKET_WHITELIST:
-            base_key = key.replace("_alternate", "")
-            if base_key in mean_stats_all:
-                continue
-            if base_key != key:
-                use_key = base_key
-        summ = market_summaries.get(key) or market_summaries.get(use_key)
-        if summ is None:
-            q10 = max(0.0, mean_val * 0.8)
-            q50 = max(0.0, mean_val)
-            q90 = max(0.0, mean_val * 1.2)
-            per_market_ranges[use_key] = (q10, q50, q90)
-            continue
-        # Fallback quantiles via parametric
-        fallback_q = _market_quantiles(
-            use_key,
-            mean=mean_val,
-            threshold=getattr(summ, "avg_threshold", 0.0),
-            p_over=getattr(summ, "avg_over_prob", 0.0),
-            p_under=getattr(summ, "avg_under_prob", 0.0),
-        )
-        q10 = q50 = q90 = None
-        if model_func and use_key != "player_anytime_td":
-            try:
-                q = model_func(per_bookmaker_odds, use_key, fallback_q)
-                if q:
-                    q10, q50, q90 = q
-            except Exception:
-                q10 = q50 = q90 = None
-        if q10 is None:
-            q10, q50, q90 = fallback_q
-        per_market_ranges[use_key] = (q10, q50, q90)
+    mean_stats_all = _means if _means is not None else _predict_means(per_bookmaker_odds)
+
+    # 2) Build per-market ranges from the model's fit where possible
+    per_market_ranges = _market_ranges(
+        get_model_registry().get(model),
+        per_bookmaker_odds,
+        mean_stats_all,
+        market_summaries,
+        _quantiles,
+    )
 
     # 3) Convert ranges to FP with mixed-mode bonuses (EV ramp for yards, discrete for TD/steps)
     floor_stats = {k: v[0] for k, v in per_market_ranges.items()}
@@ -2,18 +2,33 @@ from __future__ import annotations
 
 import contextlib
 import datetime as dt
+import hashlib
+import json
 import os
-import time
-
-from . import draft_prep, odds_client, ratelimit, sleeper_api
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from . import (
+    devig,
+    draft_prep,
+    fetch_engine,
+    odds_client,
+    prefetch,
+    ratelimit,
+    sleeper_api,
+    store,
+)
 from .aggregator import aggregate_by_week
 from .config import POSITION_STAT_CONFIG, SLEEPER_TO_ODDSAPI_TEAM
+from .event_index import EventIndex, as_index
 from .lineup import build_lineup
+from .lru import FingerprintLRU
 from .planner import plan_relevant_games_and_markets
 from .range_model import (
     PRIMARY_MARKET_WHITELIST,
     compute_defense_fantasy_range,
-    compute_fantasy_range,
+    compute_fantasy_ranges_batch,
+    simulate_fantasy_percentiles,
 )
 from .weekly_windows import compute_week_windows, resolve_week_windows
 
@@ -40,10 +55,109 @@ def _resolve_identity(
     provided, so existing callers keep working unchanged.
     """
     if league_id:
-        return sleeper_api.get_league_roster_data(league_id, roster_id=roster_id)
+        data = sleeper_api.get_league_roster_data(league_id, roster_id=roster_id)
+        # Resolved, so a real league: worth prefetching (if that's running)
+        prefetch.note_league(league_id)
+        return data
     return sleeper_api.get_user_sleeper_data(username, season) or {}
 
 
+@dataclass(eq=False)
+class RequestContext:
+    """Everything one API request fetches or derives, each computed once.
+
+    A single call often assembles several views from the same inputs -- the
+    dashboard builds projections and defenses for two weeks, /lineup builds
+    projections and defenses for one -- and each view used to fetch events,
+    resolve the roster, plan games and fetch odds for itself. Views built
+    from one RequestContext share all of that. Every function that takes a
+    `ctx` also works without one, building a private context from its own
+    arguments.
+    """
+
+    username: str
+    season: str
+    region: str = "us"
+    cache_mode: str = "auto"
+    league_id: str | None = None
+    roster_id: int | None = None
+    _memo: dict = field(default_factory=dict, repr=False)
+    _odds: dict[str, dict] = field(default_factory=dict, repr=False)
+    _odds_markets: dict[str, set[str]] = field(default_factory=dict, repr=False)
+    # ODDS_QUOTA_BUDGET is per request: every batch this context fetches draws on it
+    _quota: fetch_engine.QuotaBudget = field(default_factory=fetch_engine.QuotaBudget, repr=False)
+
+    def _once(self, name: str, compute):
+        """compute() on first use; later calls return (or re-raise) that."""
+        if name not in self._memo:
+            try:
+                self._memo[name] = (compute(), None)
+            except Exception as e:
+                self._memo[name] = (None, e)
+        value, error = self._memo[name]
+        if error is not None:
+            raise error
+        return value
+
+    def events(self) -> list[dict]:
+        return self._once(
+            "events", lambda: odds_client.get_nfl_events(regions=self.region, mode=self.cache_mode)
+        )
+
+    def index(self) -> EventIndex:
+        return self._once("index", lambda: as_index(self.events()))
+
+    def windows(self):
+        return self._once("windows", lambda: resolve_week_windows(self.index()))
+
+    def roster(self) -> dict:
+        return self._once(
+            "roster",
+            lambda: _resolve_identity(self.username, self.season, self.league_id, self.roster_id),
+        )
+
+    def plan(self) -> dict[str, dict[str, object]]:
+        """Both weeks' planned games for the roster; needs windows()."""
+        return self._once(
+            "plan",
+            lambda: plan_relevant_games_and_markets(
+                self.roster(),
+                self.windows(),
+                regions=self.region,
+                cache_mode=self.cache_mode,
+                events=self.index(),
+            ),
+        )
+
+    def ownership(self) -> tuple[dict, str | None]:
+        return self._once(
+            "ownership",
+            lambda: _def_ownership_map(self.username, self.season, self.league_id, self.roster_id),
+        )
+
+    def event_odds(self, jobs: list[fetch_engine.OddsJob]) -> dict[str, dict]:
+        """Odds for `jobs`, fetching only markets this request hasn't yet."""
+        need = []
+        for j in jobs:
+            missing = set(j.markets) - self._odds_markets.get(j.event_id, set())
+            if missing:
+                need.append(fetch_engine.OddsJob(j.event_id, tuple(sorted(missing))))
+        if need:
+            fetched = fetch_engine.fetch_event_odds(
+                need, regions=self.region, mode=self.cache_mode, budget=self._quota
+            )
+            for job in need:
+                data = fetched.get(job.event_id)
+                if data is None:
+                    continue
+                prev = self._odds.get(job.event_id)
+                self._odds[job.event_id] = (
+                    odds_client.merge_event_odds(prev, data) if prev else data
+                )
+                self._odds_markets.setdefault(job.event_id, set()).update(job.markets)
+        return {j.event_id: self._odds[j.event_id] for j in jobs if j.event_id in self._odds}
+
+
 def resolve_user_leagues(username: str, season: str) -> dict:
     """List a Sleeper user's leagues for a season, for the "pick your
     league" step of the identity flow. Powered by username (which everyone
@@ -120,44 +234,92 @@ NO_GAMES_SCHEDULED_MESSAGE = (
 
 
 def _fetch_odds(
-    plan_by_week: dict[str, dict[str, object]], cache_mode: str, regions: str = "us"
+    plan_by_week: dict[str, dict[str, object]],
+    cache_mode: str,
+    regions: str = "us",
+    ctx: RequestContext | None = None,
 ) -> dict[str, dict[str, list]]:
-    """Fetch event odds concurrently per week for planned games.
+    """Fetch event odds for planned games, both weeks in one batch.
 
-    Uses a small thread pool to parallelize network calls when cache misses occur.
+    See fetch_engine for the concurrency cap and quota budget. With a `ctx`,
+    odds it already holds aren't fetched again.
     """
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-
+    jobs = [
+        fetch_engine.OddsJob(gid, tuple(sorted(set(g.markets))))
+        for w in ("this", "next")
+        for gid, g in plan_by_week.get(w, {}).items()
+    ]
+    print(f"[services] fetch odds games={len(jobs)} regions={regions} mode={cache_mode}")
+    if ctx is not None:
+        fetched = ctx.event_odds(jobs)
+    else:
+        fetched = fetch_engine.fetch_event_odds(jobs, regions=regions, mode=cache_mode)
     out: dict[str, dict[str, list]] = {"this": {}, "next": {}}
     for w in ("this", "next"):
-        items = list(plan_by_week.get(w, {}).items())
-        if not items:
-            continue
-        max_workers = min(8, max(1, len(items)))
+        for gid in plan_by_week.get(w, {}):
+            if gid in fetched:
+                out[w][gid] = fetched[gid]
+    return out
 
-        def task(pair, w=w):
-            gid, g = pair
-            markets_str = ",".join(sorted(set(g.markets)))
-            print(
-                f"[services] fetch odds week={w} game={gid} markets={len(g.markets)} regions={regions} mode={cache_mode}"
-            )
-            data = odds_client.get_event_player_odds(
-                event_id=gid, markets=markets_str, regions=regions, mode=cache_mode
-            )
-            return gid, data
 
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            futures = [ex.submit(task, it) for it in items]
-            for fut in as_completed(futures):
-                try:
-                    gid, data = fut.result()
-                    out[w][gid] = data
-                except Exception as e:
-                    print(f"[services] fetch odds error: {e}")
-        print(
-            f"[services] fetch odds week={w} complete; games={len(out[w])} rl={ratelimit.format_status()}"
+# In-process caches in front of compute_projections/list_defenses, bounded by
+# entry count and payload bytes; entries are invalidated by a fingerprint of
+# their inputs (see lru.py).
+SERVICE_CACHE_MAX_ENTRIES = int(os.getenv("SERVICE_CACHE_MAX_ENTRIES", "256"))
+SERVICE_CACHE_MAX_BYTES = int(os.getenv("SERVICE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+_PROJECTION_CACHE = FingerprintLRU(SERVICE_CACHE_MAX_ENTRIES, SERVICE_CACHE_MAX_BYTES)
+_DEFENSE_CACHE = FingerprintLRU(SERVICE_CACHE_MAX_ENTRIES, SERVICE_CACHE_MAX_BYTES)
+
+
+def _with_ratelimit(payload: dict) -> dict:
+    """A cached payload with the current quota status filled in."""
+    return {
+        **payload,
+        "ratelimit": ratelimit.format_status(),
+        "ratelimit_info": ratelimit.get_details(),
+    }
+
+
+# Part of every materialized projection key; bump it when a change to the
+# projection pipeline should invalidate projections already in the store.
+PROJECTION_VERSION = 2
+
+
+def _digest(obj: object) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _projection_key(roster: dict, planned: dict, region: str, week: str, model: str) -> str:
+    """Materialized-projection key: (odds snapshot version, scoring-rules hash,
+    model, de-vig method, week), plus the roster the projection was computed for."""
+    snapshot = store.snapshot_version({gid: g.markets for gid, g in planned.items()}, region)
+    return "|".join(
+        (
+            f"v{PROJECTION_VERSION}",
+            week,
+            model,
+            devig.DEVIG_METHOD,
+            _digest(roster.get("scoring_rules", {})),
+            snapshot,
+            _digest(roster.get("players", {})),
         )
-    return out
+    )
+
+
+def _refresh_stale_odds(markets_by_game: dict[str, Iterable[str]], ctx: RequestContext) -> None:
+    """Fetch the markets that are stale for ctx's cache mode, and only those,
+    so the snapshot version is the one a full read would see. In 'swr',
+    markets past ODDS_TTL go through too, to schedule their background
+    refresh."""
+    mode = "auto" if ctx.cache_mode == "swr" else ctx.cache_mode
+    jobs = []
+    for gid, wanted in markets_by_game.items():
+        markets = ",".join(sorted(set(wanted)))
+        stale = odds_client.pending_markets(gid, ctx.region, markets, mode)
+        if stale:
+            jobs.append(fetch_engine.OddsJob(gid, tuple(stale)))
+    if jobs:
+        ctx.event_odds(jobs)
 
 
 def compute_projections(
@@ -170,22 +332,16 @@ def compute_projections(
     model: str = "const",
     league_id: str | None = None,
     roster_id: int | None = None,
+    ctx: RequestContext | None = None,
 ) -> dict:
     print(
         f"[services] compute_projections user={username} season={season} week={week} fresh={fresh} league_id={league_id} roster_id={roster_id}"
     )
-    # In-process TTL cache
-    ttl = int(os.getenv("SERVICE_CACHE_TTL", "120"))
-    _proj_cache = getattr(compute_projections, "_cache", {})
     key = (username, season, week, region, model, league_id, roster_id)
-    now = time.time()
-    if not fresh and key in _proj_cache:
-        ts, payload = _proj_cache[key]
-        if now - ts < ttl:
-            print(f"[services] compute_projections cache hit key={key} age={int(now - ts)}s")
-            return payload
+    eff_mode = "fresh" if fresh else cache_mode
+    ctx = ctx or RequestContext(username, season, region, eff_mode, league_id, roster_id)
     try:
-        roster = _resolve_identity(username, season, league_id, roster_id)
+        roster = ctx.roster()
     except Exception as e:
         print(f"[services] sleeper error: {e}")
         # Graceful fallback: continue with empty roster so UI can load
@@ -203,27 +359,31 @@ def compute_projections(
         }
 
     # Plan games only for requested week
-    eff_mode = "fresh" if fresh else cache_mode
-    events = odds_client.get_nfl_events(regions=region, mode=eff_mode)
-    windows = resolve_week_windows(events)
-    if windows is None:
+    if ctx.windows() is None:
         return {
             "players": [],
             "ratelimit": ratelimit.format_status(),
             "ratelimit_info": ratelimit.get_details(),
             "message": NO_GAMES_SCHEDULED_MESSAGE,
         }
-    (this_start, this_end), (next_start, next_end) = windows
-    plan_all = plan_relevant_games_and_markets(
-        roster,
-        ((this_start, this_end), (next_start, next_end)),
-        regions=region,
-        cache_mode=eff_mode,
-    )
-    plan = {week: plan_all.get(week, {})}
-
-    odds_by_week = _fetch_odds(plan, cache_mode=eff_mode, regions=region)
+    plan = {week: ctx.plan().get(week, {})}
     planned = plan[week]
+
+    # The odds only change when we fetch, so until the next fetch lands the
+    # projection is a lookup rather than a recompute: refresh just the stale
+    # markets, then key on the snapshot and read the odds only on a miss.
+    _refresh_stale_odds({gid: g.markets for gid, g in planned.items()}, ctx)
+    projection_key = _projection_key(roster, planned, region, week, model)
+    cached = None if fresh else _PROJECTION_CACHE.get(key, projection_key)
+    if cached is not None:
+        print(f"[services] compute_projections cache hit key={key}")
+        return _with_ratelimit(cached)
+    materialized = store.get_projection(projection_key)
+    if materialized is not None:
+        print(f"[services] compute_projections materialized hit week={week} model={model}")
+        _PROJECTION_CACHE.put(key, projection_key, materialized)
+        return _with_ratelimit(materialized)
+    odds_by_week = _fetch_odds(plan, cache_mode=eff_mode, regions=region, ctx=ctx)
     ev_odds = odds_by_week.get(week, {})
     # Debug: print planned vs matched counts
     try:
@@ -305,21 +465,24 @@ def compute_projections(
         minor &= PRIMARY_MARKET_WHITELIST
         return vital, minor
 
+    # Rows repeat the same few market sets (per position, and mostly empty
+    # diagnostics); every row shares one sorted list per distinct set
+    market_lists: dict[frozenset[str], list[str]] = {}
+
+    def _sorted_markets(markets: set[str]) -> list[str]:
+        key = frozenset(markets)
+        out = market_lists.get(key)
+        if out is None:
+            out = market_lists[key] = sorted(key)
+        return out
+
     present_aliases = set(per_player_odds.keys())
+    players_in = {a: (b, per_player_summaries.get(a, {})) for a, b in per_player_odds.items()}
+    ranges = compute_fantasy_ranges_batch(players_in, scoring_rules, model=model)
+    sims = simulate_fantasy_percentiles(players_in, scoring_rules, model=model)
     for alias, by_book in per_player_odds.items():
         pinfo = info_by_alias.get(alias, {})
-        vital_exp, minor_exp = _importance_for_pos(pinfo.get("primary_position"), scoring_rules)
-        vital_exp, minor_exp = _importance_for_pos(pinfo.get("primary_position"), scoring_rules)
-        from .range_model import compute_fantasy_range, compute_fantasy_range_model
-
-        if (model or "baseline").lower() == "baseline":
-            floor, mid, ceil, _ = compute_fantasy_range(
-                by_book, per_player_summaries.get(alias, {}), scoring_rules
-            )
-        else:
-            floor, mid, ceil, _ = compute_fantasy_range_model(
-                by_book, per_player_summaries.get(alias, {}), scoring_rules, model=model
-            )
+        floor, mid, ceil, _ = ranges[alias]
 
         # Coverage diagnostics
         available: set[str] = set()
@@ -330,15 +493,15 @@ def compute_projections(
         vital_exp, minor_exp = _importance_for_pos(pos, scoring_rules)
         expected = vital_exp | minor_exp
         missing_set = expected - available
-        missing = sorted(missing_set)
-        missing_vital = sorted(missing_set & vital_exp)
-        missing_minor = sorted(missing_set & minor_exp)
+        missing = _sorted_markets(missing_set)
+        missing_vital = _sorted_markets(missing_set & vital_exp)
+        missing_minor = _sorted_markets(missing_set & minor_exp)
         # Summary keys; if absent, we used fallback band
         summ_keys = {_norm_market_key(k) for k in (per_player_summaries.get(alias, {}) or {})}
         fallback_set = {k for k in available if k not in summ_keys}
-        fallback = sorted(fallback_set)
-        fallback_vital = sorted(fallback_set & vital_exp)
-        fallback_minor = sorted(fallback_set & minor_exp)
+        fallback = _sorted_markets(fallback_set)
+        fallback_vital = _sorted_markets(fallback_set & vital_exp)
+        fallback_minor = _sorted_markets(fallback_set & minor_exp)
 
         players_out.append(
             {
@@ -349,6 +512,7 @@ def compute_projections(
                 "floor": round(floor, 2),
                 "mid": round(mid, 2),
                 "ceiling": round(ceil, 2),
+                "fp_percentiles": sims.get(alias),
                 "books_used": len(by_book.keys()),
                 "markets_used": len(per_player_summaries.get(alias, {})),
                 "incomplete": bool(missing),
@@ -360,8 +524,8 @@ def compute_projections(
                 "fallback_vital": fallback_vital,
                 "fallback_minor": fallback_minor,
                 "is_critical": (len(missing_vital) > 0 or len(fallback_vital) > 0),
-                "vital_markets": sorted(vital_exp),
-                "minor_markets": sorted(minor_exp),
+                "vital_markets": _sorted_markets(vital_exp),
+                "minor_markets": _sorted_markets(minor_exp),
             }
         )
 
@@ -372,7 +536,7 @@ def compute_projections(
         # For players with no odds, mark expected markets as missing with importance split
         pos = pinfo.get("primary_position")
         vital_exp, minor_exp = _importance_for_pos(pos, scoring_rules)
-        exp_all = sorted(vital_exp | minor_exp)
+        exp_all = _sorted_markets(vital_exp | minor_exp)
         players_out.append(
             {
                 "name": pinfo.get("full_name", alias),
@@ -382,18 +546,19 @@ def compute_projections(
                 "floor": None,
                 "mid": None,
                 "ceiling": None,
+                "fp_percentiles": None,
                 "books_used": 0,
                 "markets_used": 0,
                 "incomplete": True,
                 "missing_markets": exp_all,
                 "fallback_markets": [],
-                "missing_vital": sorted(vital_exp),
-                "missing_minor": sorted(minor_exp),
+                "missing_vital": _sorted_markets(vital_exp),
+                "missing_minor": _sorted_markets(minor_exp),
                 "fallback_vital": [],
                 "fallback_minor": [],
                 "is_critical": bool(vital_exp),
-                "vital_markets": sorted(vital_exp),
-                "minor_markets": sorted(minor_exp),
+                "vital_markets": _sorted_markets(vital_exp),
+                "minor_markets": _sorted_markets(minor_exp),
             }
         )
 
@@ -417,18 +582,19 @@ def compute_projections(
                         "floor": None,
                         "mid": None,
                         "ceiling": None,
+                        "fp_percentiles": None,
                         "books_used": 0,
                         "markets_used": 0,
                         "incomplete": True,
                         "missing_markets": exp_all,
                         "fallback_markets": [],
-                        "missing_vital": sorted(vital_exp),
-                        "missing_minor": sorted(minor_exp),
+                        "missing_vital": _sorted_markets(vital_exp),
+                        "missing_minor": _sorted_markets(minor_exp),
                         "fallback_vital": [],
                         "fallback_minor": [],
                         "is_critical": bool(vital_exp),
-                        "vital_markets": sorted(vital_exp),
-                        "minor_markets": sorted(minor_exp),
+                        "vital_markets": _sorted_markets(vital_exp),
+                        "minor_markets": _sorted_markets(minor_exp),
                     }
                 )
             except Exception:
@@ -561,8 +727,8 @@ def compute_projections(
                 "markets": counts,
                 "total_books": int(sum(counts.values())),
                 "incomplete": bool(pdata.get("incomplete")),
-                "vital_markets": sorted(pdata_vital),
-                "minor_markets": sorted(pdata_minor),
+                "vital_markets": _sorted_markets(pdata_vital),
+                "minor_markets": _sorted_markets(pdata_minor),
             }
         )
 
@@ -586,25 +752,22 @@ def compute_projections(
                 "markets": fallback_counts,
                 "total_books": int(sum(fallback_counts.values())),
                 "incomplete": True,
-                "vital_markets": sorted(vital_exp),
-                "minor_markets": sorted(minor_exp),
+                "vital_markets": _sorted_markets(vital_exp),
+                "minor_markets": _sorted_markets(minor_exp),
             }
         )
 
     payload = {
         "week": week,
         "players": players_out,
-        "ratelimit": ratelimit.format_status(),
-        "ratelimit_info": ratelimit.get_details(),
         "book_coverage": {
             "markets": list(COVERAGE_MARKET_ORDER),
             "rows": coverage_rows,
         },
     }
-    # store in cache
-    _proj_cache[key] = (now, payload)
-    compute_projections._cache = _proj_cache
-    return payload
+    store.put_projection(projection_key, payload)
+    _PROJECTION_CACHE.put(key, projection_key, payload)
+    return _with_ratelimit(payload)
 
 
 def compute_draft_board(
@@ -653,23 +816,21 @@ def compute_draft_board(
         for p in g.players:
             info_by_alias[p["alias"]] = p
 
-    from .range_model import compute_fantasy_range_model
-
     pos_filter = {p.upper() for p in positions} if positions else None
+    wanted = {
+        alias: (by_book, per_player_summaries.get(alias, {}))
+        for alias, by_book in per_player_odds.items()
+        if not pos_filter or info_by_alias.get(alias, {}).get("primary_position") in pos_filter
+    }
+    # The whole slate's quantiles in one vectorized pass (see range_model)
+    ranges = compute_fantasy_ranges_batch(wanted, scoring_rules, model=model)
+    # Fantasy-point percentiles from simulated stat lines (needs NumPy)
+    sims = simulate_fantasy_percentiles(wanted, scoring_rules, model=model)
     board: list[dict] = []
-    for alias, by_book in per_player_odds.items():
+    for alias, (by_book, _) in wanted.items():
         pinfo = info_by_alias.get(alias, {})
         pos = pinfo.get("primary_position")
-        if pos_filter and pos not in pos_filter:
-            continue
-        if (model or "baseline").lower() == "baseline":
-            floor, mid, ceil, _ = compute_fantasy_range(
-                by_book, per_player_summaries.get(alias, {}), scoring_rules
-            )
-        else:
-            floor, mid, ceil, _ = compute_fantasy_range_model(
-                by_book, per_player_summaries.get(alias, {}), scoring_rules, model=model
-            )
+        floor, mid, ceil, _ = ranges[alias]
         board.append(
             {
                 "name": pinfo.get("full_name", alias),
@@ -678,6 +839,7 @@ def compute_draft_board(
                 "floor": round(floor, 2),
                 "mid": round(mid, 2),
                 "ceiling": round(ceil, 2),
+                "fp_percentiles": sims.get(alias),
                 "books_used": len(by_book.keys()),
                 "markets_used": len(per_player_summaries.get(alias, {})),
             }
@@ -817,19 +979,18 @@ def _def_ownership_map(
         for u in users or []:
             name = u.get("display_name") or u.get("username") or u.get("user_id")
             owner_name[u.get("user_id")] = name
-        # All players metadata to identify DEF and team abbr
-        all_players = sleeper_api.get_players()
+        # Player index to identify DEF and team abbr
+        players = sleeper_api.get_player_index()
         team_to_owner: dict = {}
         for r in rosters or []:
             oid = r.get("owner_id")
             disp = owner_name.get(oid) or (oid or "unknown")
             for pid in r.get("players", []) or []:
                 try:
-                    pdata = all_players.get(pid) or {}
-                    if pdata.get("position") != "DEF":
+                    player = players.get(pid)
+                    if player is None or player.position != "DEF":
                         continue
-                    abbr = pdata.get("team")
-                    full = SLEEPER_TO_ODDSAPI_TEAM.get(abbr)
+                    full = SLEEPER_TO_ODDSAPI_TEAM.get(player.team)
                     if full:
                         team_to_owner[full] = {"id": oid, "name": disp}
                 except Exception:
@@ -850,23 +1011,15 @@ def list_defenses(
     region: str = "us",
     league_id: str | None = None,
     roster_id: int | None = None,
+    ctx: RequestContext | None = None,
 ) -> dict:
     print(
         f"[services] list_defenses user={username} season={season} week={week} scope={scope} fresh={fresh} league_id={league_id} roster_id={roster_id}"
     )
-    # In-process TTL cache
-    ttl = int(os.getenv("SERVICE_CACHE_TTL", "120"))
-    _def_cache = getattr(list_defenses, "_cache", {})
-    key = (username, season, week, scope, league_id, roster_id)
-    now = time.time()
-    if not fresh and key in _def_cache:
-        ts, payload = _def_cache[key]
-        if now - ts < ttl:
-            print(f"[services] list_defenses cache hit key={key} age={int(now - ts)}s")
-            return payload
+    key = (username, season, week, scope, region, league_id, roster_id)
     eff_mode = "fresh" if fresh else cache_mode
-    events = odds_client.get_nfl_events(regions=region, mode=eff_mode)
-    windows = resolve_week_windows(events)
+    ctx = ctx or RequestContext(username, season, region, eff_mode, league_id, roster_id)
+    windows = ctx.windows()
     if windows is None:
         return {
             "defenses": [],
@@ -879,14 +1032,14 @@ def list_defenses(
 
     # Scoring rules for converting opponent implied totals into DEF fantasy points
     try:
-        roster_for_scoring = _resolve_identity(username, season, league_id, roster_id)
+        roster_for_scoring = ctx.roster()
         scoring_rules = (roster_for_scoring or {}).get("scoring_rules", {})
     except Exception as e:
         print(f"[services] defenses: scoring rules lookup failed: {e}")
         scoring_rules = {}
 
     # Build ownership map across entire league
-    team_to_owner, current_uid = _def_ownership_map(username, season, league_id, roster_id)
+    team_to_owner, current_uid = ctx.ownership()
     # All teams (full names)
     all_teams = list(SLEEPER_TO_ODDSAPI_TEAM.values())
     # Scope handling remains, but default 'both' -> include all
@@ -901,24 +1054,27 @@ def list_defenses(
             team_list.append((t, "available"))
 
     # Filter events in window
-    window_events = [
-        e
-        for e in events
-        if start <= dt.datetime.strptime(e["commence_time"], "%Y-%m-%dT%H:%M:%SZ") <= end
-    ]
-
-    # Prefetch odds per event once to avoid duplicate calls per team
-    ev_odds_map = {}
-    for e in window_events:
-        gid = e["id"]
-        try:
-            ev_odds_map[gid] = odds_client.get_event_player_odds(
-                gid, markets="spreads,totals", regions=region, mode=eff_mode
-            )
-        except Exception as exc:
-            print(f"[services] defenses: fetch odds failed game={gid} err={exc}")
-            ev_odds_map[gid] = None
+    window_events = ctx.index().between(start, end)
+
+    # Refresh only the stale game lines, then key on the snapshot: a hit
+    # doesn't read the odds back at all
+    game_markets = {e["id"]: ("spreads", "totals") for e in window_events}
+    _refresh_stale_odds(game_markets, ctx)
+    fingerprint = _digest(
+        (
+            store.snapshot_version(game_markets, region),
+            scoring_rules,
+            team_to_owner,
+            current_uid,
+        )
+    )
+    cached = None if fresh else _DEFENSE_CACHE.get(key, fingerprint)
+    if cached is not None:
+        print(f"[services] list_defenses cache hit key={key}")
+        return _with_ratelimit(cached)
 
+    # Read odds per event once to avoid duplicate calls per team
+    ev_odds_map = ctx.event_odds([fetch_engine.OddsJob(gid, m) for gid, m in game_markets.items()])
     out_rows: list[dict] = []
     for team, source in team_list:
         # Find events where this team plays
@@ -991,15 +1147,36 @@ def list_defenses(
 
     # Sort ascending by implied total (lower is better for defense)
     out_rows.sort(key=lambda r: (r["implied_total_median"], -r["book_count"]))
-    payload = {
-        "week": week,
-        "defenses": out_rows,
-        "ratelimit": ratelimit.format_status(),
-        "ratelimit_info": ratelimit.get_details(),
-    }
-    _def_cache[key] = (now, payload)
-    list_defenses._cache = _def_cache
-    return payload
+    payload = {"week": week, "defenses": out_rows}
+    _DEFENSE_CACHE.put(key, fingerprint, payload)
+    return _with_ratelimit(payload)
+
+
+def _prefetch_dashboard_odds(ctx: RequestContext, week_keys: list[str]) -> None:
+    """Refresh every stale market the dashboard's views will key on, in one batch.
+
+    That's each requested week's planned player markets plus spreads/totals
+    for the defense rows. Only the stale ones are fetched: the views check
+    their cached payloads against the snapshot first and read the full odds
+    only on a miss, so unchanged odds aren't read at all. Failures are left
+    for the views themselves to report.
+    """
+    try:
+        windows = ctx.windows()
+        if windows is None:
+            return
+        plan = ctx.plan()
+    except Exception as e:
+        print(f"[services] dashboard prefetch skipped: {e}")
+        return
+    markets_by_game: dict[str, set[str]] = {}
+    for w in week_keys:
+        for gid, g in plan.get(w, {}).items():
+            markets_by_game.setdefault(gid, set()).update(g.markets)
+        start, end = windows[0] if w == "this" else windows[1]
+        for e in ctx.index().between(start, end):
+            markets_by_game.setdefault(e["id"], set()).update(("spreads", "totals"))
+    _refresh_stale_odds(markets_by_game, ctx)
 
 
 def build_dashboard(
@@ -1032,59 +1209,42 @@ def build_dashboard(
         f"[services] build_dashboard user={username} season={season} fresh={fresh} weeks={weeks} def_scope={def_scope} inc_players={include_players}"
     )
 
-    # Projections scoped by weeks
-    proj_this = None
-    proj_next = None
-    if weeks in ("this", "both"):
-        proj_this = compute_projections(
-            username=username,
-            season=season,
-            week="this",
-            region=region,
-            fresh=fresh,
-            cache_mode=("fresh" if fresh else cache_mode),
-            model=model,
-            league_id=league_id,
-            roster_id=roster_id,
-        )
-    if weeks in ("next", "both"):
-        proj_next = compute_projections(
+    eff_mode = "fresh" if fresh else cache_mode
+    ctx = RequestContext(username, season, region, eff_mode, league_id, roster_id)
+    week_keys = [w for w in ("this", "next") if weeks in (w, "both")]
+    _prefetch_dashboard_odds(ctx, week_keys)
+
+    # Projections and defenses scoped by weeks; all of them read from ctx
+    proj = {"this": None, "next": None}
+    defs = {"this": None, "next": None}
+    for w in week_keys:
+        proj[w] = compute_projections(
             username=username,
             season=season,
-            week="next",
+            week=w,
             region=region,
             fresh=fresh,
-            cache_mode=("fresh" if fresh else cache_mode),
+            cache_mode=eff_mode,
             model=model,
             league_id=league_id,
             roster_id=roster_id,
+            ctx=ctx,
         )
-
-    # Defenses scoped by weeks and scope parameter
-    defs_this = None
-    defs_next = None
-    if weeks in ("this", "both"):
-        defs_this = list_defenses(
+    for w in week_keys:
+        defs[w] = list_defenses(
             username=username,
             season=season,
-            week="this",
+            week=w,
             scope=def_scope,
             fresh=fresh,
-            cache_mode=("fresh" if fresh else cache_mode),
-            league_id=league_id,
-            roster_id=roster_id,
-        )
-    if weeks in ("next", "both"):
-        defs_next = list_defenses(
-            username=username,
-            season=season,
-            week="next",
-            scope=def_scope,
-            fresh=fresh,
-            cache_mode=("fresh" if fresh else cache_mode),
+            cache_mode=eff_mode,
+            region=region,
             league_id=league_id,
             roster_id=roster_id,
+            ctx=ctx,
         )
+    proj_this, proj_next = proj["this"], proj["next"]
+    defs_this, defs_next = defs["this"], defs["next"]
 
     def _owned(defs_payload: dict | None) -> list[dict]:
         rows = (defs_payload or {}).get("defenses", []) or []
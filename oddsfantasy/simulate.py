@@ -0,0 +1,250 @@
+"""Monte Carlo fantasy points: sample every stat, score every draw.
+
+Floor/mid/ceiling in range_model score each stat's 15/50/85% quantile and
+add them up, but the floor of a sum isn't the sum of the floors, and the
+yardage bonuses are step functions of the draw, not of the quantile. This
+module follows step 6 of docs/fantasy-projection-methodology.md instead:
+draw N samples from every fitted market distribution (distributions.py),
+apply the league's scoring -- bonus thresholds included -- to each draw,
+and read percentiles off the resulting fantasy-points distribution.
+
+Stats are drawn independently (the methodology's open question on
+cross-stat correlation; the market doesn't quote it). Sampling is seeded
+per player, so a player's percentiles don't depend on who else is in the
+batch, and the draws are inverse-transform over uniforms: one vectorized
+pass per distribution family across the whole slate. NumPy is optional --
+without it `available()` is False and callers skip the simulation.
+"""
+
+from __future__ import annotations
+
+import os
+import zlib
+from functools import lru_cache
+
+from .config import STAT_MARKET_MAPPING_SLEEPER
+from .distributions import (
+    AnchoredStat,
+    BernoulliStat,
+    LogNormalStat,
+    NormalStat,
+    PoissonStat,
+    StatDistribution,
+)
+from .quantile_batch import inv_cdf
+
+try:
+    import numpy as np
+except ImportError:  # optional; see available()
+    np = None
+
+SIM_DRAWS = int(os.getenv("SIM_DRAWS", "2000"))
+SIM_SEED = int(os.getenv("SIM_SEED", "0"))
+
+# Fantasy-point percentiles reported per player
+FP_PERCENTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+
+# Yardage step bonuses, highest level first; only the highest level reached
+# is awarded, as in range_model._fantasy_points.
+YARDAGE_BONUSES = {
+    "player_pass_yds": ((400.0, "bonus_pass_yd_400"), (300.0, "bonus_pass_yd_300")),
+    "player_rush_yds": ((200.0, "bonus_rush_yd_200"), (100.0, "bonus_rush_yd_100")),
+    "player_reception_yds": ((200.0, "bonus_rec_yd_200"), (100.0, "bonus_rec_yd_100")),
+}
+
+# PCHIP segments are tabulated at this many points for vectorized inversion
+_PCHIP_STEPS = 32
+# Cap on lognormal log-draws: a near-degenerate single-line fit can have a
+# huge sigma, and an overflowed draw would surface as Infinity in the JSON
+_MAX_LOG = 700.0
+# Inverse-normal table resolution; interpolating it is far cheaper per draw
+# than evaluating AS241 and well inside the sampling noise (see _std_normal)
+_NORMAL_TABLE_SIZE = 1 << 14
+
+
+def available() -> bool:
+    return np is not None
+
+
+@lru_cache(maxsize=4096)
+def _anchor_table(dist: AnchoredStat) -> tuple:
+    """(F, x) table to invert the interpolated part of an anchored CDF with
+    np.interp. Linear anchors are their own table; PCHIP curves are
+    evaluated densely along each segment. Cached per (memoized) fit."""
+    xs = np.asarray(dist.xs, dtype=float)
+    ys = np.asarray(dist.cdf_y, dtype=float)
+    if dist._pchip is None or len(xs) < 2:
+        return ys, xs
+    m = np.asarray(dist._pchip.slopes, dtype=float)
+    h = np.diff(xs)
+    h = np.where(h != 0, h, 1.0)[:, None]
+    t = np.linspace(0.0, 1.0, _PCHIP_STEPS, endpoint=False)
+    t2 = t * t
+    t3 = t2 * t
+    f = (
+        (2 * t3 - 3 * t2 + 1) * ys[:-1, None]
+        + (t3 - 2 * t2 + t) * h * m[:-1, None]
+        + (-2 * t3 + 3 * t2) * ys[1:, None]
+        + (t3 - t2) * h * m[1:, None]
+    )
+    x = xs[:-1, None] + t * h
+    f = np.maximum.accumulate(np.append(f.ravel(), ys[-1]))
+    return f, np.append(x.ravel(), xs[-1])
+
+
+@lru_cache(maxsize=1)
+def _normal_table() -> tuple:
+    u = np.linspace(0.0, 1.0, _NORMAL_TABLE_SIZE + 1)
+    return u, inv_cdf(np.clip(u, 1e-9, 1 - 1e-9))
+
+
+def _std_normal(u):
+    """Standard normal inverse CDF of uniforms, interpolated in the table;
+    the grid is even, so the cell is an index rather than a search."""
+    _, z = _normal_table()
+    pos = u * _NORMAL_TABLE_SIZE
+    cell = np.minimum(pos.astype(np.intp), _NORMAL_TABLE_SIZE - 1)
+    lo = z[cell]
+    out = lo + (pos - cell) * (z[cell + 1] - lo)
+    # The outermost cells span the far tails; evaluate those draws exactly
+    edge = (cell == 0) | (cell == _NORMAL_TABLE_SIZE - 1)
+    if edge.any():
+        out[edge] = inv_cdf(np.clip(u[edge], 1e-9, 1 - 1e-9))
+    return out
+
+
+def _poisson_draws(lams, u):
+    """Smallest k with P(X <= k) >= u, as prob_models.poisson_quantile, for
+    a row of uniforms per lambda.
+
+    Each row's CDF table is shifted by twice its row number, so the stacked
+    tables stay sorted and one searchsorted serves every row.
+    """
+    lams = np.asarray(lams, dtype=float)
+    rows = np.arange(len(lams))[:, None]
+    top = float(lams.max(initial=0.0))
+    size = int(top + 12.0 * top**0.5 + 20.0) + 1
+    steps = np.empty((len(lams), size))
+    steps[:, 0] = np.exp(-lams)
+    steps[:, 1:] = lams[:, None] / np.arange(1, size)
+    cdf = np.cumsum(np.cumprod(steps, axis=1), axis=1)
+    target = np.clip(u, 1e-6, 1 - 1e-9) + 2.0 * rows
+    k = np.searchsorted((cdf + 2.0 * rows).ravel(), target.ravel(), side="left")
+    return np.minimum(k.reshape(u.shape) - size * rows, size - 1).astype(float)
+
+
+def _draws(dist: StatDistribution, u):
+    """dist.ppf over an array of uniforms, for one row (or tail) at a time."""
+    if isinstance(dist, PoissonStat):
+        return _poisson_draws([dist.lam], u[None])[0]
+    if isinstance(dist, AnchoredStat):
+        f, x = _anchor_table(dist)
+        out = np.interp(u, f, x)
+        if dist.tails:
+            lower = (dist.cdf_y[0] - 1e-9 > u) if dist.lower_tail is not None else None
+            upper = (dist.cdf_y[-1] + 1e-9 < u) if dist.upper_tail is not None else None
+            if lower is not None and lower.any():
+                out[lower] = _draws(dist.lower_tail, u[lower])
+            if upper is not None and upper.any():
+                out[upper] = _draws(dist.upper_tail, u[upper])
+        return out
+    if isinstance(dist, LogNormalStat):
+        return np.exp(np.minimum(dist.mu + dist.sigma * _std_normal(u), _MAX_LOG))
+    return np.array([dist.ppf(q) for q in u.tolist()])
+
+
+def _scoring_row(
+    key: str, scoring_rules: dict[str, float]
+) -> tuple[float, float, float, float, float]:
+    """(points per unit, high threshold, high bonus, low threshold, low bonus)
+    for one market; absent bonus levels get an infinite threshold."""
+    mult = 0.0
+    rule = STAT_MARKET_MAPPING_SLEEPER.get(key)
+    if rule in scoring_rules:
+        try:
+            mult = float(scoring_rules[rule])
+        except Exception:
+            mult = 0.0
+        # Interceptions subtract points, regardless of league sign convention
+        if key == "player_pass_interceptions":
+            mult = -abs(mult)
+    levels = []
+    for thr, bonus_key in YARDAGE_BONUSES.get(key, ()):
+        try:
+            value = float(scoring_rules[bonus_key]) or 0.0
+        except Exception:
+            continue
+        levels.append((thr, value))
+    levels += [(float("inf"), 0.0)] * (2 - len(levels))
+    (hi_thr, hi_val), (lo_thr, lo_val) = levels
+    return mult, hi_thr, hi_val, lo_thr, lo_val
+
+
+def fantasy_point_percentiles(
+    fits: dict[str, dict[str, StatDistribution]],
+    scoring_rules: dict[str, float],
+    qs: tuple[float, ...] = FP_PERCENTILES,
+    draws: int = SIM_DRAWS,
+    seed: int = SIM_SEED,
+) -> dict[str, list[float]]:
+    """Fantasy-point percentiles `qs` per player from simulated stat lines.
+
+    `fits` maps a player id to its fitted market distributions (see
+    range_model.fit_player_markets). Players without markets score 0.
+    """
+    pids = list(fits)
+    rows: list[tuple[str, StatDistribution]] = []
+    uniforms = []
+    starts = []
+    for pid in pids:
+        markets = sorted(fits[pid].items())
+        starts.append(len(rows))
+        rows.extend(markets)
+        rng = np.random.default_rng([seed, zlib.crc32(str(pid).encode())])
+        uniforms.append(rng.random((len(markets), draws)))
+    if not rows:
+        return {pid: [0.0] * len(qs) for pid in pids}
+    u = np.concatenate(uniforms)
+
+    # One vectorized draw per parametric family across the slate; anchored
+    # fits carry their own tables and go row by row.
+    samples = np.empty_like(u)
+    families: dict[type, list[int]] = {}
+    for i, (_, dist) in enumerate(rows):
+        families.setdefault(type(dist), []).append(i)
+    for family, idx in families.items():
+        if family is NormalStat:
+            mean = np.array([[rows[i][1].mean] for i in idx])
+            sigma = np.array([[rows[i][1].sigma] for i in idx])
+            clip = np.array([[rows[i][1].nonneg] for i in idx])
+            x = mean + sigma * _std_normal(u[idx])
+            samples[idx] = np.where(clip, np.maximum(x, 0.0), x)
+        elif family is LogNormalStat:
+            mu = np.array([[rows[i][1].mu] for i in idx])
+            sigma = np.array([[rows[i][1].sigma] for i in idx])
+            samples[idx] = np.exp(np.minimum(mu + sigma * _std_normal(u[idx]), _MAX_LOG))
+        elif family is BernoulliStat:
+            p = np.array([[rows[i][1].p] for i in idx])
+            samples[idx] = u[idx] > 1 - p
+        elif family is PoissonStat:
+            samples[idx] = _poisson_draws([rows[i][1].lam for i in idx], u[idx])
+        else:
+            for i in idx:
+                samples[i] = _draws(rows[i][1], u[i])
+
+    # Score every draw: linear points plus the highest bonus level reached
+    score = np.array([_scoring_row(key, scoring_rules) for key, _ in rows])
+    bonus_rows = np.flatnonzero(np.isfinite(score[:, 3]) | np.isfinite(score[:, 1]))
+    hi_thr, hi_val, lo_thr, lo_val = (score[bonus_rows, j : j + 1] for j in range(1, 5))
+    yards = samples[bonus_rows]
+    bonus = np.where(yards >= hi_thr, hi_val, np.where(yards >= lo_thr, lo_val, 0.0))
+    points = samples
+    points *= score[:, :1]
+    points[bonus_rows] += bonus
+    # Sum each player's markets; players without any keep a zero total
+    ends = [*starts[1:], len(rows)]
+    scored = [j for j in range(len(pids)) if starts[j] < ends[j]]
+    totals = np.zeros((len(pids), draws))
+    totals[scored] = np.add.reduceat(points, [starts[j] for j in scored])
+    pct = np.percentile(totals, [q * 100 for q in qs], axis=1).T
+    return {pid: pct[j].tolist() for j, pid in enumerate(pids)}
@@ -1,21 +1,159 @@
+import contextlib
 import json
 import os
+import threading
 import time
+from contextvars import ContextVar
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from . import names
 from .config import DATA_DIR, SLEEPER_TO_ODDSAPI_TEAM
+from .player_index import PlayerIndex
 
 SLEEPER_BASE_URL = "https://api.sleeper.app/v1"
 # Allow overriding request timeouts via env; default (connect=5s, read=20s)
 _conn_to = float(os.getenv("SLEEPER_CONNECT_TIMEOUT", "5") or 5)
 _read_to = float(os.getenv("SLEEPER_READ_TIMEOUT", "20") or 20)
 REQ_TIMEOUT = (_conn_to, _read_to)  # (connect, read) seconds
-_PLAYERS_CACHE = None
-_PLAYERS_CACHE_FILE = os.path.join(DATA_DIR, "sleeper_players.json")
+SLEEPER_MAX_RETRIES = int(os.getenv("SLEEPER_MAX_RETRIES", "3"))
+
+# One pooled keep-alive session for every Sleeper call (a single /lineup
+# resolves league, rosters and users several times over). Rate limiting
+# (429) and server errors are retried with exponential backoff, honouring
+# Retry-After; anything else surfaces to the caller as before.
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept": "application/json"})
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=SLEEPER_MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+# Seconds each Sleeper resource is reused before it's refetched, per endpoint.
+# League settings and member lists barely change in-season; rosters change
+# with every waiver claim or trade. Endpoints not listed here aren't cached.
+_LEAGUE_TTL = int(os.getenv("SLEEPER_LEAGUE_TTL", "3600"))
+SLEEPER_TTLS = {
+    "user": int(os.getenv("SLEEPER_USER_TTL", "86400")),
+    "user_leagues": _LEAGUE_TTL,
+    "league": _LEAGUE_TTL,
+    "league_users": _LEAGUE_TTL,
+    "league_rosters": int(os.getenv("SLEEPER_ROSTERS_TTL", "60")),
+}
+# path -> (fetched_at, etag, data)
+_CACHE: dict[str, tuple[float, str | None, object]] = {}
+_CACHE_LOCK = threading.Lock()
+_REQUEST_MEMO: ContextVar[dict | None] = ContextVar("sleeper_request_memo", default=None)
+
+# Per-endpoint latency: endpoint -> {"calls", "errors", "total_ms", "max_ms"}
+_METRICS: dict[str, dict[str, float]] = {}
+_METRICS_LOCK = threading.Lock()
+_PLAYER_INDEX: PlayerIndex | None = None
+_PLAYER_INDEX_FILE = os.path.join(DATA_DIR, "sleeper_player_index.json")
 _PLAYERS_TTL = int(os.getenv("SLEEPER_PLAYERS_TTL", "86400"))  # 24h
 
 
+def _request(endpoint: str, path: str, etag: str | None = None) -> requests.Response:
+    """GET {SLEEPER_BASE_URL}{path} on the shared session, timing it under
+    `endpoint` (a route name, not the URL, so ids don't fan out the metrics)."""
+    t0 = time.perf_counter()
+    ok = False
+    try:
+        headers = {"If-None-Match": etag} if etag else None
+        response = _SESSION.get(f"{SLEEPER_BASE_URL}{path}", timeout=REQ_TIMEOUT, headers=headers)
+        response.raise_for_status()
+        ok = True
+        return response
+    finally:
+        dt_ms = (time.perf_counter() - t0) * 1000.0
+        with _METRICS_LOCK:
+            m = _METRICS.setdefault(
+                endpoint, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            m["calls"] += 1
+            m["errors"] += 0 if ok else 1
+            m["total_ms"] += dt_ms
+            m["max_ms"] = max(m["max_ms"], dt_ms)
+
+
+@contextlib.contextmanager
+def request_scope():
+    """Within this block (one API request), each Sleeper resource is fetched
+    at most once, however many times services asks for it."""
+    token = _REQUEST_MEMO.set({})
+    try:
+        yield
+    finally:
+        _REQUEST_MEMO.reset(token)
+
+
+def _get_json(endpoint: str, path: str):
+    """Sleeper JSON for `path`, through the request memo and the TTL cache.
+
+    An expired entry is refreshed conditionally (If-None-Match) when Sleeper
+    gave us an ETag for it, and kept -- stale -- if the refresh fails, so a
+    Sleeper blip doesn't blank a league we already know.
+    """
+    ttl = SLEEPER_TTLS.get(endpoint)
+    if ttl is None:
+        return _request(endpoint, path).json()
+    memo = _REQUEST_MEMO.get()
+    if memo is not None and path in memo:
+        return memo[path]
+    now = time.time()
+    with _CACHE_LOCK:
+        entry = _CACHE.get(path)
+    if entry is not None and now - entry[0] < ttl:
+        data = entry[2]
+    else:
+        etag = entry[1] if entry else None
+        try:
+            response = _request(endpoint, path, etag)
+        except requests.RequestException as e:
+            if entry is None:
+                raise
+            print(f"[sleeper] {endpoint} refresh failed, serving cached: {e}")
+            data = entry[2]
+        else:
+            if response.status_code == 304 and entry is not None:
+                data = entry[2]
+            else:
+                data = response.json()
+                new_etag = response.headers.get("ETag")
+                etag = new_etag if isinstance(new_etag, str) else None
+            with _CACHE_LOCK:
+                _CACHE[path] = (now, etag, data)
+    if memo is not None:
+        memo[path] = data
+    return data
+
+
+def get_latency_metrics() -> dict[str, dict]:
+    """endpoint -> {calls, errors, avg_ms, max_ms} since process start."""
+    with _METRICS_LOCK:
+        return {
+            ep: {
+                "calls": int(m["calls"]),
+                "errors": int(m["errors"]),
+                "avg_ms": round(m["total_ms"] / m["calls"], 1) if m["calls"] else 0.0,
+                "max_ms": round(m["max_ms"], 1),
+            }
+            for ep, m in sorted(_METRICS.items())
+        }
+
+
 def get_player_enhanced_info(player_id):
     """
     Given a Sleeper player ID and the players metadata dict, return a dict with:
@@ -23,15 +161,12 @@ def get_player_enhanced_info(player_id):
         - team: NFL team (abbreviation or full name as available)
         - position: Player's position
     """
-    players_metadata = get_players()
-    pdata = players_metadata.get(player_id, {})
+    player = get_player_index().get(player_id)
     # TODO: Convert sleeper format to format which fits odds api here
     return {
-        "editorial_team_full_name": SLEEPER_TO_ODDSAPI_TEAM.get(
-            pdata.get("team")
-        ),  # or map to full team name if needed
-        "primary_position": pdata.get("position"),
-        "name": {"full": pdata.get("full_name", player_id)},
+        "editorial_team_full_name": SLEEPER_TO_ODDSAPI_TEAM.get(player.team) if player else None,
+        "primary_position": player.position if player else None,
+        "name": {"full": (player.full_name if player else None) or player_id},
         # add more fields if needed
     }
 
@@ -70,40 +205,28 @@ def get_user_id(username):
     """
     Fetch the Sleeper user ID for a given username.
     """
-    url = f"{SLEEPER_BASE_URL}/user/{username}"
-    response = requests.get(url, timeout=REQ_TIMEOUT)
-    response.raise_for_status()
-    return response.json()["user_id"]
+    return _get_json("user", f"/user/{username}")["user_id"]
 
 
 def get_user_leagues(user_id, season):
     """
     Fetch all leagues for a user in a given season.
     """
-    url = f"{SLEEPER_BASE_URL}/user/{user_id}/leagues/nfl/{season}"
-    response = requests.get(url, timeout=REQ_TIMEOUT)
-    response.raise_for_status()
-    return response.json()
+    return _get_json("user_leagues", f"/user/{user_id}/leagues/nfl/{season}")
 
 
 def get_league_rosters(league_id):
     """
     Fetch all rosters for a given league.
     """
-    url = f"{SLEEPER_BASE_URL}/league/{league_id}/rosters"
-    response = requests.get(url, timeout=REQ_TIMEOUT)
-    response.raise_for_status()
-    return response.json()
+    return _get_json("league_rosters", f"/league/{league_id}/rosters")
 
 
 def get_league_users(league_id):
     """
     Fetch all user profiles for a given league to map owner_id -> display_name/username.
     """
-    url = f"{SLEEPER_BASE_URL}/league/{league_id}/users"
-    response = requests.get(url, timeout=REQ_TIMEOUT)
-    response.raise_for_status()
-    return response.json()
+    return _get_json("league_users", f"/league/{league_id}/users")
 
 
 def get_league_id_for_user(username, season):
@@ -124,10 +247,7 @@ def get_league(league_id):
     `scoring_settings`/`season` (a league_id is season-specific in Sleeper,
     so there's no separate "season" input required once you have one).
     """
-    url = f"{SLEEPER_BASE_URL}/league/{league_id}"
-    response = requests.get(url, timeout=REQ_TIMEOUT)
-    response.raise_for_status()
-    return response.json()
+    return _get_json("league", f"/league/{league_id}")
 
 
 def get_league_teams(league_id):
@@ -196,46 +316,45 @@ def get_league_roster_data(league_id, roster_id=None):
     }
 
 
-def get_players(fresh: bool = False):
-    """Fetch all NFL player metadata from Sleeper with simple disk cache.
+def get_player_index(fresh: bool = False) -> PlayerIndex:
+    """Sleeper's NFL player database as a compact PlayerIndex, cached in
+    memory and on disk for SLEEPER_PLAYERS_TTL.
 
-    Set env SLEEPER_FRESH=1 or pass fresh=True to bypass cache.
+    Pass fresh=True to bypass the cache.
     """
-    global _PLAYERS_CACHE
-    if _PLAYERS_CACHE is not None and not fresh:
-        return _PLAYERS_CACHE
+    global _PLAYER_INDEX
+    if _PLAYER_INDEX is not None and not fresh:
+        return _PLAYER_INDEX
     # Try disk cache
     try:
-        if (not fresh) and os.path.exists(_PLAYERS_CACHE_FILE):
-            mtime = os.path.getmtime(_PLAYERS_CACHE_FILE)
+        if (not fresh) and os.path.exists(_PLAYER_INDEX_FILE):
+            mtime = os.path.getmtime(_PLAYER_INDEX_FILE)
             if (time.time() - mtime) < _PLAYERS_TTL:
-                with open(_PLAYERS_CACHE_FILE) as f:
-                    _PLAYERS_CACHE = json.load(f)
-                    return _PLAYERS_CACHE
+                with open(_PLAYER_INDEX_FILE) as f:
+                    index = PlayerIndex.from_json(json.load(f))
+                if index is not None:
+                    _PLAYER_INDEX = index
+                    names.use_player_index(index)
+                    return index
     except Exception:
         pass
-    # Fetch from network
-    url = f"{SLEEPER_BASE_URL}/players/nfl"
-    response = requests.get(url, timeout=REQ_TIMEOUT)
-    response.raise_for_status()
-    data = response.json()
-    _PLAYERS_CACHE = data
+    # Fetch from network; the full dump is dropped as soon as it's indexed
+    index = PlayerIndex.from_sleeper(_request("players", "/players/nfl").json())
+    _PLAYER_INDEX = index
+    names.use_player_index(index)
     # Save to disk best-effort
     try:
         os.makedirs(DATA_DIR, exist_ok=True)
-        with open(_PLAYERS_CACHE_FILE, "w") as f:
-            json.dump(data, f)
+        with open(_PLAYER_INDEX_FILE, "w") as f:
+            json.dump(index.to_json(), f, separators=(",", ":"))
     except Exception:
         pass
-    return data
+    return index
 
 
 def get_available_defenses(username, season):
-    # 1. Get all player metadata
-    all_players = get_players()
-    all_defenses = {
-        pid: pdata for pid, pdata in all_players.items() if pdata.get("position") == "DEF"
-    }
+    # 1. Every team defense
+    all_defenses = {p.player_id: p for p in get_player_index().by_position("DEF")}
 
     # 2. Get all rosters in the league
     user_id = get_user_id(username)
@@ -0,0 +1,489 @@
+"""SQLite-backed snapshot store for Odds API responses.
+
+Replaces the per-URL JSON cache: responses are normalized into events,
+bookmakers, markets and outcomes rows so they can be looked up by event,
+market, bookmaker and fetch time, and rebuilt into the exact response shape
+the rest of the app already consumes.
+
+The database runs in WAL mode, so any number of readers (threads in the WSGI
+server, or other containers mounting the same data volume) proceed without
+blocking while one writer commits. Each thread gets its own connection;
+writes within this process are additionally serialized by a lock so they
+queue here instead of spinning on SQLite's busy handler.
+
+It also holds materialized projections (see services.compute_projections):
+computed payloads keyed by the odds snapshot version they were computed
+from, so a request between two fetches is a single row lookup.
+
+Set ODDS_STORE_READONLY=1 to open the store read-only -- e.g. a test
+container pointed (via ODDS_STORE_PATH) at production's snapshots. Reads work
+as normal; anything fetched from the network is returned but not persisted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from .config import DATA_DIR
+
+STORE_PATH = os.getenv("ODDS_STORE_PATH") or os.path.join(DATA_DIR, "odds_store.sqlite3")
+READ_ONLY = os.getenv("ODDS_STORE_READONLY") in ("1", "true", "True")
+# Materialized projections older than this are pruned on write; by then the
+# odds they were computed from have long been superseded.
+PROJECTION_RETENTION = 7 * 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    sport_key TEXT,
+    sport_title TEXT,
+    commence_time TEXT,
+    home_team TEXT,
+    away_team TEXT,
+    fetched_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_commence ON events (commence_time);
+
+-- Which events the last /events call for a region listed, so the cached list
+-- is exactly that snapshot rather than every event ever seen.
+CREATE TABLE IF NOT EXISTS event_listings (
+    regions TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    PRIMARY KEY (regions, event_id)
+);
+
+-- Fetch time of the last /events call per region.
+CREATE TABLE IF NOT EXISTS fetches (
+    request_key TEXT PRIMARY KEY,
+    event_id TEXT,
+    regions TEXT NOT NULL,
+    markets TEXT,
+    fetched_at INTEGER NOT NULL
+);
+
+-- Freshness is tracked per (event, region, market) rather than per request
+-- URL, so a request naming one extra market only has to fetch that market.
+-- A row here means "we asked for this market", even if no book offered it --
+-- otherwise an unposted market would be refetched on every request.
+CREATE TABLE IF NOT EXISTS market_fetches (
+    event_id TEXT NOT NULL,
+    regions TEXT NOT NULL,
+    market_key TEXT NOT NULL,
+    fetched_at INTEGER NOT NULL,
+    PRIMARY KEY (event_id, regions, market_key)
+);
+CREATE INDEX IF NOT EXISTS idx_market_fetches_fetched ON market_fetches (fetched_at);
+
+CREATE TABLE IF NOT EXISTS bookmakers (
+    event_id TEXT NOT NULL,
+    regions TEXT NOT NULL,
+    bookmaker TEXT NOT NULL,
+    title TEXT,
+    last_update TEXT,
+    fetched_at INTEGER NOT NULL,
+    PRIMARY KEY (event_id, regions, bookmaker)
+);
+CREATE INDEX IF NOT EXISTS idx_bookmakers_book ON bookmakers (bookmaker);
+
+CREATE TABLE IF NOT EXISTS markets (
+    event_id TEXT NOT NULL,
+    regions TEXT NOT NULL,
+    bookmaker TEXT NOT NULL,
+    market_key TEXT NOT NULL,
+    last_update TEXT,
+    fetched_at INTEGER NOT NULL,
+    PRIMARY KEY (event_id, regions, bookmaker, market_key)
+);
+CREATE INDEX IF NOT EXISTS idx_markets_key ON markets (market_key, event_id);
+CREATE INDEX IF NOT EXISTS idx_markets_fetched ON markets (fetched_at);
+
+CREATE TABLE IF NOT EXISTS outcomes (
+    event_id TEXT NOT NULL,
+    regions TEXT NOT NULL,
+    bookmaker TEXT NOT NULL,
+    market_key TEXT NOT NULL,
+    name TEXT,
+    description TEXT,
+    price REAL,
+    point REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outcomes_event_market ON outcomes (event_id, regions, market_key);
+CREATE INDEX IF NOT EXISTS idx_outcomes_book ON outcomes (bookmaker);
+
+CREATE TABLE IF NOT EXISTS projections (
+    projection_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_projections_created ON projections (created_at);
+"""
+
+_LOCAL = threading.local()
+_WRITE_LOCK = threading.Lock()
+
+
+def _log(msg: str) -> None:
+    print(f"[store] {msg}", flush=True)
+
+
+def _conn() -> sqlite3.Connection:
+    """This thread's connection, (re)opened if STORE_PATH changed."""
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is not None and _LOCAL.path == STORE_PATH:
+        return conn
+    if conn is not None:
+        conn.close()
+    if READ_ONLY:
+        conn = sqlite3.connect(f"file:{STORE_PATH}?mode=ro", uri=True, timeout=10)
+    else:
+        os.makedirs(os.path.dirname(STORE_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(STORE_PATH, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+    _LOCAL.conn = conn
+    _LOCAL.path = STORE_PATH
+    return conn
+
+
+def _events_key(regions: str) -> str:
+    return f"events|{regions}"
+
+
+def _event_header(row: tuple) -> dict[str, Any]:
+    event_id, sport_key, sport_title, commence_time, home_team, away_team = row
+    return {
+        "id": event_id,
+        "sport_key": sport_key,
+        "sport_title": sport_title,
+        "commence_time": commence_time,
+        "home_team": home_team,
+        "away_team": away_team,
+    }
+
+
+def _upsert_event(conn: sqlite3.Connection, ev: dict, fetched_at: int) -> None:
+    conn.execute(
+        "INSERT INTO events (event_id, sport_key, sport_title, commence_time, home_team,"
+        " away_team, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT(event_id) DO UPDATE SET sport_key=excluded.sport_key,"
+        " sport_title=excluded.sport_title, commence_time=excluded.commence_time,"
+        " home_team=excluded.home_team, away_team=excluded.away_team,"
+        " fetched_at=excluded.fetched_at",
+        (
+            ev.get("id"),
+            ev.get("sport_key"),
+            ev.get("sport_title"),
+            ev.get("commence_time"),
+            ev.get("home_team"),
+            ev.get("away_team"),
+            fetched_at,
+        ),
+    )
+
+
+def get_events(regions: str) -> tuple[int, list[dict]] | None:
+    """(fetched_at, events) from the last /events snapshot for `regions`, or None."""
+    try:
+        conn = _conn()
+        row = conn.execute(
+            "SELECT fetched_at FROM fetches WHERE request_key = ?", (_events_key(regions),)
+        ).fetchone()
+        if row is None:
+            return None
+        rows = conn.execute(
+            "SELECT e.event_id, e.sport_key, e.sport_title, e.commence_time, e.home_team,"
+            " e.away_team FROM event_listings l JOIN events e ON e.event_id = l.event_id"
+            " WHERE l.regions = ? ORDER BY e.commence_time, e.event_id",
+            (regions,),
+        ).fetchall()
+    except sqlite3.Error:
+        return None
+    return int(row[0]), [_event_header(r) for r in rows]
+
+
+def put_events(regions: str, events: list[dict], fetched_at: int | None = None) -> None:
+    """Store an /events snapshot. Best-effort, like put_event_odds."""
+    if READ_ONLY:
+        return
+    fetched_at = int(fetched_at if fetched_at is not None else time.time())
+    try:
+        with _WRITE_LOCK:
+            conn = _conn()
+            with conn:
+                for ev in events or []:
+                    if isinstance(ev, dict) and ev.get("id"):
+                        _upsert_event(conn, ev, fetched_at)
+                conn.execute("DELETE FROM event_listings WHERE regions = ?", (regions,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO event_listings (regions, event_id) VALUES (?, ?)",
+                    [
+                        (regions, ev["id"])
+                        for ev in events or []
+                        if isinstance(ev, dict) and ev.get("id")
+                    ],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO fetches (request_key, event_id, regions, markets,"
+                    " fetched_at) VALUES (?, NULL, ?, NULL, ?)",
+                    (_events_key(regions), regions, fetched_at),
+                )
+    except sqlite3.Error as e:
+        _log(f"events regions={regions}: write failed, not persisted: {e}")
+
+
+def market_fetch_times(event_id: str, regions: str, market_keys: list[str]) -> dict[str, int]:
+    """market_key -> fetched_at for whichever of `market_keys` have been fetched."""
+    if not market_keys:
+        return {}
+    marks = ",".join("?" * len(market_keys))
+    try:
+        rows = (
+            _conn()
+            .execute(
+                "SELECT market_key, fetched_at FROM market_fetches WHERE event_id = ?"
+                f" AND regions = ? AND market_key IN ({marks})",
+                (event_id, regions, *market_keys),
+            )
+            .fetchall()
+        )
+    except sqlite3.Error:
+        return {}
+    return {k: int(ts) for k, ts in rows}
+
+
+def get_event_odds(event_id: str, regions: str, market_keys: list[str]) -> dict:
+    """Stored lines for `market_keys`, rebuilt in the Odds API's event-odds shape.
+
+    Callers check market_fetch_times() first to decide what counts as a hit.
+    """
+    try:
+        conn = _conn()
+        # One read transaction across the market and outcome queries, so a
+        # put_event_odds committing in between can't mix two snapshots
+        conn.execute("BEGIN")
+        try:
+            return _read_event_odds(conn, event_id, regions, market_keys)
+        finally:
+            conn.commit()
+    except sqlite3.Error:
+        return {"id": event_id, "bookmakers": []}
+
+
+def _read_event_odds(
+    conn: sqlite3.Connection, event_id: str, regions: str, market_keys: list[str]
+) -> dict:
+    head = conn.execute(
+        "SELECT event_id, sport_key, sport_title, commence_time, home_team, away_team"
+        " FROM events WHERE event_id = ?",
+        (event_id,),
+    ).fetchone()
+    out = _event_header(head) if head else {"id": event_id}
+    marks = ",".join("?" * len(market_keys))
+    market_filter = f" AND m.market_key IN ({marks})" if market_keys else ""
+    rows = conn.execute(
+        "SELECT b.bookmaker, b.title, b.last_update, m.market_key, m.last_update"
+        " FROM markets m JOIN bookmakers b ON b.event_id = m.event_id"
+        " AND b.regions = m.regions AND b.bookmaker = m.bookmaker"
+        " WHERE m.event_id = ? AND m.regions = ?" + market_filter + " ORDER BY b.rowid, m.rowid",
+        (event_id, regions, *market_keys),
+    ).fetchall()
+    books: dict[str, dict] = {}
+    by_market: dict[tuple[str, str], list] = {}
+    for book_key, title, book_update, market_key, market_update in rows:
+        book = books.get(book_key)
+        if book is None:
+            book = books[book_key] = {
+                "key": book_key,
+                "title": title,
+                "last_update": book_update,
+                "markets": [],
+            }
+        outcomes: list[dict] = []
+        book["markets"].append(
+            {"key": market_key, "last_update": market_update, "outcomes": outcomes}
+        )
+        by_market[(book_key, market_key)] = outcomes
+    outcome_filter = f" AND market_key IN ({marks})" if market_keys else ""
+    for book_key, market_key, name, desc, price, point in conn.execute(
+        "SELECT bookmaker, market_key, name, description, price, point FROM outcomes"
+        " WHERE event_id = ? AND regions = ?" + outcome_filter + " ORDER BY rowid",
+        (event_id, regions, *market_keys),
+    ):
+        outcomes = by_market.get((book_key, market_key))
+        if outcomes is None:
+            continue
+        # Omit absent fields rather than emitting nulls: downstream code relies
+        # on outcome.get("point", 0) defaulting when a line has no point.
+        o: dict[str, Any] = {"name": name}
+        if desc is not None:
+            o["description"] = desc
+        if price is not None:
+            o["price"] = price
+        if point is not None:
+            o["point"] = point
+        outcomes.append(o)
+    out["bookmakers"] = list(books.values())
+    return out
+
+
+def put_event_odds(
+    event_id: str, regions: str, market_keys: list[str], data: dict, fetched_at: int | None = None
+) -> None:
+    """Normalize one event-odds response into rows, replacing any previously
+    stored lines for the same (event, region, market).
+
+    Best-effort: the response has already cost quota by the time it's
+    stored, so a write error (e.g. a shared store still locked after the
+    busy timeout) is logged and the caller keeps the data it fetched.
+    """
+    if READ_ONLY or not isinstance(data, dict):
+        return
+    fetched_at = int(fetched_at if fetched_at is not None else time.time())
+    market_keys = list(market_keys)
+    # Markets the response carries but the request didn't name (shouldn't
+    # happen, but the API is the authority on what it returned).
+    for book in data.get("bookmakers") or []:
+        for m in book.get("markets") or []:
+            if m.get("key") and m["key"] not in market_keys:
+                market_keys.append(m["key"])
+    try:
+        with _WRITE_LOCK:
+            conn = _conn()
+            with conn:
+                if data.get("id"):
+                    _upsert_event(conn, data, fetched_at)
+                if market_keys:
+                    marks = ",".join("?" * len(market_keys))
+                    for table in ("outcomes", "markets"):
+                        conn.execute(
+                            f"DELETE FROM {table} WHERE event_id = ? AND regions = ?"
+                            f" AND market_key IN ({marks})",
+                            (event_id, regions, *market_keys),
+                        )
+                market_rows = []
+                outcome_rows = []
+                for book in data.get("bookmakers") or []:
+                    book_key = book.get("key")
+                    if not book_key:
+                        continue
+                    conn.execute(
+                        "INSERT OR REPLACE INTO bookmakers (event_id, regions, bookmaker, title,"
+                        " last_update, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            event_id,
+                            regions,
+                            book_key,
+                            book.get("title"),
+                            book.get("last_update"),
+                            fetched_at,
+                        ),
+                    )
+                    for m in book.get("markets") or []:
+                        market_key = m.get("key")
+                        if not market_key:
+                            continue
+                        market_rows.append(
+                            (
+                                event_id,
+                                regions,
+                                book_key,
+                                market_key,
+                                m.get("last_update"),
+                                fetched_at,
+                            )
+                        )
+                        outcome_rows.extend(
+                            (
+                                event_id,
+                                regions,
+                                book_key,
+                                market_key,
+                                o.get("name"),
+                                o.get("description"),
+                                o.get("price"),
+                                o.get("point"),
+                            )
+                            for o in m.get("outcomes") or []
+                        )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO markets (event_id, regions, bookmaker, market_key,"
+                    " last_update, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    market_rows,
+                )
+                conn.executemany(
+                    "INSERT INTO outcomes (event_id, regions, bookmaker, market_key, name,"
+                    " description, price, point) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    outcome_rows,
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO market_fetches (event_id, regions, market_key,"
+                    " fetched_at) VALUES (?, ?, ?, ?)",
+                    [(event_id, regions, k, fetched_at) for k in market_keys],
+                )
+    except sqlite3.Error as e:
+        _log(f"event={event_id}: write failed, not persisted: {e}")
+
+
+def snapshot_version(event_markets: dict[str, list[str]], regions: str) -> str:
+    """Opaque version of the stored odds behind `event_markets` (event_id ->
+    market keys). Changes whenever any of those markets is refetched."""
+    rows: list[tuple] = []
+    try:
+        conn = _conn()
+        for event_id in sorted(event_markets):
+            keys = sorted(set(event_markets[event_id]))
+            if not keys:
+                continue
+            marks = ",".join("?" * len(keys))
+            rows.extend(
+                conn.execute(
+                    "SELECT event_id, market_key, fetched_at FROM market_fetches"
+                    f" WHERE event_id = ? AND regions = ? AND market_key IN ({marks})"
+                    " ORDER BY market_key",
+                    (event_id, regions, *keys),
+                ).fetchall()
+            )
+    except sqlite3.Error:
+        return ""
+    return hashlib.sha1(repr((regions, rows)).encode()).hexdigest()
+
+
+def get_projection(projection_key: str) -> dict | None:
+    try:
+        row = (
+            _conn()
+            .execute("SELECT payload FROM projections WHERE projection_key = ?", (projection_key,))
+            .fetchone()
+        )
+    except sqlite3.Error:
+        return None
+    return json.loads(row[0]) if row else None
+
+
+def put_projection(projection_key: str, payload: dict) -> None:
+    """Materialize a computed projection. Best-effort: on a write error the
+    request still returns what it computed; the next one recomputes."""
+    if READ_ONLY:
+        return
+    now = int(time.time())
+    try:
+        with _WRITE_LOCK:
+            conn = _conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO projections (projection_key, payload, created_at)"
+                    " VALUES (?, ?, ?)",
+                    (projection_key, json.dumps(payload), now),
+                )
+                conn.execute(
+                    "DELETE FROM projections WHERE created_at < ?", (now - PROJECTION_RETENTION,)
+                )
+    except sqlite3.Error as e:
+        _log(f"projection: write failed, not persisted: {e}")
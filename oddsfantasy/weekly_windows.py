@@ -1,5 +1,7 @@
 import datetime as _dt
 
+from .event_index import EventIndex, as_index
+
 
 def _next_weekday(base: _dt.datetime, weekday: int) -> _dt.datetime:
     """Return the next occurrence of weekday (Mon=0..Sun=6) at 00:00, based on UTC.
@@ -44,23 +46,8 @@ def compute_week_windows(
     return (this_thu, this_mon_end), (next_thu2, next_mon_end)
 
 
-def in_window(ts_iso_utc: str, window: tuple[_dt.datetime, _dt.datetime]) -> bool:
-    """Check if an ISO timestamp (with trailing Z) falls inside [start,end] inclusive.
-
-    TheOddsAPI returns e.g. '2025-09-07T17:00:00Z'.
-    """
-    start, end = window
-    try:
-        dt = _dt.datetime.strptime(ts_iso_utc, "%Y-%m-%dT%H:%M:%SZ")
-    except Exception:
-        # Best effort parse for variants (strip Z or microseconds)
-        ts = ts_iso_utc.rstrip("Z")
-        dt = _dt.datetime.fromisoformat(ts)
-    return start <= dt <= end
-
-
 def earliest_future_week_start(
-    events: list[dict], now_utc: _dt.datetime | None = None
+    events: list[dict] | EventIndex, now_utc: _dt.datetime | None = None
 ) -> _dt.datetime | None:
     """Thursday anchoring the earliest not-yet-started game in `events`, or
     None if there are no games left to play (e.g. schedule/odds not posted
@@ -69,24 +56,14 @@ def earliest_future_week_start(
     of the soonest real game," just for different reasons.
     """
     now_utc = now_utc or _dt.datetime.utcnow()
-    future_starts: list[_dt.datetime] = []
-    for e in events:
-        ts = e.get("commence_time")
-        if not ts:
-            continue
-        try:
-            d = _dt.datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ")
-        except Exception:
-            continue
-        if d > now_utc:
-            future_starts.append(d)
-    if not future_starts:
+    first = as_index(events).first_after(now_utc)
+    if first is None:
         return None
-    return _prev_weekday(min(future_starts), 3)
+    return _prev_weekday(first, 3)
 
 
 def resolve_week_windows(
-    events: list[dict], now_utc: _dt.datetime | None = None
+    events: list[dict] | EventIndex, now_utc: _dt.datetime | None = None
 ) -> tuple[tuple[_dt.datetime, _dt.datetime], tuple[_dt.datetime, _dt.datetime]] | None:
     """Like compute_week_windows, but falls forward to the schedule when
     today's calendar-anchored "this" window has no real games in it.
@@ -104,11 +81,12 @@ def resolve_week_windows(
     to fall forward to.
     """
     now_utc = now_utc or _dt.datetime.utcnow()
+    index = as_index(events)
     calendar_this, calendar_next = compute_week_windows(now_utc)
-    if any(e.get("commence_time") and in_window(e["commence_time"], calendar_this) for e in events):
+    if index.between(*calendar_this):
         return calendar_this, calendar_next
 
-    week1_start = earliest_future_week_start(events, now_utc)
+    week1_start = earliest_future_week_start(index, now_utc)
     if week1_start is None:
         return None
     this_end = week1_start + _dt.timedelta(days=4, hours=23, minutes=59, seconds=59)
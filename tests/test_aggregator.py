@@ -0,0 +1,105 @@
+import unittest
+from types import SimpleNamespace
+
+from oddsfantasy import aggregator
+
+
+def _event(*books):
+    return [{"bookmakers": [{"key": key, "markets": markets} for key, markets in books]}]
+
+
+def _outcome(name, desc, price, point):
+    return {"name": name, "description": desc, "price": price, "point": point}
+
+
+class AggregateEventTest(unittest.TestCase):
+    def test_books_are_devigged_then_medianed(self):
+        event = _event(
+            (
+                "a",
+                [
+                    {
+                        "key": "player_receptions",
+                        "outcomes": [
+                            _outcome("Over", "Amon-Ra St. Brown", 1.8, 6.5),
+                            _outcome("Under", "Amon-Ra St. Brown", 2.2, 6.5),
+                        ],
+                    }
+                ],
+            ),
+            (
+                "b",
+                [
+                    {
+                        "key": "player_receptions",
+                        "outcomes": [_outcome("Over", "AMON RA ST BROWN", 2.0, 7.5)],
+                    }
+                ],
+            ),
+        )
+        odds, summaries = aggregator.aggregate_players_from_event(event, {"Amon-Ra St. Brown"})
+        self.assertEqual(set(odds["Amon-Ra St. Brown"]), {"a", "b"})
+        self.assertIsNone(odds["Amon-Ra St. Brown"]["b"]["player_receptions"]["under"])
+        summ = summaries["Amon-Ra St. Brown"]["player_receptions"]
+        # book a de-vigs to 0.55/0.45; book b is one-sided at 1/2.0
+        self.assertAlmostEqual(summ.avg_over_prob, (0.55 + 0.5) / 2)
+        self.assertAlmostEqual(summ.avg_under_prob, 0.45 / 2)
+        self.assertEqual(summ.avg_threshold, 7.0)
+        self.assertEqual(summ.samples, 2)
+
+    def test_alternates_keep_every_line_and_skip_summaries(self):
+        event = _event(
+            (
+                "a",
+                [
+                    {
+                        "key": "player_rush_yds_alternate",
+                        "outcomes": [
+                            _outcome("Over", "Kenneth Walker III", 1.5, 49.5),
+                            _outcome("Over", "Kenneth Walker III", 2.5, 69.5),
+                            _outcome("Over", "Someone Else", 1.9, 20.5),
+                        ],
+                    }
+                ],
+            ),
+        )
+        odds, summaries = aggregator.aggregate_players_from_event(event, {"Kenneth Walker"})
+        alts = odds["Kenneth Walker"]["a"]["player_rush_yds_alternate"]["alts"]
+        self.assertEqual([o["point"] for o in alts["over"]], [49.5, 69.5])
+        self.assertEqual(alts["under"], [])
+        self.assertEqual(summaries, {})
+
+
+class AggregateWeekTest(unittest.TestCase):
+    def test_games_merge_by_sample_size(self):
+        def game(price):
+            return _event(
+                (
+                    "a",
+                    [
+                        {
+                            "key": "player_anytime_td",
+                            "outcomes": [_outcome("Yes", "Joe Example", price, None)],
+                        },
+                        {
+                            "key": "player_rush_yds_alternate",
+                            "outcomes": [_outcome("Over", "Joe Example", 2.0, 59.5)],
+                        },
+                    ],
+                )
+            )
+
+        plan = SimpleNamespace(players=[{"alias": "Joe Example"}])
+        odds, summaries = aggregator.aggregate_by_week(
+            {"g1": game(2.0), "g2": game(4.0)}, {"g1": plan, "g2": plan}
+        )
+        summ = summaries["Joe Example"]["player_anytime_td"]
+        self.assertAlmostEqual(summ.avg_over_prob, (0.5 + 0.25) / 2)
+        self.assertEqual(summ.samples, 2)
+        # week-level alternates also carry the main-line keys
+        alt = odds["Joe Example"]["a"]["player_rush_yds_alternate"]
+        self.assertEqual(set(alt), {"over", "under", "alts"})
+
+
+if __name__ == "__main__":
+    unittest.main()
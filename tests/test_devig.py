@@ -0,0 +1,87 @@
+import importlib
+import math
+import os
+import random
+import unittest
+from unittest.mock import patch
+
+from oddsfantasy import devig
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _shin_by_bisection(over, under):
+    # Shin's model solved for z numerically, as in the general n-outcome case
+    pis = (1 / over, 1 / under)
+    total = sum(pis)
+
+    def probs(z):
+        return [(math.sqrt(z * z + 4 * (1 - z) * p * p / total) - z) / (2 * (1 - z)) for p in pis]
+
+    lo, hi = 0.0, 0.999
+    for _ in range(200):
+        mid = (lo + hi) / 2
+        lo, hi = (mid, hi) if sum(probs(mid)) > 1 else (lo, mid)
+    return probs(lo)
+
+
+class DevigTest(unittest.TestCase):
+    def test_methods_sum_to_one(self):
+        for method in devig.METHODS:
+            p_over, p_under = devig.devig([1.8, 1.2, 3.5], [2.0, 4.0, 1.25], method)
+            for po, pu in zip(p_over, p_under, strict=True):
+                self.assertAlmostEqual(po + pu, 1.0, places=9)
+        p_over, _ = devig.devig([1.8], [2.0], "proportional")
+        self.assertAlmostEqual(p_over[0], (1 / 1.8) / (1 / 1.8 + 1 / 2.0))
+
+    def test_shin_matches_the_solved_model(self):
+        for over, under in ((1.8, 2.0), (1.2, 4.0), (1.05, 8.0), (3.5, 1.25)):
+            p_over, _ = devig.devig([over], [under], "shin")
+            self.assertAlmostEqual(p_over[0], _shin_by_bisection(over, under)[0], places=9)
+
+    def test_power_shades_the_longshot(self):
+        # Power de-vig takes more of the margin from the longshot side
+        p_over, _ = devig.devig([1.2], [4.0], "power")
+        proportional, _ = devig.devig([1.2], [4.0], "proportional")
+        self.assertGreater(p_over[0], proportional[0])
+        self.assertLess(p_over[0], 1 / 1.2)
+
+    def test_one_sided_and_unpriced(self):
+        p_over, p_under = devig.devig([2.0, None, 0, "x"], [None, 4.0, None, None])
+        self.assertEqual(p_over[0], 0.5)
+        self.assertTrue(math.isnan(p_under[0]))
+        self.assertTrue(math.isnan(p_over[1]))
+        self.assertEqual(p_under[1], 0.25)
+        self.assertTrue(all(math.isnan(p) for p in p_over[2:] + p_under[2:]))
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            devig.devig([2.0], [2.0], "additive")
+
+    def test_misconfigured_default_fails_at_import(self):
+        self.addCleanup(importlib.reload, devig)
+        with patch.dict(os.environ, {"DEVIG_METHOD": "shinn"}), self.assertRaises(ValueError):
+            importlib.reload(devig)
+
+    @unittest.skipUnless(np is not None, "numpy not installed")
+    def test_numpy_matches_pure_python(self):
+        rng = random.Random(3)
+        over = [rng.choice((None, round(rng.uniform(1.05, 8.0), 2))) for _ in range(500)]
+        under = [rng.choice((None, round(rng.uniform(1.05, 8.0), 2))) for _ in range(500)]
+        for method in devig.METHODS:
+            batch = devig.devig(over, under, method)
+            with patch.object(devig, "np", None):
+                scalar = devig.devig(over, under, method)
+            for got, want in zip(batch, scalar, strict=True):
+                for g, w in zip(got, want, strict=True):
+                    if math.isnan(w):
+                        self.assertTrue(math.isnan(g))
+                    else:
+                        self.assertAlmostEqual(g, w, places=9)
+
+
+if __name__ == "__main__":
+    unittest.main()
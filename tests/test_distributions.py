@@ -0,0 +1,126 @@
+import random
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from oddsfantasy import distributions, prob_models, range_model
+from oddsfantasy.distributions import AnchoredStat, NormalStat, PoissonStat, StatDistribution
+
+
+def _alt_odds(key, points):
+    """One book quoting an alternate ladder: (point, P(over)) pairs at fair odds."""
+    return {
+        "book": {
+            key + "_alternate": {
+                "alts": {
+                    "over": [{"point": x, "odds": 1 / p} for x, p in points],
+                    "under": [{"point": x, "odds": 1 / (1 - p)} for x, p in points],
+                }
+            }
+        }
+    }
+
+
+YARDS_LADDER = ((39.5, 0.85), (49.5, 0.7), (59.5, 0.5), (69.5, 0.32), (79.5, 0.2))
+RECEPTIONS_LADDER = ((2.5, 0.8), (3.5, 0.62), (4.5, 0.45), (5.5, 0.3))
+
+
+class StatDistributionTest(unittest.TestCase):
+    def test_poisson_pmf_sums_to_cdf(self):
+        dist = PoissonStat(4.2)
+        self.assertAlmostEqual(sum(dist.pmf(k) for k in range(7)), dist.cdf(6.0), places=12)
+        self.assertEqual(dist.ppf(dist.cdf(4.0) - 1e-9), 4.0)
+        self.assertEqual(dist.ppf(dist.cdf(4.0) + 1e-9), 5.0)
+
+    def test_incomplete_subclass_fails_at_construction(self):
+        class NoDescribe(StatDistribution):
+            def cdf(self, x):
+                return 0.5
+
+            def ppf(self, q):
+                return 0.0
+
+        with self.assertRaises(TypeError):
+            NoDescribe()
+
+    def test_continuous_distributions_have_no_pmf(self):
+        with self.assertRaises(ValueError):
+            NormalStat(50.0, 10.0).pmf(50)
+
+    def test_seeded_samples_repeat(self):
+        dist = NormalStat(50.0, 10.0, nonneg=True)
+        a = dist.sample(50, random.Random(3))
+        self.assertEqual(a, dist.sample(50, random.Random(3)))
+        self.assertTrue(all(x >= 0 for x in a))
+
+    def test_poisson_draws_share_one_cdf_table(self):
+        prob_models.poisson_quantile_breaks.cache_clear()
+        dist = PoissonStat(4.3)
+        draws = dist.sample(500, random.Random(7))
+        dist.curve()
+        # Only the standard quantiles get a breaks table; draws bisect one CDF
+        tables = prob_models.poisson_quantile_breaks.cache_info().currsize
+        self.assertLessEqual(tables, len(prob_models.STANDARD_QUANTILES))
+        rng = random.Random(7)
+        self.assertEqual(draws, [dist.ppf(rng.random()) for _ in range(500)])
+        with patch.object(distributions, "np", None):
+            self.assertEqual(draws, dist.sample(500, random.Random(7)))
+
+    def test_curve_is_a_nondecreasing_cdf(self):
+        curve = distributions.fit_angelini(
+            _alt_odds("player_rush_yds", YARDS_LADDER), "player_rush_yds"
+        ).curve()
+        xs, fs = zip(*curve, strict=True)
+        self.assertEqual(list(xs), sorted(xs))
+        self.assertEqual(list(fs), sorted(fs))
+
+    def test_band_reproduces_the_twenty_percent_fallback(self):
+        self.assertEqual(distributions.band(50.0).floor_mid_ceiling(), (40.0, 50.0, 60.0))
+
+
+class AngeliniTailsTest(unittest.TestCase):
+    def test_tails_only_apply_beyond_the_anchor_span(self):
+        dist = distributions.fit_angelini(
+            _alt_odds("player_receptions", RECEPTIONS_LADDER), "player_receptions"
+        )
+        self.assertIsInstance(dist, AnchoredStat)
+        self.assertEqual(dist.tails, "poisson")
+        plain = AnchoredStat(dist.xs, dist.cdf_y)
+        self.assertEqual(dist.ppf(0.5), plain.ppf(0.5))
+        # F at the last anchor is 0.7, so the 85th percentile comes from the tail
+        self.assertEqual(dist.ppf(0.85), dist.upper_tail.ppf(0.85))
+        self.assertGreater(dist.ppf(0.85), plain.ppf(0.85))
+
+    def test_too_few_anchors_falls_back_to_puelz(self):
+        odds = _alt_odds("player_rush_yds", YARDS_LADDER[:3])
+        dist = distributions.fit_angelini(odds, "player_rush_yds")
+        self.assertIs(dist, distributions.fit_puelz(odds, "player_rush_yds"))
+
+
+class FitReuseTest(unittest.TestCase):
+    def test_fits_are_shared_between_ranges_and_details(self):
+        # one main line per book, as the aggregator emits them
+        odds = {
+            f"book{i}": {
+                "player_rush_yds": {
+                    "over": {"point": x, "odds": 1 / p},
+                    "under": {"point": x, "odds": 1 / (1 - p)},
+                }
+            }
+            for i, (x, p) in enumerate(YARDS_LADDER)
+        }
+        summary = SimpleNamespace(avg_threshold=59.5, avg_over_prob=0.5, avg_under_prob=0.5)
+        fitted = range_model.fit_player_markets(odds, {"player_rush_yds": summary}, model="puelz")
+        self.assertIs(fitted["player_rush_yds"], distributions.fit_puelz(odds, "player_rush_yds"))
+
+    def test_single_line_fit_is_memoized(self):
+        row = ("player_receptions", 4.6, 4.5, 0.52, 0.48)
+        self.assertIs(range_model.fit_single_line(*row), range_model.fit_single_line(*row))
+        self.assertEqual(
+            range_model._market_quantiles(*row),
+            range_model.fit_single_line(*row).floor_mid_ceiling(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ import unittest
 from unittest.mock import patch
 
 from oddsfantasy import draft_prep
+from oddsfantasy.player_index import PlayerIndex
 from oddsfantasy.weekly_windows import earliest_future_week_start
 
 FAKE_SLEEPER_PLAYERS = {
@@ -24,9 +25,9 @@ FAKE_SLEEPER_PLAYERS = {
 
 
 class ActivePlayersByTeamTest(unittest.TestCase):
-    @patch("oddsfantasy.draft_prep.sleeper_api.get_players")
+    @patch("oddsfantasy.draft_prep.sleeper_api.get_player_index")
     def test_filters_to_skill_positions_with_a_mapped_team(self, mock_get_players):
-        mock_get_players.return_value = FAKE_SLEEPER_PLAYERS
+        mock_get_players.return_value = PlayerIndex.from_sleeper(FAKE_SLEEPER_PLAYERS)
         by_team = draft_prep._all_active_players_by_team()
 
         self.assertIn("Buffalo Bills", by_team)
@@ -81,9 +82,9 @@ class ResolveDraftWeekWindowTest(unittest.TestCase):
 
 class PlanWeekForDraftTest(unittest.TestCase):
     @patch("oddsfantasy.draft_prep.odds_client.get_nfl_events")
-    @patch("oddsfantasy.draft_prep.sleeper_api.get_players")
+    @patch("oddsfantasy.draft_prep.sleeper_api.get_player_index")
     def test_builds_plan_for_week1_and_week2_separately(self, mock_get_players, mock_get_events):
-        mock_get_players.return_value = FAKE_SLEEPER_PLAYERS
+        mock_get_players.return_value = PlayerIndex.from_sleeper(FAKE_SLEEPER_PLAYERS)
         now = dt.datetime.utcnow()
         # Anchor the fixture to the Thu-Mon slate the planner will actually
         # resolve, rather than to a bare "now + N days" offset. A fixed offset
@@ -0,0 +1,53 @@
+import datetime as dt
+import unittest
+
+from oddsfantasy import event_index
+from oddsfantasy.event_index import EventIndex, as_index
+
+
+def _ev(eid, ts, home="Buffalo Bills", away="Miami Dolphins"):
+    return {"id": eid, "commence_time": ts, "home_team": home, "away_team": away}
+
+
+EVENTS = [
+    _ev("late", "2026-09-14T00:20:00Z", "Kansas City Chiefs", "Denver Broncos"),
+    _ev("early", "2026-09-10T00:20:00Z"),
+    _ev("bad", "not a time"),
+    _ev("sun", "2026-09-13T17:00:00.000Z", "New York Jets", "Buffalo Bills"),
+]
+
+
+class EventIndexTest(unittest.TestCase):
+    def test_window_queries_are_inclusive_and_in_kickoff_order(self):
+        index = EventIndex(EVENTS)
+        ids = [
+            e["id"]
+            for e in index.between(dt.datetime(2026, 9, 10, 0, 20), dt.datetime(2026, 9, 14))
+        ]
+        self.assertEqual(ids, ["early", "sun"])
+        self.assertEqual(len(index), 3)  # unparseable kickoff dropped
+
+    def test_team_lookup_covers_home_and_away(self):
+        index = EventIndex(EVENTS)
+        self.assertEqual([e["id"] for e in index.for_team("Buffalo Bills")], ["early", "sun"])
+        window = (dt.datetime(2026, 9, 12), dt.datetime(2026, 9, 15))
+        self.assertEqual([e["id"] for e in index.for_team("Buffalo Bills", window)], ["sun"])
+        self.assertEqual(index.for_team("Chicago Bears"), [])
+
+    def test_first_after_and_kickoff(self):
+        index = EventIndex(EVENTS)
+        self.assertEqual(
+            index.first_after(dt.datetime(2026, 9, 10, 0, 20)), dt.datetime(2026, 9, 13, 17)
+        )
+        self.assertIsNone(index.first_after(dt.datetime(2026, 9, 20)))
+        self.assertEqual(index.kickoff("late"), dt.datetime(2026, 9, 14, 0, 20))
+
+    def test_as_index_reuses_the_index_for_an_unchanged_list(self):
+        self.addCleanup(setattr, event_index, "_LAST", None)
+        first = as_index(EVENTS)
+        self.assertIs(as_index([dict(e) for e in EVENTS]), first)
+        self.assertIsNot(as_index(EVENTS[:2]), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
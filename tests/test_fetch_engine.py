@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import patch
+
+from test_odds_client import EVENT_ODDS, StoreTestCase, _fake_response
+
+from oddsfantasy import fetch_engine
+from oddsfantasy.fetch_engine import OddsJob
+
+
+class FetchEngineTest(StoreTestCase):
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_batch_merges_jobs_per_event_and_skips_failures(self, mock_get):
+        def get(url, timeout=None):
+            if "/bad/" in url:
+                raise RuntimeError("boom")
+            return _fake_response(EVENT_ODDS)
+
+        mock_get.side_effect = get
+        out = fetch_engine.fetch_event_odds(
+            [
+                OddsJob("e1", ("player_rush_yds",)),
+                OddsJob("e1", ("player_anytime_td",)),
+                OddsJob("bad", ("player_rush_yds",)),
+            ]
+        )
+        self.assertEqual(set(out), {"e1"})
+        e1_urls = [c[0][0] for c in mock_get.call_args_list if "/e1/" in c[0][0]]
+        self.assertEqual(len(e1_urls), 1)
+        self.assertTrue(e1_urls[0].endswith("markets=player_anytime_td,player_rush_yds"))
+
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_jobs_over_quota_budget_are_served_from_cache(self, mock_get):
+        mock_get.return_value = _fake_response(EVENT_ODDS)
+        out = fetch_engine.fetch_event_odds(
+            [
+                OddsJob("e1", ("player_anytime_td", "player_rush_yds")),
+                OddsJob("e2", ("player_anytime_td", "player_rush_yds")),
+            ],
+            budget=3,
+        )
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(out["e2"], {})
+
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_shared_budget_spans_batches(self, mock_get):
+        mock_get.return_value = _fake_response(EVENT_ODDS)
+        budget = fetch_engine.QuotaBudget(3)
+        fetch_engine.fetch_event_odds([OddsJob("e1", ("player_rush_yds",))], budget=budget)
+        out = fetch_engine.fetch_event_odds(
+            [OddsJob("e2", ("player_anytime_td", "player_rush_yds", "player_receptions"))],
+            budget=budget,
+        )
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(out["e2"], {})
+        self.assertEqual(budget.spent, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from oddsfantasy.lru import FingerprintLRU
+
+
+class FingerprintLRUTest(unittest.TestCase):
+    def test_changed_fingerprint_is_a_miss_and_drops_the_entry(self):
+        cache = FingerprintLRU(max_entries=4, max_bytes=10_000)
+        cache.put("k", "fp1", {"players": [1]})
+        self.assertEqual(cache.get("k", "fp1"), {"players": [1]})
+        self.assertIsNone(cache.get("k", "fp2"))
+        self.assertEqual(len(cache), 0)
+
+    def test_evicts_least_recently_used_past_entry_limit(self):
+        cache = FingerprintLRU(max_entries=2, max_bytes=10_000)
+        cache.put("a", "fp", 1)
+        cache.put("b", "fp", 2)
+        cache.get("a", "fp")
+        cache.put("c", "fp", 3)
+        self.assertIsNone(cache.get("b", "fp"))
+        self.assertEqual(cache.get("a", "fp"), 1)
+
+    def test_evicts_past_byte_limit_and_skips_oversized_payloads(self):
+        cache = FingerprintLRU(max_entries=10, max_bytes=20)
+        cache.put("a", "fp", "x" * 10)
+        cache.put("b", "fp", "y" * 10)
+        self.assertIsNone(cache.get("a", "fp"))
+        self.assertLessEqual(cache.nbytes, 20)
+        cache.put("huge", "fp", "z" * 100)
+        self.assertIsNone(cache.get("huge", "fp"))
+        self.assertEqual(cache.get("b", "fp"), "y" * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""compute_projections serves a stored projection until the odds or scoring
+behind it change, instead of re-running the aggregate -> range pipeline."""
+
+import datetime as dt
+import sqlite3
+import unittest
+from unittest.mock import patch
+
+from test_odds_client import EVENT_ODDS, StoreTestCase
+
+from oddsfantasy import services, store
+from oddsfantasy.planner import PlannedGame
+
+WINDOW = (dt.datetime(2026, 9, 10), dt.datetime(2026, 9, 15))
+MARKETS = ["player_anytime_td", "player_rush_yds"]
+ROSTER = {
+    "players": {
+        "4866": {
+            "name": {"full": "James Cook"},
+            "primary_position": "RB",
+            "editorial_team_full_name": "Buffalo Bills",
+        }
+    },
+    "scoring_rules": {"rec": 1.0},
+}
+
+
+def _plan(*_args, **_kwargs):
+    game = PlannedGame(
+        game_id="e1",
+        home_team="Buffalo Bills",
+        away_team="Kansas City Chiefs",
+        commence_time="2026-09-13T17:00:00Z",
+        players=[
+            {
+                "full_name": "James Cook",
+                "alias": "jamescook",
+                "primary_position": "RB",
+                "editorial_team_full_name": "Buffalo Bills",
+            }
+        ],
+        markets=list(MARKETS),
+    )
+    return {"this": {"e1": game}, "next": {}}
+
+
+@patch("oddsfantasy.services.fetch_engine.fetch_event_odds", return_value={})
+@patch("oddsfantasy.services._fetch_odds", return_value={"this": {"e1": EVENT_ODDS}})
+@patch("oddsfantasy.services.plan_relevant_games_and_markets", side_effect=_plan)
+@patch("oddsfantasy.services.resolve_week_windows", return_value=(WINDOW, WINDOW))
+@patch("oddsfantasy.services.odds_client.get_nfl_events", return_value=[])
+class MaterializedProjectionTest(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(services._PROJECTION_CACHE.clear)
+        store.put_event_odds("e1", "us", MARKETS, EVENT_ODDS, fetched_at=1000)
+
+    def _project(self, roster=ROSTER):
+        services._PROJECTION_CACHE.clear()  # exercise the store, not the in-process cache
+        with (
+            patch("oddsfantasy.services._resolve_identity", return_value=roster),
+            patch(
+                "oddsfantasy.services.aggregate_by_week", wraps=services.aggregate_by_week
+            ) as agg,
+        ):
+            result = services.compute_projections("wesnicol", "2026", week="this")
+        return result, agg.call_count
+
+    def test_unchanged_snapshot_is_a_lookup(self, _ev, _win, _plan, fetch_odds, _fetch):
+        first, computed = self._project()
+        fetch_odds.reset_mock()
+        second, recomputed = self._project()
+        self.assertEqual((computed, recomputed), (1, 0))
+        fetch_odds.assert_not_called()  # a hit doesn't read the odds back
+        self.assertEqual(first["players"], second["players"])
+        self.assertIn("ratelimit", second)
+
+    def test_only_stale_markets_are_fetched_before_the_lookup(self, *mocks):
+        fetch = mocks[-1]
+        store.put_event_odds("e1", "us", ["player_rush_yds"], {"id": "e1"})  # fresh now
+        self._project()
+        jobs = fetch.call_args_list[0][0][0]
+        self.assertEqual([(j.event_id, j.markets) for j in jobs], [("e1", ("player_anytime_td",))])
+
+    def test_failed_write_still_returns_the_projection(self, *_mocks):
+        with patch.object(store, "_conn", side_effect=sqlite3.OperationalError("locked")):
+            result, computed = self._project()
+        self.assertEqual(computed, 1)
+        self.assertTrue(result["players"])
+
+    def test_refetched_odds_or_new_scoring_recompute(self, *_mocks):
+        self._project()
+        store.put_event_odds("e1", "us", MARKETS, EVENT_ODDS, fetched_at=2000)
+        self.assertEqual(self._project()[1], 1)
+        self.assertEqual(self._project({**ROSTER, "scoring_rules": {"rec": 0.5}})[1], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
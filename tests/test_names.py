@@ -0,0 +1,71 @@
+import unittest
+
+from oddsfantasy import names
+from oddsfantasy.player_index import PlayerIndex
+
+RAW = {
+    "1": {"full_name": "A.J. Brown", "position": "WR", "team": "PHI"},
+    "2": {"full_name": "Mike Williams", "position": "WR", "team": "NYJ"},
+    "3": {"full_name": "Mike Williams", "position": "WR", "team": "PIT"},
+    "4": {"full_name": "Josh Allen", "position": "QB", "team": "BUF"},
+    "5": {"full_name": "Josh Allen", "position": "LB", "team": "BUF"},
+}
+
+
+class NormalizeNameTest(unittest.TestCase):
+    def test_drops_punctuation_and_suffixes(self):
+        self.assertEqual(names.normalize_name("Amon-Ra St. Brown"), "amon ra st brown")
+        self.assertEqual(names.normalize_name("Marvin Harrison Jr."), "marvin harrison")
+
+    def test_name_key_joins_initials(self):
+        self.assertEqual(names.name_key("A.J. Brown"), names.name_key("AJ Brown"))
+
+
+class ResolveNameTest(unittest.TestCase):
+    def setUp(self):
+        self.index = PlayerIndex.from_sleeper(RAW)
+
+    def test_collisions_narrow_by_team_then_position(self):
+        self.assertIsNone(self.index.resolve_name("Mike Williams"))
+        self.assertEqual(self.index.resolve_name("Mike Williams", teams=("PIT",)).player_id, "3")
+        self.assertIsNone(self.index.resolve_name("Josh Allen", teams=("BUF",)))
+        self.assertEqual(
+            self.index.resolve_name("Josh Allen", teams=("BUF",), position="QB").player_id, "4"
+        )
+
+    def test_odds_spelling_finds_the_sleeper_player(self):
+        self.assertEqual(self.index.resolve_name("AJ Brown").player_id, "1")
+
+
+class NameResolverTest(unittest.TestCase):
+    def setUp(self):
+        names.use_player_index(PlayerIndex.from_sleeper(RAW))
+        self.addCleanup(names.use_player_index, None)
+
+    def test_tiers(self):
+        resolve = names.NameResolver(
+            {"Kenneth Walker": "kw"},
+            ids={"3": "mw"},
+            teams=("Pittsburgh Steelers", "Seattle Seahawks"),
+        )
+        self.assertEqual(resolve("Kenneth Walker"), "kw")
+        self.assertEqual(resolve("Kenneth Walker III"), "kw")
+        # only the player index knows this spelling; the Steelers' one is ours
+        self.assertEqual(resolve("Mike Williams"), "mw")
+        self.assertIsNone(resolve("A.J. Brown"))
+
+    def test_mismatches_are_counted(self):
+        before = names.get_match_stats(top=1000)
+        resolve = names.NameResolver({"Josh Allen"})
+        for _ in range(3):
+            self.assertIsNone(resolve("Jimmy Nobody"))
+        self.assertIsNone(resolve("AJ Brown"))
+        after = names.get_match_stats(top=1000)
+        # memoized: each distinct name counts once per resolver
+        self.assertEqual(after["unknown"] - before["unknown"], 1)
+        self.assertEqual(after["unplanned"] - before["unplanned"], 1)
+        self.assertIn("Jimmy Nobody", dict(after["top_unknown"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,279 @@
+import copy
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from oddsfantasy import odds_client, store
+
+
+def _fake_response(payload):
+    resp = MagicMock()
+    resp.json.return_value = payload
+    resp.raise_for_status.return_value = None
+    resp.headers = {}
+    return resp
+
+
+EVENT_ODDS = {
+    "id": "e1",
+    "sport_key": "americanfootball_nfl",
+    "sport_title": "NFL",
+    "commence_time": "2026-09-13T17:00:00Z",
+    "home_team": "Buffalo Bills",
+    "away_team": "Kansas City Chiefs",
+    "bookmakers": [
+        {
+            "key": "draftkings",
+            "title": "DraftKings",
+            "last_update": "2026-09-12T10:00:00Z",
+            "markets": [
+                {
+                    "key": "player_rush_yds",
+                    "last_update": "2026-09-12T10:00:00Z",
+                    "outcomes": [
+                        {"name": "Over", "description": "James Cook", "price": 1.87, "point": 64.5},
+                        {
+                            "name": "Under",
+                            "description": "James Cook",
+                            "price": 1.93,
+                            "point": 64.5,
+                        },
+                    ],
+                },
+                {
+                    "key": "player_anytime_td",
+                    "last_update": "2026-09-12T10:00:00Z",
+                    "outcomes": [{"name": "Yes", "description": "James Cook", "price": 2.1}],
+                },
+            ],
+        }
+    ],
+}
+
+
+class StoreTestCase(unittest.TestCase):
+    """Points the snapshot store at a throwaway database for each test."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        patcher = patch.object(store, "STORE_PATH", os.path.join(self._tmp.name, "odds.sqlite3"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class SnapshotStoreTest(StoreTestCase):
+    def test_event_odds_round_trip_through_rows(self):
+        markets = ["player_anytime_td", "player_rush_yds"]
+        store.put_event_odds("e1", "us", markets, EVENT_ODDS)
+        self.assertEqual(set(store.market_fetch_times("e1", "us", markets)), set(markets))
+        data = store.get_event_odds("e1", "us", markets)
+        self.assertEqual(data["home_team"], "Buffalo Bills")
+        book = data["bookmakers"][0]
+        self.assertEqual(book["key"], "draftkings")
+        by_key = {m["key"]: m for m in book["markets"]}
+        self.assertEqual(len(by_key["player_rush_yds"]["outcomes"]), 2)
+        # A line with no point must not come back as point=None
+        self.assertNotIn("point", by_key["player_anytime_td"]["outcomes"][0])
+
+    def test_read_sees_one_snapshot_despite_a_concurrent_write(self):
+        markets = ["player_rush_yds"]
+        store.put_event_odds("e1", "us", markets, EVENT_ODDS)
+        refreshed = copy.deepcopy(EVENT_ODDS)
+        rush = refreshed["bookmakers"][0]["markets"][0]
+        rush["outcomes"].append({"name": "Over", "description": "Josh Allen", "price": 1.9})
+        conn = store._conn()
+
+        class CommitBeforeOutcomes:
+            # Lands a refetch between the market query and the outcome query
+            def execute(self, sql, params=()):
+                if sql.startswith("SELECT bookmaker, market_key, name"):
+                    writer = threading.Thread(
+                        target=store.put_event_odds, args=("e1", "us", markets, refreshed)
+                    )
+                    writer.start()
+                    writer.join(5)
+                return conn.execute(sql, params)
+
+            def __getattr__(self, name):
+                return getattr(conn, name)
+
+        reader, real_conn = threading.current_thread(), store._conn
+
+        def conn_for_thread():
+            return CommitBeforeOutcomes() if threading.current_thread() is reader else real_conn()
+
+        with patch.object(store, "_conn", side_effect=conn_for_thread):
+            data = store.get_event_odds("e1", "us", markets)
+        self.assertEqual(len(data["bookmakers"][0]["markets"][0]["outcomes"]), 2)
+        rush_now = store.get_event_odds("e1", "us", markets)["bookmakers"][0]["markets"][0]
+        self.assertEqual(len(rush_now["outcomes"]), 3)
+
+    def test_unknown_request_is_a_miss(self):
+        self.assertEqual(store.market_fetch_times("e1", "us", ["player_rush_yds"]), {})
+        self.assertIsNone(store.get_events("us"))
+
+    def test_requested_market_no_book_offered_still_counts_as_fetched(self):
+        store.put_event_odds("e1", "us", ["player_pass_yds"], {"id": "e1", "bookmakers": []})
+        self.assertIn("player_pass_yds", store.market_fetch_times("e1", "us", ["player_pass_yds"]))
+
+    def test_events_list_is_the_last_snapshot_only(self):
+        store.put_events("us", [{"id": "a", "commence_time": "2026-09-13T17:00:00Z"}])
+        store.put_events("us", [{"id": "b", "commence_time": "2026-09-14T17:00:00Z"}])
+        _, events = store.get_events("us")
+        self.assertEqual([e["id"] for e in events], ["b"])
+
+
+class OddsClientCacheTest(StoreTestCase):
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_auto_mode_serves_fresh_snapshot_without_network(self, mock_get):
+        mock_get.return_value = _fake_response(EVENT_ODDS)
+        markets = "player_anytime_td,player_rush_yds"
+        odds_client.get_event_player_odds("e1", markets=markets, mode="fresh")
+        mock_get.reset_mock()
+        data = odds_client.get_event_player_odds("e1", markets=markets, mode="auto")
+        self.assertEqual(data["id"], "e1")
+        mock_get.assert_not_called()
+
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_only_missing_markets_are_requested_and_merged_with_cached(self, mock_get):
+        mock_get.return_value = _fake_response(EVENT_ODDS)
+        odds_client.get_event_player_odds(
+            "e1", markets="player_anytime_td,player_rush_yds", mode="fresh"
+        )
+        receptions = {
+            "id": "e1",
+            "bookmakers": [
+                {
+                    "key": "draftkings",
+                    "markets": [
+                        {
+                            "key": "player_receptions",
+                            "outcomes": [
+                                {
+                                    "name": "Over",
+                                    "description": "James Cook",
+                                    "price": 1.9,
+                                    "point": 2.5,
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ],
+        }
+        mock_get.return_value = _fake_response(receptions)
+        data = odds_client.get_event_player_odds(
+            "e1", markets="player_anytime_td,player_receptions,player_rush_yds", mode="auto"
+        )
+        requested_url = mock_get.call_args[0][0]
+        self.assertTrue(requested_url.endswith("markets=player_receptions"))
+        keys = {m["key"] for m in data["bookmakers"][0]["markets"]}
+        self.assertEqual(keys, {"player_anytime_td", "player_receptions", "player_rush_yds"})
+
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_cache_mode_miss_returns_empty_without_network(self, mock_get):
+        self.assertEqual(odds_client.get_event_player_odds("nope", mode="cache"), {})
+        self.assertEqual(odds_client.get_nfl_events(mode="cache"), [])
+        mock_get.assert_not_called()
+
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_failed_store_write_still_returns_network_data(self, mock_get):
+        mock_get.return_value = _fake_response(EVENT_ODDS)
+        locked = sqlite3.OperationalError("database is locked")
+        with patch.object(store, "_upsert_event", side_effect=locked):
+            data = odds_client.get_event_player_odds("e1", markets="player_rush_yds", mode="fresh")
+        self.assertEqual(data["id"], "e1")
+        self.assertEqual(store.market_fetch_times("e1", "us", ["player_rush_yds"]), {})
+
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_read_only_store_returns_network_data_without_persisting(self, mock_get):
+        mock_get.return_value = _fake_response([{"id": "a"}])
+        with patch.object(store, "READ_ONLY", True):
+            self.assertEqual(odds_client.get_nfl_events(mode="fresh"), [{"id": "a"}])
+        self.assertIsNone(store.get_events("us"))
+
+
+class SingleFlightTest(StoreTestCase):
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_concurrent_subset_request_waits_on_in_flight_fetch(self, mock_get):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get(url, timeout=None):
+            started.set()
+            release.wait(5)
+            return _fake_response(EVENT_ODDS)
+
+        mock_get.side_effect = slow_get
+        results = {}
+
+        def fetch(name, markets):
+            results[name] = odds_client.get_event_player_odds("e1", markets=markets, mode="auto")
+
+        leader = threading.Thread(
+            target=fetch, args=("leader", "player_anytime_td,player_rush_yds")
+        )
+        leader.start()
+        self.assertTrue(started.wait(5))
+        follower = threading.Thread(target=fetch, args=("follower", "player_rush_yds"))
+        follower.start()
+        follower.join(0.2)
+        self.assertTrue(follower.is_alive())  # parked on the leader's fetch
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual(mock_get.call_count, 1)
+        follower_keys = {m["key"] for m in results["follower"]["bookmakers"][0]["markets"]}
+        self.assertEqual(follower_keys, {"player_rush_yds"})
+
+
+class StaleWhileRevalidateTest(StoreTestCase):
+    def _wait_for_revalidation(self):
+        deadline = time.time() + 5
+        while odds_client._REVALIDATING and time.time() < deadline:
+            time.sleep(0.01)
+
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_stale_entry_served_at_once_and_refreshed_once_in_background(self, mock_get):
+        markets = "player_anytime_td,player_rush_yds"
+        mock_get.return_value = _fake_response(EVENT_ODDS)
+        odds_client.get_event_player_odds("e1", markets=markets, mode="fresh")
+        mock_get.reset_mock()
+        release = threading.Event()
+
+        def slow_get(url, timeout=None):
+            release.wait(5)
+            return _fake_response(EVENT_ODDS)
+
+        mock_get.side_effect = slow_get
+        with patch.object(odds_client, "ODDS_TTL", 0):
+            first = odds_client.get_event_player_odds("e1", markets=markets, mode="swr")
+            second = odds_client.get_event_player_odds("e1", markets=markets, mode="swr")
+            self.assertEqual(first["id"], "e1")
+            self.assertEqual(second["id"], "e1")
+            release.set()
+            self._wait_for_revalidation()
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_entry_past_max_staleness_is_fetched_inline(self, mock_get):
+        mock_get.return_value = _fake_response(EVENT_ODDS)
+        odds_client.get_event_player_odds("e1", markets="player_rush_yds", mode="fresh")
+        mock_get.reset_mock()
+        with (
+            patch.object(odds_client, "ODDS_TTL", 0),
+            patch.object(odds_client, "ODDS_MAX_STALE", 0),
+        ):
+            odds_client.get_event_player_odds("e1", markets="player_rush_yds", mode="swr")
+        mock_get.assert_called_once()
+        self.assertFalse(odds_client._REVALIDATING)
+
+
+if __name__ == "__main__":
+    unittest.main()
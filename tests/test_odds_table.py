@@ -0,0 +1,71 @@
+import unittest
+
+from oddsfantasy import odds_table
+from oddsfantasy.odds_table import SIDE_OVER, SIDE_UNDER, OddsTable
+
+
+def _slate():
+    table = OddsTable()
+    first = table.new_event()
+    table.extend("cook", "fd", "player_rush_yds", False, first, [(SIDE_OVER, 59.5, 1.9)])
+    table.extend(
+        "cook",
+        "fd",
+        "player_rush_yds_alternate",
+        True,
+        first,
+        [(SIDE_OVER, 49.5, 1.5), (SIDE_UNDER, 49.5, 2.6), (SIDE_OVER, 69.5, 2.4)],
+    )
+    table.extend("allen", "dk", "player_pass_tds", False, first, [(SIDE_UNDER, 1.5, None)])
+    second = table.new_event()
+    table.extend("cook", "fd", "player_rush_yds", False, second, [(SIDE_UNDER, 60.5, 1.8)])
+    table.extend("cook", "fd", "player_rush_yds_alternate", True, second, [(SIDE_OVER, 79.5, 3.1)])
+    return table
+
+
+class OddsTableTest(unittest.TestCase):
+    def test_players_expand_to_the_nested_shape(self):
+        odds = _slate().by_player()
+        self.assertEqual(list(odds), ["cook", "allen"])
+        self.assertEqual(
+            odds["cook"].to_dict(),
+            {
+                "fd": {
+                    "player_rush_yds": {
+                        "over": {"odds": 1.9, "point": 59.5},
+                        "under": {"odds": 1.8, "point": 60.5},
+                    },
+                    # the later event's ladder replaces the earlier one
+                    "player_rush_yds_alternate": {
+                        "over": None,
+                        "under": None,
+                        "alts": {"over": [{"odds": 3.1, "point": 79.5}], "under": []},
+                    },
+                }
+            },
+        )
+        self.assertEqual(odds["allen"]["dk"]["player_pass_tds"]["under"]["odds"], None)
+        self.assertNotIn("nobody", odds)
+
+    def test_main_lines_skip_the_ladders(self):
+        cook = _slate().player_odds("cook")
+        main = cook.main_lines()
+        self.assertEqual(main["fd"]["player_rush_yds"], cook.to_dict()["fd"]["player_rush_yds"])
+        self.assertEqual(main["fd"]["player_rush_yds_alternate"], {"over": None, "under": None})
+        self.assertEqual((len(cook), list(cook)), (1, ["fd"]))
+
+    @unittest.skipUnless(odds_table.np is not None, "numpy not installed")
+    def test_columns_share_the_table_memory(self):
+        table = _slate()
+        cols = table.columns()
+        self.assertEqual(len(cols["price"]), len(table))
+        self.assertEqual(
+            [table.markets[m] for m in cols["market"][cols["is_alt"] == 1]],
+            ["player_rush_yds_alternate"] * 4,
+        )
+        self.assertTrue(odds_table.np.isnan(cols["price"][4]))
+        self.assertGreater(table.nbytes(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
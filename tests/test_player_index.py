@@ -0,0 +1,44 @@
+import unittest
+
+from oddsfantasy.player_index import PlayerIndex
+
+RAW = {
+    "4984": {
+        "full_name": "Josh Allen",
+        "position": "QB",
+        "team": "BUF",
+        "status": "Active",
+        "college": "Wyoming",
+        "height": "77",
+    },
+    "4866": {"full_name": "James Cook", "position": "RB", "team": "BUF", "status": "Active"},
+    "BUF": {"position": "DEF", "team": "BUF"},
+    "9999": {"full_name": "Odell Beckham Jr.", "position": "WR", "team": None},
+}
+
+
+class PlayerIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = PlayerIndex.from_sleeper(RAW)
+
+    def test_keeps_only_the_fields_we_use(self):
+        self.assertEqual(
+            tuple(self.index.get("4984")), ("4984", "Josh Allen", "QB", "BUF", "Active")
+        )
+        self.assertIsNone(self.index.get("nope"))
+
+    def test_secondary_indexes(self):
+        self.assertEqual({p.player_id for p in self.index.by_team("BUF")}, {"4984", "4866", "BUF"})
+        self.assertEqual([p.player_id for p in self.index.by_position("DEF")], ["BUF"])
+        self.assertEqual([p.player_id for p in self.index.by_name("odell beckham")], ["9999"])
+        self.assertEqual(self.index.by_team("KC"), [])
+
+    def test_round_trips_through_persisted_form(self):
+        again = PlayerIndex.from_json(self.index.to_json())
+        self.assertEqual(len(again), len(self.index))
+        self.assertEqual(again.get("4866"), self.index.get("4866"))
+        self.assertIsNone(PlayerIndex.from_json({"format": -1}))
+
+
+if __name__ == "__main__":
+    unittest.main()
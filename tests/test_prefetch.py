@@ -0,0 +1,75 @@
+import datetime as dt
+import unittest
+from unittest.mock import patch
+
+from test_odds_client import StoreTestCase
+
+from oddsfantasy import prefetch, store
+
+NOW = dt.datetime(2026, 9, 10, 12, 0, 0)  # Thursday
+
+
+class RefreshIntervalTest(unittest.TestCase):
+    def test_interval_tightens_toward_kickoff(self):
+        self.assertEqual(prefetch.refresh_interval(NOW + dt.timedelta(days=5), NOW), 24 * 3600)
+        self.assertEqual(prefetch.refresh_interval(NOW + dt.timedelta(days=2), NOW), 6 * 3600)
+        self.assertEqual(prefetch.refresh_interval(NOW + dt.timedelta(hours=3), NOW), 3600)
+
+
+@patch("oddsfantasy.prefetch.fetch_engine.fetch_event_odds")
+@patch("oddsfantasy.prefetch.resolve_week_windows", return_value=((NOW, NOW), (NOW, NOW)))
+@patch("oddsfantasy.prefetch.odds_client.get_nfl_events", return_value=[])
+class RunOnceTest(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(prefetch, "_LEAGUES", {"L1"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _plan(self, games):
+        return patch.object(prefetch, "_plan_league", return_value=games)
+
+    def test_only_markets_older_than_their_games_interval_are_due(self, _ev, _win, mock_fetch):
+        two_hours_ago = int(NOW.replace(tzinfo=dt.UTC).timestamp()) - 2 * 3600
+        for gid in ("soon", "later"):
+            store.put_event_odds(gid, "us", ["player_rush_yds"], {"id": gid}, two_hours_ago)
+        games = {
+            "soon": ("2026-09-10T20:00:00Z", {"player_rush_yds"}),
+            "later": ("2026-09-14T17:00:00Z", {"player_rush_yds", "player_receptions"}),
+            "started": ("2026-09-10T11:00:00Z", {"player_rush_yds"}),
+        }
+        with self._plan(games):
+            jobs = prefetch.run_once(now_utc=NOW)
+        self.assertEqual(
+            {(j.event_id, j.markets) for j in jobs},
+            {("soon", ("player_rush_yds",)), ("later", ("player_receptions",))},
+        )
+        self.assertEqual(mock_fetch.call_args.kwargs["mode"], "fresh")
+
+    def test_no_registered_leagues_does_nothing(self, _ev, _win, mock_fetch):
+        with patch.object(prefetch, "_LEAGUES", set()):
+            self.assertEqual(prefetch.run_once(now_utc=NOW), [])
+        mock_fetch.assert_not_called()
+
+
+class NoteLeagueTest(unittest.TestCase):
+    def setUp(self):
+        for name, value in (("_LEAGUES", {"pinned"}), ("_SEEN", prefetch.OrderedDict())):
+            patcher = patch.object(prefetch, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_traffic_is_ignored_unless_the_scheduler_runs(self):
+        prefetch.note_league("L1")
+        self.assertEqual(prefetch.registered_leagues(), ["pinned"])
+
+    @patch.object(prefetch, "_RUNNING", True)
+    @patch.object(prefetch, "PREFETCH_MAX_LEAGUES", 2)
+    def test_least_recently_used_traffic_leagues_drop_out(self):
+        for league_id in ("L1", "L2", "L1", "L3", "pinned"):
+            prefetch.note_league(league_id)
+        self.assertEqual(prefetch.registered_leagues(), ["L1", "L3", "pinned"])
+
+
+if __name__ == "__main__":
+    unittest.main()
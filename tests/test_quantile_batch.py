@@ -0,0 +1,63 @@
+"""The NumPy batch path must agree with range_model's scalar quantiles."""
+
+import random
+import unittest
+from unittest.mock import patch
+
+from oddsfantasy import quantile_batch, range_model
+
+MARKETS = (
+    "player_anytime_td",
+    "player_receptions",
+    "player_pass_tds",
+    "player_pass_interceptions",
+    "player_rush_yds",
+    "player_reception_yds",
+    "player_pass_yds",
+    "player_pass_completions",
+)
+
+
+def _rows(n=400, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        key = rng.choice(MARKETS)
+        threshold = rng.choice((0.0, 0.5, 1.5, 3.5, 4.5, 6.5, 24.5, 49.5, 225.5))
+        mean = threshold * rng.uniform(0.7, 1.4) if threshold else rng.uniform(0, 1)
+        p_over = rng.choice((0.0, rng.uniform(0.02, 0.98)))
+        p_under = rng.choice((0.0, rng.uniform(0.02, 0.98)))
+        rows.append((key, mean, threshold, p_over, p_under))
+    # exact even odds: lognormal fit is undefined -> Normal fallback
+    rows.append(("player_rush_yds", 60.0, 49.5, 0.5, 0.5))
+    return rows
+
+
+@unittest.skipUnless(quantile_batch.available(), "numpy not installed")
+class BatchMatchesScalarTest(unittest.TestCase):
+    def test_every_branch_agrees_within_tolerance(self):
+        rows = _rows()
+        batch = range_model.market_quantiles_batch(rows)
+        for row, got in zip(rows, batch, strict=True):
+            want = range_model._market_quantiles(*row)
+            for g, w in zip(got, want, strict=True):
+                self.assertAlmostEqual(g, w, places=9, msg=str(row))
+
+    def test_inv_cdf_matches_statistics(self):
+        from statistics import NormalDist
+
+        ps = [1e-12, 1e-4, 0.01, 0.15, 0.425, 0.5, 0.74, 0.925, 0.9999, 1 - 1e-12]
+        for p, z in zip(ps, quantile_batch.inv_cdf(ps), strict=True):
+            self.assertAlmostEqual(float(z), NormalDist().inv_cdf(p), places=12)
+
+
+class ScalarFallbackTest(unittest.TestCase):
+    def test_without_numpy_each_row_goes_through_the_scalar_path(self):
+        rows = _rows(20)
+        with patch.object(quantile_batch, "np", None):
+            batch = range_model.market_quantiles_batch(rows)
+        self.assertEqual(batch, [range_model._market_quantiles(*r) for r in rows])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
+import math
 import unittest
+from unittest.mock import patch
 
-from oddsfantasy import range_model
+from oddsfantasy import distributions, prob_models, range_model
 from oddsfantasy.lineup import build_lineup
-from oddsfantasy.prob_models import poisson_quantile
+from oddsfantasy.prob_models import _poisson_fit_lambda, poisson_quantile
 
 # A fairly standard Sleeper-style scoring dict, points-allowed portion only.
 DEF_SCORING = {
@@ -32,6 +34,75 @@ class PoissonQuantileTest(unittest.TestCase):
         # Poisson(5) median is 5 (or very close to it)
         self.assertAlmostEqual(poisson_quantile(5.0, 0.5), 5.0, delta=1.0)
 
+    def test_table_lookup_matches_the_pmf_walk(self):
+        lams = [0.05 * i for i in range(1, 1000)] + [prob_models.POISSON_TABLE_MAX_LAMBDA + 7.3]
+        for q in (0.15, 0.5, 0.85):
+            breaks = prob_models.poisson_quantile_breaks(q)
+            # each break sits exactly on a step of the quantile
+            self.assertEqual(poisson_quantile(breaks[3], q), 3.0)
+            self.assertEqual(poisson_quantile(breaks[3] * (1 + 1e-9), q), 4.0)
+            for lam in lams:
+                self.assertEqual(
+                    poisson_quantile(lam, q), prob_models._poisson_quantile_walk(lam, q), (lam, q)
+                )
+
+
+class PoissonFitLambdaTest(unittest.TestCase):
+    # Lambdas from the two-phase grid search the solver replaced; the solver
+    # lands within that search's step (~1.7% of lambda) of each.
+    GRID_SEARCH_LAMBDAS = (
+        ([(0, 0.4)], 1.5),
+        ([(1, 0.55)], 1.5267),
+        ([(2, 0.3)], 3.599),
+        ([(4, 0.62)], 4.0429),
+        ([(6, 0.5)], 6.6572),
+        ([(3, 0.999)], 0.9),
+        ([(2, 0.0001)], 9.0),
+        ([(2, 0.2), (3, 0.45), (4, 0.7)], 3.8769),
+        ([(5, 0.4), (6, 0.55), (8, 0.8)], 6.3228),
+        ([(0, 0.3), (1, 0.6), (2, 0.85)], 1.708),
+        ([(1, 0.2), (2, 0.9)], 1.9825),
+    )
+
+    def test_matches_the_grid_search_within_its_step(self):
+        for points, expected in self.GRID_SEARCH_LAMBDAS:
+            self.assertAlmostEqual(
+                _poisson_fit_lambda(points), expected, delta=0.015 * expected, msg=str(points)
+            )
+
+    def test_single_anchor_lambda_reproduces_the_anchor(self):
+        lam = _poisson_fit_lambda([(4, 0.62)])
+        cdf = sum(math.exp(-lam) * lam**j / math.factorial(j) for j in range(5))
+        self.assertAlmostEqual(cdf, 0.62, places=9)
+
+    def test_no_anchors(self):
+        self.assertIsNone(_poisson_fit_lambda([]))
+
+
+class PchipCdfTest(unittest.TestCase):
+    XS = (19.5, 29.5, 39.5, 49.5, 59.5)
+    F = (0.08, 0.25, 0.48, 0.7, 0.9)
+
+    def test_inverse_and_cdf_round_trip_inside_the_anchor_range(self):
+        curve = prob_models.PchipCdf(self.XS, self.F)
+        for q in (0.1, 0.15, 0.5, 0.85):
+            self.assertAlmostEqual(curve.cdf(curve.inverse(q)), q, places=9)
+        self.assertEqual(curve.inverse(0.01), 19.5)
+        self.assertEqual(curve.cdf(100.0), 0.9)
+
+    def test_puelz_fits_the_curve_once_for_all_three_quantiles(self):
+        odds = {
+            f"book{i}": {"player_rush_yds": {"over": {"point": x, "odds": 1 / (1 - f)}}}
+            for i, (x, f) in enumerate(zip(self.XS, self.F, strict=True))
+        }
+        distributions._fit_anchors.cache_clear()
+        with patch.object(prob_models, "_pchip_slopes", wraps=prob_models._pchip_slopes) as slopes:
+            q15, q50, q85 = distributions.fit_puelz(odds, "player_rush_yds").floor_mid_ceiling()
+            distributions.fit_puelz(odds, "player_rush_yds").ppf(0.95)
+        self.assertEqual(slopes.call_count, 1)
+        self.assertLess(q15, q50)
+        self.assertLess(q50, q85)
+
 
 class DefenseFantasyRangeTest(unittest.TestCase):
     def test_low_opponent_total_beats_high_opponent_total(self):
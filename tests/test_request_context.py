@@ -0,0 +1,102 @@
+"""The views one API call builds share a RequestContext, so events, the
+roster, the game plan and odds are each fetched once per request."""
+
+import datetime as dt
+import time
+import unittest
+from unittest.mock import patch
+
+from test_materialized_projections import ROSTER, _plan
+from test_odds_client import EVENT_ODDS, StoreTestCase, _fake_response
+
+from oddsfantasy import services, store
+
+WINDOW = (dt.datetime(2026, 9, 10), dt.datetime(2026, 9, 15))
+EVENTS = [
+    {
+        "id": "e1",
+        "home_team": "Buffalo Bills",
+        "away_team": "Kansas City Chiefs",
+        "commence_time": "2026-09-13T17:00:00Z",
+    }
+]
+
+
+@patch("oddsfantasy.services._def_ownership_map", return_value=({}, None))
+@patch("oddsfantasy.services._resolve_identity", return_value=ROSTER)
+@patch("oddsfantasy.services.plan_relevant_games_and_markets", side_effect=_plan)
+@patch("oddsfantasy.services.resolve_week_windows", return_value=(WINDOW, WINDOW))
+@patch("oddsfantasy.services.odds_client.get_nfl_events", return_value=EVENTS)
+class DashboardSharesContextTest(StoreTestCase):
+    def setUp(self):
+        super().setUp()
+        services._PROJECTION_CACHE.clear()
+        services._DEFENSE_CACHE.clear()
+        self.addCleanup(services._PROJECTION_CACHE.clear)
+        self.addCleanup(services._DEFENSE_CACHE.clear)
+
+    @patch("oddsfantasy.services.fetch_engine.fetch_event_odds", return_value={"e1": EVENT_ODDS})
+    def test_inputs_fetched_once_for_both_weeks(
+        self, mock_fetch, mock_events, _win, mock_plan, mock_identity, mock_owners
+    ):
+        result = services.build_dashboard("wesnicol", "2026", weeks="both", def_scope="both")
+        self.assertEqual(mock_events.call_count, 1)
+        self.assertEqual(mock_plan.call_count, 1)
+        self.assertEqual(mock_identity.call_count, 1)
+        self.assertEqual(mock_owners.call_count, 1)
+        # Cold store: every market is stale, so one batch refreshes them all
+        self.assertEqual(mock_fetch.call_count, 1)
+        jobs = mock_fetch.call_args.args[0]
+        self.assertEqual(
+            {m for j in jobs for m in j.markets},
+            {"player_anytime_td", "player_rush_yds", "spreads", "totals"},
+        )
+        self.assertIsNotNone(result["lineups"]["this"])
+
+    def test_unchanged_odds_are_not_read_again(self, *_mocks):
+        store.put_event_odds(
+            "e1", "us", ["player_anytime_td", "player_rush_yds", "spreads", "totals"], EVENT_ODDS
+        )
+        with patch(
+            "oddsfantasy.services.fetch_engine.fetch_event_odds",
+            wraps=services.fetch_engine.fetch_event_odds,
+        ) as fetch:
+            services.build_dashboard("wesnicol", "2026", weeks="this", def_scope="both")
+            self.assertTrue(fetch.called)  # the first build reads the stored odds
+            fetch.reset_mock()
+            result = services.build_dashboard("wesnicol", "2026", weeks="this", def_scope="both")
+        fetch.assert_not_called()
+        self.assertTrue(result["lineups"]["this"])
+
+    @patch("oddsfantasy.odds_client._SESSION.get")
+    def test_defense_hit_reads_no_odds(self, mock_get, *_mocks):
+        mock_get.return_value = _fake_response(EVENT_ODDS)
+        fetched_at = int(time.time()) - 60  # fresh, but older than a refetch now
+        store.put_event_odds("e1", "us", ["spreads", "totals"], EVENT_ODDS, fetched_at=fetched_at)
+        with patch(
+            "oddsfantasy.services.fetch_engine.fetch_event_odds",
+            wraps=services.fetch_engine.fetch_event_odds,
+        ) as fetch:
+            services.list_defenses("wesnicol", "2026", scope="both")
+            fetch.reset_mock()
+            services.list_defenses("wesnicol", "2026", scope="both")
+            fetch.assert_not_called()
+            # a stale line is refreshed before the lookup, and misses it
+            store.put_event_odds("e1", "us", ["totals"], EVENT_ODDS, fetched_at=1000)
+            services.list_defenses("wesnicol", "2026", scope="both")
+        jobs = fetch.call_args_list[0].args[0]
+        self.assertEqual([(j.event_id, j.markets) for j in jobs], [("e1", ("totals",))])
+        self.assertEqual(fetch.call_count, 2)  # the refresh, then the full read on the miss
+        mock_get.assert_called_once()
+
+    def test_context_memoizes_failures_too(self, _ev, _win, _plan_mock, mock_identity, _own):
+        mock_identity.side_effect = RuntimeError("sleeper down")
+        ctx = services.RequestContext("wesnicol", "2026")
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                ctx.roster()
+        self.assertEqual(mock_identity.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -52,7 +52,7 @@ class NoGamesScheduledYetTest(unittest.TestCase):
         self.assertIn("message", result)
         self.assertIn("No scheduled games", result["message"])
 
-    @patch("oddsfantasy.odds_details.odds_client.get_nfl_events")
+    @patch("oddsfantasy.services.odds_client.get_nfl_events")
     def test_get_player_odds_details_surfaces_message_instead_of_bare_empty_result(
         self, mock_events
     ):
@@ -66,7 +66,7 @@ class NoGamesScheduledYetTest(unittest.TestCase):
         self.assertIn("message", result)
         self.assertIn("No scheduled games", result["message"])
 
-    @patch("oddsfantasy.odds_details.odds_client.get_nfl_events")
+    @patch("oddsfantasy.services.odds_client.get_nfl_events")
     def test_get_defense_odds_details_surfaces_message_instead_of_bare_empty_result(
         self, mock_events
     ):
@@ -0,0 +1,86 @@
+"""Monte Carlo fantasy points: draws must follow the fitted distributions and
+the league's scoring, bonuses included."""
+
+import unittest
+from statistics import NormalDist
+from unittest.mock import patch
+
+from oddsfantasy import prob_models, range_model, simulate
+from oddsfantasy.distributions import AnchoredStat, BernoulliStat, NormalStat, PoissonStat
+
+SCORING = {"rush_yd": 0.1, "rush_td": 6, "rec": 1, "pass_int": 2, "bonus_rush_yd_100": 5}
+
+
+@unittest.skipUnless(simulate.available(), "numpy not installed")
+class FantasyPointPercentilesTest(unittest.TestCase):
+    def test_single_market_matches_the_scaled_quantiles(self):
+        dist = NormalStat(60.0, 12.0, nonneg=True)
+        (got,) = simulate.fantasy_point_percentiles(
+            {"rb": {"player_rush_yds": dist}}, SCORING, draws=40000
+        ).values()
+        for q, fp in zip(simulate.FP_PERCENTILES, got, strict=True):
+            self.assertAlmostEqual(fp, 0.1 * (60.0 + 12.0 * NormalDist().inv_cdf(q)), delta=0.05)
+
+    def test_bonus_is_scored_per_draw(self):
+        # P(yards >= 100) is ~16%, so the 90th percentile draw clears it
+        dist = NormalStat(70.0, 30.0, nonneg=True)
+        p50, p90 = simulate.fantasy_point_percentiles(
+            {"rb": {"player_rush_yds": dist}}, SCORING, qs=(0.5, 0.9), draws=40000
+        )["rb"]
+        self.assertAlmostEqual(p50, 7.0, delta=0.1)
+        self.assertAlmostEqual(p90, 0.1 * dist.ppf(0.9) + 5, delta=0.1)
+
+    def test_interceptions_subtract_points(self):
+        (p10, p90) = simulate.fantasy_point_percentiles(
+            {"qb": {"player_pass_interceptions": PoissonStat(1.2)}}, SCORING, qs=(0.1, 0.9)
+        )["qb"]
+        self.assertEqual(p90, 0.0)
+        self.assertLess(p10, 0.0)
+
+    def test_draws_are_seeded_per_player(self):
+        fits = {
+            "a": {"player_anytime_td": BernoulliStat(0.4), "player_receptions": PoissonStat(4.5)},
+            "b": {"player_rush_yds": NormalStat(55.0, 20.0, nonneg=True)},
+        }
+        both = simulate.fantasy_point_percentiles(fits, SCORING, seed=3)
+        alone = simulate.fantasy_point_percentiles({"a": fits["a"]}, SCORING, seed=3)
+        self.assertEqual(both["a"], alone["a"])
+        self.assertEqual(both, simulate.fantasy_point_percentiles(fits, SCORING, seed=3))
+
+    def test_player_without_markets_scores_zero(self):
+        out = simulate.fantasy_point_percentiles(
+            {"x": {}, "y": {"player_receptions": PoissonStat(3.0)}}, SCORING
+        )
+        self.assertEqual(out["x"], [0.0] * len(simulate.FP_PERCENTILES))
+        self.assertGreater(out["y"][-1], 0.0)
+
+    def test_poisson_draws_are_exact_quantiles(self):
+        import numpy as np
+
+        lams = [0.0, 0.4, 3.5, 21.0]
+        u = np.random.default_rng(1).random((len(lams), 500))
+        k = simulate._poisson_draws(lams, u)
+        for i, lam in enumerate(lams):
+            for j in range(0, 500, 7):
+                self.assertEqual(k[i, j], prob_models.poisson_quantile(lam, u[i, j]))
+
+    def test_anchored_draws_follow_the_fitted_curve(self):
+        import numpy as np
+
+        dist = AnchoredStat(
+            (29.5, 39.5, 49.5, 59.5), (0.2, 0.45, 0.7, 0.8), method="pchip", tails="lognormal"
+        )
+        u = np.array([0.05, 0.2, 0.3, 0.5, 0.65, 0.8, 0.95])
+        for got, q in zip(simulate._draws(dist, u), u, strict=True):
+            self.assertAlmostEqual(got, dist.ppf(q), delta=0.05)
+
+
+class WithoutNumpyTest(unittest.TestCase):
+    def test_simulation_is_skipped(self):
+        players = {"rb": ({}, {})}
+        with patch.object(simulate, "np", None):
+            self.assertEqual(range_model.simulate_fantasy_percentiles(players, SCORING), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,31 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+import requests
+
 from oddsfantasy import sleeper_api
 
 
-def _fake_response(payload):
+def _fake_response(payload, status=200, etag=None):
     resp = MagicMock()
     resp.json.return_value = payload
     resp.raise_for_status.return_value = None
+    resp.status_code = status
+    resp.headers = {"ETag": etag} if etag else {}
     return resp
 
 
-class GetLeagueTest(unittest.TestCase):
-    @patch("oddsfantasy.sleeper_api.requests.get")
+class SleeperTestCase(unittest.TestCase):
+    """Starts every test with an empty Sleeper response cache."""
+
+    def setUp(self):
+        patcher = patch.object(sleeper_api, "_CACHE", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class GetLeagueTest(SleeperTestCase):
+    @patch("oddsfantasy.sleeper_api._SESSION.get")
     def test_returns_raw_league_object(self, mock_get):
         mock_get.return_value = _fake_response(
             {
@@ -30,6 +43,62 @@ class GetLeagueTest(unittest.TestCase):
         self.assertIn("/league/123", called_url)
 
 
+class LatencyMetricsTest(SleeperTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(sleeper_api, "_METRICS", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("oddsfantasy.sleeper_api._SESSION.get")
+    def test_calls_and_errors_are_counted_per_endpoint(self, mock_get):
+        mock_get.return_value = _fake_response([])
+        sleeper_api.get_league_rosters("123")
+        sleeper_api.get_league_rosters("456")
+        mock_get.side_effect = requests.ConnectionError("down")
+        with self.assertRaises(requests.ConnectionError):
+            sleeper_api.get_league_users("123")
+        metrics = sleeper_api.get_latency_metrics()
+        self.assertEqual(metrics["league_rosters"]["calls"], 2)
+        self.assertEqual(metrics["league_rosters"]["errors"], 0)
+        self.assertEqual(metrics["league_users"]["errors"], 1)
+
+
+@patch("oddsfantasy.sleeper_api._SESSION.get")
+class SleeperCacheTest(SleeperTestCase):
+    def test_rosters_reused_within_ttl(self, mock_get):
+        mock_get.return_value = _fake_response([{"roster_id": 1}])
+        sleeper_api.get_league_rosters("123")
+        self.assertEqual(sleeper_api.get_league_rosters("123"), [{"roster_id": 1}])
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_expired_entry_refreshed_conditionally(self, mock_get):
+        mock_get.return_value = _fake_response({"name": "My League"}, etag='"v1"')
+        sleeper_api.get_league("123")
+        mock_get.return_value = _fake_response(None, status=304)
+        with patch.dict(sleeper_api.SLEEPER_TTLS, {"league": 0}):
+            league = sleeper_api.get_league("123")
+        self.assertEqual(league, {"name": "My League"})
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+
+    def test_failed_refresh_serves_the_cached_copy(self, mock_get):
+        mock_get.return_value = _fake_response([{"user_id": "u1"}])
+        sleeper_api.get_league_users("123")
+        mock_get.side_effect = requests.ConnectionError("down")
+        with patch.dict(sleeper_api.SLEEPER_TTLS, {"league_users": 0}):
+            self.assertEqual(sleeper_api.get_league_users("123"), [{"user_id": "u1"}])
+
+    def test_request_scope_fetches_each_resource_once_even_past_ttl(self, mock_get):
+        mock_get.return_value = _fake_response([{"roster_id": 1}])
+        with patch.dict(sleeper_api.SLEEPER_TTLS, {"league_rosters": 0}):
+            with sleeper_api.request_scope():
+                sleeper_api.get_league_rosters("123")
+                sleeper_api.get_league_rosters("123")
+            self.assertEqual(mock_get.call_count, 1)
+            sleeper_api.get_league_rosters("123")
+        self.assertEqual(mock_get.call_count, 2)
+
+
 class GetLeagueTeamsTest(unittest.TestCase):
     @patch("oddsfantasy.sleeper_api.get_league_users")
     @patch("oddsfantasy.sleeper_api.get_league_rosters")
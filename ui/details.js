@@ -1311,6 +1311,21 @@ function _renderStatGraphMulti(title, baseKey, modelsMap, summaryThreshold, book
   } catch (e) { return ''; }
 }
 
+// [x, F(x)] CDF points -> [x, density] points clipped to [minX, maxX]
+function _curveDensity(curve, minX, maxX) {
+  if (!curve || curve.length < 2) return [];
+  var out = [[minX, 0]];
+  for (var i=1;i<curve.length;i++){
+    var x0 = Number(curve[i-1][0]), x1 = Number(curve[i][0]);
+    var dF = Number(curve[i][1]) - Number(curve[i-1][1]);
+    if (!(x1 > x0)) continue;
+    var xm = (x0 + x1) / 2;
+    if (xm >= minX && xm <= maxX) out.push([xm, Math.max(0, dF / (x1 - x0))]);
+  }
+  out.push([maxX, 0]);
+  return out.length > 2 ? out : [];
+}
+
 // Render a stat-specific PDF with markers for thresholds and book points
 function _renderStatGraph(title, baseKey, m, summaryThreshold, bookPoints) {
   try {
@@ -1329,11 +1344,18 @@ function _renderStatGraph(title, baseKey, m, summaryThreshold, bookPoints) {
     var path = '';
     var legend = '';
     if (!isBinary) {
-      // Build normal pdf curve
-      var N = 80; var pts = []; var maxY = 0;
-      function pdf(x){ return Math.exp(-0.5 * Math.pow((x - mean) / (sigma || 1e-6), 2)); }
-      for (var i=0;i<=N;i++){
-        var x = minX + (maxX-minX)*i/N; var y = pdf(x); if (y > maxY) maxY = y; pts.push([x, y]);
+      var pts = []; var maxY = 0;
+      var fitted = _curveDensity(m.curve, minX, maxX);
+      if (fitted.length) {
+        // Density of the fitted distribution served with the market
+        pts = fitted; pts.forEach(function(p){ if (p[1] > maxY) maxY = p[1]; });
+      } else {
+        // Build normal pdf curve
+        var N = 80;
+        function pdf(x){ return Math.exp(-0.5 * Math.pow((x - mean) / (sigma || 1e-6), 2)); }
+        for (var i=0;i<=N;i++){
+          var x = minX + (maxX-minX)*i/N; var y = pdf(x); if (y > maxY) maxY = y; pts.push([x, y]);
+        }
       }
       var d = pts.map(function(p,i){ var X=xScale(p[0]).toFixed(1), Y=yScale((p[1]/(maxY||1))*1).toFixed(1); return (i?'L':'M')+X+','+Y; }).join('');
       var area = d + ' L ' + xScale(maxX).toFixed(1) + ',' + yScale(0) + ' L ' + xScale(minX).toFixed(1) + ',' + yScale(0) + ' Z';
@@ -346,7 +346,7 @@ function apiUrl(path, params = {}) {
 
 function getDataMode() {
   const el = $('dataModeSelect');
-  return (el && el.value) ? el.value : 'auto';
+  return (el && el.value) ? el.value : 'swr';
 }
 
 function getModel() {